@@ -102,6 +102,7 @@ function App() {
       }
 
       const data = await response.json();
+      data.tokenExpiresAt = Date.now() + data.expiresIn * 1000;
       setUser(data);
       localStorage.setItem('chorerun_user', JSON.stringify(data));
       
@@ -240,6 +241,57 @@ function App() {
     setError(null);
   }, []);
 
+  // Renew the short-lived access token a minute before it expires. Only a
+  // rejected refresh token (401, or 422 when malformed) ends the session; rate
+  // limiting, overload and network errors are retried with back-off
+  useEffect(() => {
+    if (!user?.refreshToken) return;
+
+    let cancelled = false;
+    let timeout;
+    let attempt = 0;
+
+    const refresh = async () => {
+      let retryAfter = 0;
+      try {
+        const response = await fetch('/api/refresh', {
+          method: 'POST',
+          headers: { Authorization: `Bearer ${user.refreshToken}` }
+        });
+        if (cancelled) return;
+
+        if (response.status === 401 || response.status === 422) {
+          // Refresh token expired or revoked: the session is over
+          logout();
+          return;
+        }
+        if (!response.ok) {
+          retryAfter = Number(response.headers.get('Retry-After')) || 0;
+          throw new Error(`Token refresh failed: ${response.status}`);
+        }
+
+        const data = await response.json();
+        if (cancelled) return;
+        updateUser({ token: data.token, tokenExpiresAt: Date.now() + data.expiresIn * 1000 });
+      } catch (err) {
+        if (cancelled) return;
+        console.error('Token refresh error:', err);
+        // 1s, 2s, 4s... up to a minute, or as long as the server asked
+        const backoff = Math.min(60000, 1000 * 2 ** attempt);
+        attempt += 1;
+        timeout = setTimeout(refresh, Math.max(backoff, retryAfter * 1000));
+      }
+    };
+
+    const delay = Math.max(0, (user.tokenExpiresAt || 0) - Date.now() - 60000);
+    timeout = setTimeout(refresh, delay);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timeout);
+    };
+  }, [user, logout, updateUser]);
+
   // Auto-refresh chores every 30 seconds when user is active
   useEffect(() => {
     if (!user) return;
@@ -47,16 +47,26 @@ const Dashboard = ({ user, chores: initialChores }) => {
     }
   }, [initialChores]);
 
-  // Auto-refresh chores every 30 seconds (optional - App.jsx handles main fetching)
+  // Refresh when the server pushes a chore event (falls back to polling every 30 seconds)
   useEffect(() => {
     if (!user?.token) return;
 
-    // Set up auto-refresh interval for real-time updates
-    const interval = setInterval(() => {
-      fetchChores(false); // Don't show loading for background refreshes
-    }, 30000); // 30 seconds
+    if (typeof EventSource === 'undefined') {
+      const interval = setInterval(() => {
+        fetchChores(false); // Don't show loading for background refreshes
+      }, 30000); // 30 seconds
 
-    return () => clearInterval(interval);
+      return () => clearInterval(interval);
+    }
+
+    // EventSource reconnects on its own and resumes via Last-Event-ID
+    const source = new EventSource('/api/chores/stream');
+    const handleEvent = () => fetchChores(false);
+    ['chore.created', 'chore.accepted', 'chore.completed', 'chores.expired', 'chores.imported', 'reset'].forEach((type) => {
+      source.addEventListener(type, handleEvent);
+    });
+
+    return () => source.close();
   }, [user, fetchChores]);
 
   // Manual refresh handler
@@ -18,6 +18,7 @@ const Navbar = ({ user, onLogout }) => {
           'Content-Type': 'application/json',
           Authorization: `Bearer ${user.token}`,
         },
+        body: JSON.stringify({ refreshToken: user.refreshToken }),
       });
       onLogout();
       navigate('/login');
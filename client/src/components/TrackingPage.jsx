@@ -1,12 +1,37 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { MapPin, Clock, CheckCircle, User, Star, MessageCircle, Phone } from 'lucide-react';
 
+// Tracker steps and the progress log event that completes each
+const STEPS = [
+  { step: 'Chore Accepted', event: 'accepted' },
+  { step: 'Runner En Route', event: 'en_route' },
+  { step: 'Arrived at Location', event: 'arrived' },
+  { step: 'Task in Progress', event: 'started' },
+  { step: 'Task Completed', event: 'completed' }
+];
+
+// Backstop poll for progress the stream missed (another worker may still be
+// buffering it, see server/progress.py), and the only refresh without EventSource
+const PROGRESS_POLL_MS = 15000;
+
+const stepsFromEvents = (events) => {
+  const seen = {};
+  events.forEach(event => { seen[event.type] = event.at || null; });
+  return STEPS.map(({ step, event }) => ({
+    step,
+    completed: event in seen,
+    time: seen[event] ? new Date(seen[event]).toLocaleTimeString() : null
+  }));
+};
+
 const TrackingPage = ({ chores, user }) => {
   const [selectedTab, setSelectedTab] = useState('active');
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState(null);
   const [progressData, setProgressData] = useState({});
+  // Newest seq held per chore, so polls only ask for what is new
+  const lastSeqs = useRef({});
 
   const userActiveChores = chores.filter(chore => 
     (chore.postedBy === user.name || chore.acceptedBy === user.name) && 
@@ -18,12 +43,16 @@ const TrackingPage = ({ chores, user }) => {
     chore.status === 'completed'
   );
 
-  const fetchChoreProgress = useCallback(async (choreId) => {
-    setIsLoading(true);
-    setError(null);
+  const fetchChoreProgress = useCallback(async (choreId, showLoading = true) => {
+    if (showLoading) {
+      setIsLoading(true);
+      setError(null);
+    }
 
     try {
-      const response = await fetch(`/api/chores/${choreId}/progress`, {
+      // Only ask for events newer than the ones already held
+      const afterSeq = lastSeqs.current[choreId] || 0;
+      const response = await fetch(`/api/chores/${choreId}/progress?after_seq=${afterSeq}`, {
         headers: {
           'Content-Type': 'application/json',
           Authorization: `Bearer ${user.token}`,
@@ -35,29 +64,59 @@ const TrackingPage = ({ chores, user }) => {
       }
 
       const data = await response.json();
-      setProgressData(prev => ({ ...prev, [choreId]: data }));
+      lastSeqs.current[choreId] = Math.max(afterSeq, data.lastSeq);
+      setProgressData(prev => {
+        const held = prev[choreId] || { events: [], lastSeq: 0 };
+        // Overlapping requests may return the same events; keep each seq once
+        const events = [...held.events, ...data.events.filter(event => event.seq > held.lastSeq)];
+        const lastSeq = Math.max(held.lastSeq, data.lastSeq);
+        return { ...prev, [choreId]: { events, lastSeq, steps: stepsFromEvents(events) } };
+      });
     } catch (err) {
-      setError(err.message);
+      // A failed background refresh keeps the page; the next one retries
+      if (showLoading) {
+        setError(err.message);
+      } else {
+        console.error('Error refreshing chore progress:', err);
+      }
     } finally {
-      setIsLoading(false);
+      if (showLoading) setIsLoading(false);
     }
   }, [user.token]);
 
+  // Joined into a string so a new chores array with the same chores keeps the effect
+  const activeChoreIds = userActiveChores.map(chore => chore.id).join(',');
+
   useEffect(() => {
-    userActiveChores.forEach(chore => {
-      fetchChoreProgress(chore.id);
-    });
-  }, [userActiveChores, fetchChoreProgress]);
+    const choreIds = activeChoreIds ? activeChoreIds.split(',').map(Number) : [];
+    if (choreIds.length === 0) return;
+
+    // Only chores not loaded yet show the loading state
+    choreIds.forEach(choreId => fetchChoreProgress(choreId, !(choreId in lastSeqs.current)));
+    const poll = () => choreIds.forEach(choreId => fetchChoreProgress(choreId, false));
+    const interval = setInterval(poll, PROGRESS_POLL_MS);
+    if (typeof EventSource === 'undefined') {
+      return () => clearInterval(interval);
+    }
+
+    // Fetch a tracked chore's new steps as soon as the server announces them
+    const source = new EventSource('/api/chores/stream');
+    const handleEvent = (message) => {
+      const { id } = JSON.parse(message.data);
+      if (choreIds.includes(id)) fetchChoreProgress(id, false);
+    };
+    source.addEventListener('chore.progress', handleEvent);
+    source.addEventListener('chore.completed', handleEvent);
+    source.addEventListener('reset', poll);
+
+    return () => {
+      clearInterval(interval);
+      source.close();
+    };
+  }, [activeChoreIds, fetchChoreProgress]);
 
   const ChoreTracker = ({ chore }) => {
-    const progress = progressData[chore.id] || [
-      { step: 'Chore Accepted', completed: true, time: new Date().toLocaleTimeString() },
-      { step: 'Runner En Route', completed: false, time: null },
-      { step: 'Arrived at Location', completed: false, time: null },
-      { step: 'Task in Progress', completed: false, time: null },
-      { step: 'Task Completed', completed: false, time: null },
-      { step: 'Payment Processed', completed: false, time: null }
-    ];
+    const progress = progressData[chore.id]?.steps || stepsFromEvents([{ type: 'accepted', at: chore.acceptedAt }]);
     const currentStep = progress.findIndex(step => !step.completed);
     const isUserRunner = chore.acceptedBy === user.name;
 
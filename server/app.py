@@ -1,14 +1,47 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import (
+    JWTManager, create_access_token, create_refresh_token, decode_token, jwt_required, get_jwt, get_jwt_identity,
+    verify_jwt_in_request
+)
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+import click
+import hashlib
 import os
+import time
 
 from config import config
-from models import db, User, Chore, ChoreApplication, Review
+from models import db, enable_sqlite_pragmas, User, Chore, ArchivedChore, ChoreApplication, Review
+from serializers import serialize_chores, serialize_applications, parse_fields, chore_load_options
+from fastjson import FastJSONProvider
+from pagination import encode_cursor, decode_cursor, parse_per_page
+from events import create_broker
+from hashing import password_hasher, PasswordHasherBusy
+from user_cache import user_cache
+from search import filter_location, search_chores
+from geo import parse_point, validate_point, nearby_chores
+from ratings import record_review, rebuild_ratings
+from metrics import request_metrics
+from revocation import token_denylist
+from ratelimit import rate_limiter
+from maintenance import chore_maintenance
+from archive import find_chore
+from validation import parse_chore
+from bulk import FORMATS, parse_format, export_query, export_chores, import_chores
+from user_stats import record_chore_change, rebuild_user_stats, user_stats
+from ranking import feed_ranker
+from replicas import replica_router
+from operators import operator_required, metrics_access_required
+from progress import progress_log, STEPS
+from applications import apply, close_applications, rebuild_application_counts
 
-def create_app(config_name=None):
+def create_app(config_name=None, migrations=True):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Configuration
     config_name = config_name or os.environ.get('FLASK_ENV', 'default')
@@ -16,12 +49,44 @@ def create_app(config_name=None):
     
     # Initialize extensions
     db.init_app(app)
+    replica_router.init_app(app)
+    progress_log.init_app(app)
+    request_metrics.init_app(app)
+    if migrations:
+        # Alembic is only needed by `flask db`; serving workers skip loading it
+        from flask_migrate import Migrate
+        Migrate(app, db, render_as_batch=True)
     jwt = JWTManager(app)
+    token_denylist.init_app(app, jwt)
+    rate_limiter.init_app(app)
     CORS(app, origins=app.config['CORS_ORIGINS'])
+    chore_events = app.extensions['chore_events'] = create_broker(app)
+    password_hasher.init_app(app)
+    user_cache.init_app(app)
+    chore_maintenance.init_app(app)
+    feed_ranker.init_app(app)
     
-    # Create tables
+    # Schema is managed by migrations (`flask db upgrade`), not created on boot
     with app.app_context():
-        db.create_all()
+        for engine in db.engines.values():
+            enable_sqlite_pragmas(engine, app.config['SQLITE_BUSY_TIMEOUT_MS'])
+    
+    def feed_response(payload, etag, feed_version, status_code=200):
+        """Build a chore feed response carrying its ETag and change marker"""
+        response = jsonify(payload) if payload is not None else app.response_class(status=status_code)
+        response.status_code = status_code
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Chores-Version'] = str(feed_version)
+        return response
+    
+    def token_response(user, status_code):
+        """A user's profile plus a fresh access/refresh token pair"""
+        response_data = user.to_dict()
+        response_data['token'] = create_access_token(identity=user.id)
+        response_data['refreshToken'] = create_refresh_token(identity=user.id)
+        response_data['expiresIn'] = int(app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
+        return jsonify(response_data), status_code
     
     # Routes
     @app.route('/api/register', methods=['POST'])
@@ -51,15 +116,13 @@ def create_app(config_name=None):
             
             db.session.add(user)
             db.session.commit()
+            user_cache.invalidate(user.id)
             
-            # Create token
-            token = create_access_token(identity=user.id)
-            
-            response_data = user.to_dict()
-            response_data['token'] = token
-            
-            return jsonify(response_data), 201
+            return token_response(user, 201)
             
+        except PasswordHasherBusy:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             return jsonify({'message': f'Registration failed: {str(e)}'}), 500
@@ -77,16 +140,57 @@ def create_app(config_name=None):
             if not user or not user.check_password(data['password']):
                 return jsonify({'message': 'Invalid email or password'}), 401
             
-            token = create_access_token(identity=user.id)
-            
-            response_data = user.to_dict()
-            response_data['token'] = token
+            # Upgrade hashes made under an older bcrypt cost while we have the plaintext
+            if user.password_needs_rehash():
+                user.set_password(data['password'])
+                db.session.commit()
             
-            return jsonify(response_data), 200
+            return token_response(user, 200)
             
+        except PasswordHasherBusy:
+            db.session.rollback()
+            raise
         except Exception as e:
+            db.session.rollback()
             return jsonify({'message': f'Login failed: {str(e)}'}), 500
     
+    @app.route('/api/refresh', methods=['POST'])
+    @jwt_required(refresh=True)
+    def refresh():
+        token = create_access_token(identity=get_jwt_identity())
+        return jsonify({
+            'token': token,
+            'expiresIn': int(app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
+        }), 200
+    
+    @app.route('/api/logout', methods=['POST'])
+    @jwt_required()
+    def logout():
+        try:
+            claims = get_jwt()
+            revoked = [claims]
+            
+            # Revoke the refresh token too when the client sends it
+            refresh_token = (request.get_json(silent=True) or {}).get('refreshToken')
+            if refresh_token:
+                try:
+                    refresh_claims = decode_token(refresh_token, allow_expired=True)
+                except Exception:
+                    return jsonify({'message': 'Invalid refresh token'}), 400
+                if refresh_claims['type'] != 'refresh' or refresh_claims['sub'] != claims['sub']:
+                    return jsonify({'message': 'Invalid refresh token'}), 400
+                revoked.append(refresh_claims)
+            
+            for token_claims in revoked:
+                token_denylist.revoke(token_claims)
+            db.session.commit()
+            
+            return jsonify({'message': 'Logged out'}), 200
+            
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'message': f'Logout failed: {str(e)}'}), 500
+    
     @app.route('/api/chores', methods=['GET'])
     def get_chores():
         try:
@@ -94,34 +198,258 @@ def create_app(config_name=None):
             status = request.args.get('status', 'active')
             category = request.args.get('category')
             location = request.args.get('location')
-            page = int(request.args.get('page', 1))
-            per_page = int(request.args.get('per_page', 20))
+            text = request.args.get('q')
+            near = request.args.get('near')
+            cursor = request.args.get('cursor')
+            since = request.args.get('since')
+            per_page = parse_per_page(
+                request.args.get('per_page'),
+                app.config['CHORES_PER_PAGE'],
+                app.config['CHORES_MAX_PER_PAGE']
+            )
+            try:
+                fields = parse_fields(request.args.get('fields'))
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
             
-            # Build query
-            query = Chore.query
+            # Relevance is personal: signed-in viewers get their own ranking,
+            # anyone else (including an expired token) the anonymous one
+            sort = request.args.get('sort')
+            viewer_id = None
+            if sort == 'relevance':
+                try:
+                    verify_jwt_in_request(optional=True)
+                    viewer_id = get_jwt_identity()
+                except (JWTExtendedException, PyJWTError):
+                    viewer_id = None
+            elif sort is not None:
+                return jsonify({'message': 'sort must be relevance'}), 400
+            
+            # Any create/accept/complete bumps the global change marker and any
+            # profile write bumps the user cache's invalidation counter, so both
+            # plus the query string (and the viewer, for ranked feeds) identify
+            # the response body
+            feed_version = Chore.current_version()
+            user_generation = user_cache.backend.invalidations()
+            etag = hashlib.md5(
+                f'{feed_version}:{user_generation}:{viewer_id}:{request.query_string.decode()}'.encode()
+            ).hexdigest()
+            if etag in request.if_none_match:
+                return feed_response(None, etag, feed_version, 304)
+            
+            # Build query, loading only the projected columns when fields= is given
+            query = Chore.query.options(*chore_load_options(fields))
             
-            if status:
-                query = query.filter(Chore.status == status)
             if category:
                 query = query.filter(Chore.category == category)
             if location:
-                query = query.filter(Chore.location.ilike(f'%{location}%'))
+                query = filter_location(query, location)
+            
+            # Delta mode: chores changed since the client's last marker, plus ids
+            # of chores that no longer match the requested status or were
+            # archived, merged in marker order
+            if since is not None:
+                try:
+                    since = int(since)
+                except ValueError:
+                    return jsonify({'message': 'since must be a version number'}), 400
+                
+                rows = query.filter(Chore.version > since).order_by(Chore.version).limit(per_page + 1).all()
+                archived = db.select(ArchivedChore.version, ArchivedChore.id).where(ArchivedChore.version > since)
+                if category:
+                    archived = archived.where(ArchivedChore.category == category)
+                archived = db.session.execute(archived.order_by(ArchivedChore.version).limit(per_page + 1)).all()
+                versions = sorted([chore.version for chore in rows] + [version for version, _ in archived])
+                has_more = len(versions) > per_page
+                if has_more:
+                    last_version = versions[per_page - 1]
+                    rows = [chore for chore in rows if chore.version <= last_version]
+                    archived = [(version, chore_id) for version, chore_id in archived if version <= last_version]
+                changed = [chore for chore in rows if not status or chore.status == status]
+                removed = [chore.id for chore in rows if status and chore.status != status]
+                removed += [chore_id for _, chore_id in archived]
+                
+                return feed_response({
+                    'chores': serialize_chores(changed, fields=fields),
+                    'removed': removed,
+                    'version': last_version if has_more else feed_version,
+                    'has_more': has_more
+                }, etag, feed_version)
+            
+            # Relevance mode: personal ranking of the active feed from the
+            # ranker's in-memory feature matrix, then one fetch by id
+            if sort == 'relevance':
+                if status != 'active' or location or text is not None or near is not None:
+                    return jsonify({'message': 'sort=relevance supports only status=active and category'}), 400
+                try:
+                    ids, next_cursor = feed_ranker.rank(viewer_id, category, cursor, per_page)
+                except (ValueError, TypeError):
+                    return jsonify({'message': 'Invalid cursor'}), 400
+                
+                # Chores accepted since the last rebuild are dropped here
+                by_id = {chore.id: chore for chore in query.filter(Chore.id.in_(ids), Chore.status == 'active')}
+                items = [by_id[chore_id] for chore_id in ids if chore_id in by_id]
+                return feed_response({'chores': serialize_chores(items, fields=fields), 'next_cursor': next_cursor}, etag, feed_version)
+            
+            if status:
+                query = query.filter(Chore.status == status)
+            
+            # Near mode: bucketed candidate scan, exact distances, nearest first
+            if near is not None:
+                try:
+                    latitude, longitude = parse_point(near)
+                    radius_km = float(request.args.get('radius_km', app.config['GEO_DEFAULT_RADIUS_KM']))
+                except ValueError:
+                    return jsonify({'message': 'near must be "lat,lng" and radius_km a number'}), 400
+                if not 0 < radius_km <= app.config['GEO_MAX_RADIUS_KM']:
+                    return jsonify({'message': f"radius_km must be between 0 and {app.config['GEO_MAX_RADIUS_KM']}"}), 400
+                
+                try:
+                    items, distances, next_cursor = nearby_chores(
+                        query, latitude, longitude, radius_km, cursor, per_page
+                    )
+                except (ValueError, TypeError):
+                    return jsonify({'message': 'Invalid cursor'}), 400
+                
+                chores_data = serialize_chores(items, fields=fields)
+                for chore_data in chores_data:
+                    chore_data['distanceKm'] = round(distances[chore_data['id']], 3)
+                
+                return feed_response({'chores': chores_data, 'next_cursor': next_cursor}, etag, feed_version)
+            
+            # Search mode: relevance-ranked full-text matches, always cursor paginated
+            if text is not None:
+                try:
+                    items, next_cursor = search_chores(
+                        query, text, cursor, per_page, app.config['SEARCH_CANDIDATE_LIMIT']
+                    )
+                except (ValueError, TypeError):
+                    return jsonify({'message': 'Invalid cursor'}), 400
+                
+                return feed_response({'chores': serialize_chores(items, fields=fields), 'next_cursor': next_cursor}, etag, feed_version)
+            
+            # Cursor mode: seek past the last (posted_at, id) seen, no COUNT or OFFSET.
+            # Sort order matches ix_chores_status_posted_at_id so no sort step is needed.
+            if cursor is not None:
+                if cursor:
+                    try:
+                        posted_at, last_id = decode_cursor(cursor)
+                        posted_at = datetime.fromisoformat(posted_at)
+                        last_id = int(last_id)
+                    except (ValueError, TypeError):
+                        return jsonify({'message': 'Invalid cursor'}), 400
+                    query = query.filter(or_(
+                        Chore.posted_at < posted_at,
+                        and_(Chore.posted_at == posted_at, Chore.id > last_id)
+                    ))
+                
+                rows = query.order_by(Chore.posted_at.desc(), Chore.id).limit(per_page + 1).all()
+                items = rows[:per_page]
+                next_cursor = None
+                if len(rows) > per_page:
+                    next_cursor = encode_cursor(items[-1].posted_at, items[-1].id)
+                
+                return feed_response({'chores': serialize_chores(items, fields=fields), 'next_cursor': next_cursor}, etag, feed_version)
             
             # Order by posted_at descending
             query = query.order_by(Chore.posted_at.desc())
             
             # Paginate
+            page = int(request.args.get('page', 1))
             chores = query.paginate(
                 page=page, 
                 per_page=per_page, 
                 error_out=False
             )
             
-            return jsonify([chore.to_dict() for chore in chores.items]), 200
+            return feed_response(serialize_chores(chores.items, fields=fields), etag, feed_version)
             
         except Exception as e:
             return jsonify({'message': f'Failed to fetch chores: {str(e)}'}), 500
     
+    @app.route('/api/chores/<int:chore_id>', methods=['GET'])
+    def get_chore(chore_id):
+        # Settled chores may have moved to the archive; the id still resolves
+        chore = find_chore(chore_id)
+        if not chore:
+            return jsonify({'message': 'Resource not found'}), 404
+        return jsonify(serialize_chores([chore])[0]), 200
+    
+    @app.route('/api/chores/export', methods=['GET'])
+    @operator_required
+    def export_chores_route():
+        try:
+            format = parse_format(request.args.get('format'))
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        since = request.args.get('since')
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return jsonify({'message': 'since must be a version number'}), 400
+        
+        model = ArchivedChore if request.args.get('archived') == '1' else Chore
+        query = export_query(model, request.args.get('status'), request.args.get('category'), since)
+        compress = request.accept_encodings['gzip'] > 0
+        
+        # Rows are read and encoded as the client consumes the body
+        response = Response(
+            stream_with_context(export_chores(
+                query, format, app.json.dumps, app.config['BULK_EXPORT_CHUNK_SIZE'], compress
+            )),
+            mimetype=FORMATS[format]
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename=chores.{format}'
+        response.headers['Vary'] = 'Accept-Encoding'
+        if compress:
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+    
+    @app.route('/api/chores/import', methods=['POST'])
+    @operator_required
+    def import_chores_route():
+        try:
+            user_id = get_jwt_identity()
+            try:
+                format = parse_format(request.args.get('format'), request.content_type)
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
+            
+            # One event per committed batch, like the expiry job
+            def publish(ids):
+                progress_log.record_many(ids, 'posted', user_id)
+                chore_events.publish('chores.imported', {'ids': ids, 'status': 'active'})
+            
+            report = import_chores(
+                request.stream, format, user_id,
+                batch_size=app.config['BULK_IMPORT_BATCH_SIZE'],
+                max_errors=app.config['BULK_IMPORT_MAX_ERRORS'],
+                compressed=request.headers.get('Content-Encoding') == 'gzip',
+                on_batch=publish
+            )
+            return jsonify(report), 201 if report['created'] else 400
+            
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'message': f'Failed to import chores: {str(e)}'}), 500
+    
+    @app.route('/api/chores/stream', methods=['GET'])
+    def stream_chores():
+        # The generator never touches the database, so an idle subscriber
+        # holds no session or pooled connection
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+        try:
+            last_event_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            return jsonify({'message': 'Invalid Last-Event-ID'}), 400
+        
+        return Response(
+            chore_events.stream(last_event_id),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
     @app.route('/api/chores', methods=['POST'])
     @jwt_required()
     def create_chore():
@@ -129,36 +457,23 @@ def create_app(config_name=None):
             user_id = get_jwt_identity()
             data = request.get_json()
             
-            # Validate required fields
-            required_fields = ['title', 'description', 'location', 'payment', 'category', 'urgency']
-            for field in required_fields:
-                if not data.get(field):
-                    return jsonify({'message': f'{field} is required'}), 400
+            try:
+                values = parse_chore(data)
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
             
-            # Parse due date if provided
-            due_date = None
-            if data.get('dueDate'):
-                try:
-                    due_date = datetime.fromisoformat(data['dueDate'].replace('Z', '+00:00'))
-                except ValueError:
-                    return jsonify({'message': 'Invalid due date format'}), 400
-            
-            chore = Chore(
-                title=data['title'],
-                description=data['description'],
-                location=data['location'],
-                payment=float(data['payment']),
-                category=data['category'],
-                urgency=data['urgency'],
-                estimated_time=data.get('estimatedTime'),
-                due_date=due_date,
-                posted_by_id=user_id
-            )
+            chore = Chore(**values, posted_by_id=user_id, version=Chore.next_version())
             
             db.session.add(chore)
+            db.session.flush()
+            record_chore_change([chore.id], None, 'active')
             db.session.commit()
             
-            return jsonify(chore.to_dict()), 201
+            progress_log.record(chore.id, 'posted', user_id)
+            chore_data = chore.to_dict()
+            chore_events.publish('chore.created', chore_data)
+            
+            return jsonify(chore_data), 201
             
         except Exception as e:
             db.session.rollback()
@@ -169,21 +484,35 @@ def create_app(config_name=None):
     def accept_chore(chore_id):
         try:
             user_id = get_jwt_identity()
-            chore = Chore.query.get_or_404(chore_id)
-            
-            if chore.status != 'active':
-                return jsonify({'message': 'Chore is not available for acceptance'}), 400
-            
-            if chore.posted_by_id == user_id:
-                return jsonify({'message': 'Cannot accept your own chore'}), 400
+            accepted = Chore.transition(
+                chore_id, 'active',
+                Chore.posted_by_id != user_id,
+                status='accepted',
+                accepted_by_id=user_id,
+                accepted_at=datetime.utcnow(),
+                pending_applications=0
+            )
             
-            chore.accepted_by_id = user_id
-            chore.accepted_at = datetime.utcnow()
-            chore.status = 'accepted'
+            if not accepted:
+                # Lost the race or failed a precondition; nothing was written
+                db.session.rollback()
+                chore = find_chore(chore_id)
+                if not chore:
+                    return jsonify({'message': 'Resource not found'}), 404
+                if chore.posted_by_id == user_id:
+                    return jsonify({'message': 'Cannot accept your own chore'}), 400
+                return jsonify({'message': 'Chore is not available for acceptance'}), 409
             
+            record_chore_change([chore_id], 'active', 'accepted')
+            close_applications(chore_id, user_id)
             db.session.commit()
+            progress_log.record(chore_id, 'accepted', user_id)
+            chore = db.session.get(Chore, chore_id)
+            
+            chore_data = chore.to_dict()
+            chore_events.publish('chore.accepted', chore_data)
             
-            return jsonify(chore.to_dict()), 200
+            return jsonify(chore_data), 200
             
         except Exception as e:
             db.session.rollback()
@@ -194,32 +523,390 @@ def create_app(config_name=None):
     def complete_chore(chore_id):
         try:
             user_id = get_jwt_identity()
-            chore = Chore.query.get_or_404(chore_id)
-            
-            if chore.status != 'accepted':
-                return jsonify({'message': 'Chore is not in accepted status'}), 400
+            completed = Chore.transition(
+                chore_id, 'accepted',
+                Chore.accepted_by_id == user_id,
+                status='completed',
+                completed_by_id=user_id,
+                completed_at=datetime.utcnow()
+            )
             
-            if chore.accepted_by_id != user_id:
+            if not completed:
+                db.session.rollback()
+                chore = find_chore(chore_id)
+                if not chore:
+                    return jsonify({'message': 'Resource not found'}), 404
+                if chore.status != 'accepted':
+                    return jsonify({'message': 'Chore is not in accepted status'}), 409
                 return jsonify({'message': 'Only the accepter can complete this chore'}), 403
             
-            chore.completed_by_id = user_id
-            chore.completed_at = datetime.utcnow()
-            chore.status = 'completed'
-            
+            record_chore_change([chore_id], 'accepted', 'completed')
             db.session.commit()
+            progress_log.record(chore_id, 'completed', user_id)
+            chore = db.session.get(Chore, chore_id)
             
-            return jsonify(chore.to_dict()), 200
+            chore_data = chore.to_dict()
+            chore_events.publish('chore.completed', chore_data)
+            
+            return jsonify(chore_data), 200
             
         except Exception as e:
             db.session.rollback()
             return jsonify({'message': f'Failed to complete chore: {str(e)}'}), 500
     
+    @app.route('/api/chores/<int:chore_id>/progress', methods=['GET'])
+    @jwt_required()
+    def get_chore_progress(chore_id):
+        user_id = get_jwt_identity()
+        chore = find_chore(chore_id)
+        if not chore:
+            return jsonify({'message': 'Resource not found'}), 404
+        if user_id not in (chore.posted_by_id, chore.accepted_by_id):
+            return jsonify({'message': 'Only the poster and the runner can track this chore'}), 403
+        try:
+            after_seq = int(request.args.get('after_seq', 0))
+        except ValueError:
+            return jsonify({'message': 'after_seq must be a number'}), 400
+        per_page = parse_per_page(
+            request.args.get('per_page'),
+            app.config['PROGRESS_PER_PAGE'],
+            app.config['PROGRESS_MAX_PER_PAGE']
+        )
+        
+        # Only entries newer than the caller's last seq, off (chore_id, seq)
+        events = progress_log.events(chore_id, after_seq, per_page)
+        return jsonify({
+            'choreId': chore_id,
+            'status': chore.status,
+            'events': [event.to_dict() for event in events],
+            'lastSeq': events[-1].seq if events else after_seq,
+            'hasMore': len(events) == per_page
+        }), 200
+    
+    @app.route('/api/chores/<int:chore_id>/progress', methods=['POST'])
+    @jwt_required()
+    def report_chore_progress(chore_id):
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        step = data.get('step')
+        if step not in STEPS:
+            return jsonify({'message': f"step must be one of: {', '.join(STEPS)}"}), 400
+        chore = find_chore(chore_id)
+        if not chore:
+            return jsonify({'message': 'Resource not found'}), 404
+        if chore.status != 'accepted':
+            return jsonify({'message': 'Chore is not in accepted status'}), 400
+        if chore.accepted_by_id != user_id:
+            return jsonify({'message': 'Only the runner can report progress'}), 403
+        
+        progress_log.record(chore_id, step, user_id)
+        chore_events.publish('chore.progress', {'id': chore_id, 'step': step})
+        return jsonify({'message': 'Progress recorded'}), 202
+    
+    @app.route('/api/chores/<int:chore_id>/contact', methods=['POST'])
+    @jwt_required()
+    def contact_chore_party(chore_id):
+        user_id = get_jwt_identity()
+        data = request.get_json() or {}
+        contact_type = data.get('contactType')
+        if contact_type not in ('message', 'call'):
+            return jsonify({'message': 'contactType must be message or call'}), 400
+        chore = find_chore(chore_id)
+        if not chore:
+            return jsonify({'message': 'Resource not found'}), 404
+        if user_id not in (chore.posted_by_id, chore.accepted_by_id):
+            return jsonify({'message': 'Only the poster and the runner can contact each other'}), 403
+        if chore.status != 'accepted':
+            return jsonify({'message': 'Chore is not in accepted status'}), 400
+        
+        # The other party sees the request in the chore's progress log
+        progress_log.record(chore_id, 'contact', user_id, {'contactType': contact_type})
+        return jsonify({'message': 'Contact request sent'}), 202
+    
+    @app.route('/api/chores/<int:chore_id>/applications', methods=['POST'])
+    @jwt_required()
+    def apply_to_chore(chore_id):
+        try:
+            user_id = get_jwt_identity()
+            data = request.get_json() or {}
+            message = data.get('message')
+            if message is not None and not isinstance(message, str):
+                return jsonify({'message': 'message must be text'}), 400
+            
+            try:
+                application = apply(chore_id, user_id, message)
+            except IntegrityError:
+                db.session.rollback()
+                return jsonify({'message': 'You have already applied to this chore'}), 409
+            
+            if application is None:
+                db.session.rollback()
+                chore = find_chore(chore_id)
+                if not chore:
+                    return jsonify({'message': 'Resource not found'}), 404
+                if chore.posted_by_id == user_id:
+                    return jsonify({'message': 'Cannot apply to your own chore'}), 400
+                return jsonify({'message': 'Chore is not open for applications'}), 400
+            
+            db.session.commit()
+            return jsonify(serialize_applications([application])[0]), 201
+            
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'message': f'Failed to apply to chore: {str(e)}'}), 500
+    
+    def applications_page(query, newest_first):
+        """One keyset page of applications ordered by (applied_at, id), plus its next cursor"""
+        cursor = request.args.get('cursor')
+        per_page = parse_per_page(
+            request.args.get('per_page'),
+            app.config['APPLICATIONS_PER_PAGE'],
+            app.config['APPLICATIONS_MAX_PER_PAGE']
+        )
+        status = request.args.get('status')
+        if status:
+            query = query.where(ChoreApplication.status == status)
+        if cursor:
+            last_applied_at, last_id = decode_cursor(cursor)
+            last_applied_at, last_id = datetime.fromisoformat(last_applied_at), int(last_id)
+            if newest_first:
+                query = query.where(or_(
+                    ChoreApplication.applied_at < last_applied_at,
+                    and_(ChoreApplication.applied_at == last_applied_at, ChoreApplication.id < last_id)
+                ))
+            else:
+                query = query.where(or_(
+                    ChoreApplication.applied_at > last_applied_at,
+                    and_(ChoreApplication.applied_at == last_applied_at, ChoreApplication.id > last_id)
+                ))
+        order = (ChoreApplication.applied_at.desc(), ChoreApplication.id.desc()) if newest_first else \
+            (ChoreApplication.applied_at, ChoreApplication.id)
+        applications = db.session.scalars(query.order_by(*order).limit(per_page + 1)).all()
+        next_cursor = None
+        if len(applications) > per_page:
+            applications = applications[:per_page]
+            next_cursor = encode_cursor(applications[-1].applied_at, applications[-1].id)
+        return applications, next_cursor
+    
+    @app.route('/api/chores/<int:chore_id>/applications', methods=['GET'])
+    @jwt_required()
+    def get_chore_applications(chore_id):
+        try:
+            user_id = get_jwt_identity()
+            chore = find_chore(chore_id)
+            if not chore:
+                return jsonify({'message': 'Resource not found'}), 404
+            if chore.posted_by_id != user_id:
+                return jsonify({'message': 'Only the poster can see applications to this chore'}), 403
+            
+            # Oldest first on (chore_id, status, applied_at)
+            try:
+                applications, next_cursor = applications_page(
+                    db.select(ChoreApplication).where(ChoreApplication.chore_id == chore_id),
+                    newest_first=False
+                )
+            except (ValueError, TypeError):
+                return jsonify({'message': 'Invalid cursor'}), 400
+            
+            return jsonify({
+                'applications': serialize_applications(applications),
+                'pendingApplications': chore.pending_applications,
+                'next_cursor': next_cursor
+            }), 200
+            
+        except Exception as e:
+            return jsonify({'message': f'Failed to get applications: {str(e)}'}), 500
+    
+    @app.route('/api/chores/<int:chore_id>/applications/decision', methods=['POST'])
+    @jwt_required()
+    def decide_applications(chore_id):
+        try:
+            user_id = get_jwt_identity()
+            data = request.get_json() or {}
+            application_id = data.get('applicationId')
+            if not isinstance(application_id, int) or isinstance(application_id, bool):
+                return jsonify({'message': 'applicationId is required'}), 400
+            
+            # Accept the chore for the applicant and settle every pending
+            # application in one transaction. The applicant is read inside the
+            # conditional UPDATE, so nothing is read before the write
+            pending = db.select(ChoreApplication.user_id).where(
+                ChoreApplication.id == application_id,
+                ChoreApplication.chore_id == chore_id,
+                ChoreApplication.status == 'pending'
+            )
+            accepted = Chore.transition(
+                chore_id, 'active',
+                Chore.posted_by_id == user_id,
+                pending.exists(),
+                status='accepted',
+                accepted_by_id=pending.scalar_subquery(),
+                accepted_at=datetime.utcnow(),
+                pending_applications=0
+            )
+            
+            if not accepted:
+                db.session.rollback()
+                chore = find_chore(chore_id)
+                application = db.session.get(ChoreApplication, application_id)
+                if not chore or not application or application.chore_id != chore_id:
+                    return jsonify({'message': 'Resource not found'}), 404
+                if chore.posted_by_id != user_id:
+                    return jsonify({'message': 'Only the poster can decide on applications'}), 403
+                if application.status != 'pending':
+                    return jsonify({'message': 'Application is no longer pending'}), 400
+                return jsonify({'message': 'Chore is not available for acceptance'}), 409
+            
+            chore = db.session.get(Chore, chore_id)
+            applicant_id = chore.accepted_by_id
+            record_chore_change([chore_id], 'active', 'accepted')
+            settled = close_applications(chore_id, applicant_id)
+            db.session.commit()
+            progress_log.record(chore_id, 'accepted', applicant_id)
+            
+            chore_data = chore.to_dict()
+            chore_events.publish('chore.accepted', chore_data)
+            
+            return jsonify({
+                'chore': chore_data,
+                'acceptedApplicationId': application_id,
+                'rejected': settled - 1
+            }), 200
+            
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'message': f'Failed to decide on applications: {str(e)}'}), 500
+    
+    @app.route('/api/user/applications', methods=['GET'])
+    @jwt_required()
+    def get_user_applications():
+        try:
+            user_id = get_jwt_identity()
+            # Newest first on (user_id, applied_at)
+            try:
+                applications, next_cursor = applications_page(
+                    db.select(ChoreApplication).where(ChoreApplication.user_id == user_id),
+                    newest_first=True
+                )
+            except (ValueError, TypeError):
+                return jsonify({'message': 'Invalid cursor'}), 400
+            
+            return jsonify({'applications': serialize_applications(applications), 'next_cursor': next_cursor}), 200
+            
+        except Exception as e:
+            return jsonify({'message': f'Failed to get applications: {str(e)}'}), 500
+    
+    @app.route('/api/user/applications/inbox', methods=['GET'])
+    @jwt_required()
+    def get_application_inbox():
+        try:
+            user_id = get_jwt_identity()
+            cursor = request.args.get('cursor')
+            per_page = parse_per_page(
+                request.args.get('per_page'),
+                app.config['CHORES_PER_PAGE'],
+                app.config['CHORES_MAX_PER_PAGE']
+            )
+            
+            # The poster's open chores that have pending applications, newest
+            # first on (posted_by_id, posted_at); counts come off the chore row
+            query = Chore.query.filter(
+                Chore.posted_by_id == user_id,
+                Chore.status == 'active',
+                Chore.pending_applications > 0
+            )
+            if cursor:
+                try:
+                    last_posted_at, last_id = decode_cursor(cursor)
+                    last_posted_at, last_id = datetime.fromisoformat(last_posted_at), int(last_id)
+                except (ValueError, TypeError):
+                    return jsonify({'message': 'Invalid cursor'}), 400
+                query = query.filter(or_(
+                    Chore.posted_at < last_posted_at,
+                    and_(Chore.posted_at == last_posted_at, Chore.id < last_id)
+                ))
+            chores = query.order_by(Chore.posted_at.desc(), Chore.id.desc()).limit(per_page + 1).all()
+            next_cursor = None
+            if len(chores) > per_page:
+                chores = chores[:per_page]
+                next_cursor = encode_cursor(chores[-1].posted_at, chores[-1].id)
+            
+            # Every listed chore's pending applications in one IN query
+            pending = {chore.id: [] for chore in chores}
+            applications = db.session.scalars(
+                db.select(ChoreApplication)
+                .where(ChoreApplication.chore_id.in_(pending), ChoreApplication.status == 'pending')
+                .order_by(ChoreApplication.chore_id, ChoreApplication.applied_at, ChoreApplication.id)
+            ).all()
+            for application in serialize_applications(applications):
+                pending[application['chore_id']].append(application)
+            
+            return jsonify({
+                'chores': [
+                    {**chore_data, 'pendingApplications': chore.pending_applications, 'applications': pending[chore.id]}
+                    for chore, chore_data in zip(chores, serialize_chores(chores, include_user_details=False))
+                ],
+                'next_cursor': next_cursor
+            }), 200
+            
+        except Exception as e:
+            return jsonify({'message': f'Failed to get application inbox: {str(e)}'}), 500
+    
+    @app.route('/api/chores/<int:chore_id>/reviews', methods=['POST'])
+    @jwt_required()
+    def create_review(chore_id):
+        try:
+            user_id = get_jwt_identity()
+            data = request.get_json()
+            
+            rating = data.get('rating')
+            if not isinstance(rating, int) or isinstance(rating, bool) or not 1 <= rating <= 5:
+                return jsonify({'message': 'rating must be a whole number from 1 to 5'}), 400
+            
+            chore = find_chore(chore_id)
+            if not chore:
+                return jsonify({'message': 'Resource not found'}), 404
+            if chore.status != 'completed':
+                return jsonify({'message': 'Only completed chores can be reviewed'}), 400
+            
+            # The poster and the completer review each other
+            if user_id == chore.posted_by_id:
+                reviewee_id = chore.completed_by_id
+            elif user_id == chore.completed_by_id:
+                reviewee_id = chore.posted_by_id
+            else:
+                return jsonify({'message': 'Only the poster and completer can review this chore'}), 403
+            
+            review = Review(
+                chore_id=chore_id,
+                reviewer_id=user_id,
+                reviewee_id=reviewee_id,
+                rating=rating,
+                comment=data.get('comment')
+            )
+            try:
+                record_review(review)
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                return jsonify({'message': 'You have already reviewed this chore'}), 409
+            user_cache.invalidate(reviewee_id)
+            
+            users = user_cache.get_many([user_id, reviewee_id])
+            return jsonify(review.to_dict(users=users, chores={chore.id: chore})), 201
+            
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'message': f'Failed to submit review: {str(e)}'}), 500
+    
     @app.route('/api/user/profile', methods=['GET'])
     @jwt_required()
     def get_profile():
         try:
             user_id = get_jwt_identity()
-            user = User.query.get_or_404(user_id)
+            user = user_cache.get(user_id)
+            if not user:
+                return jsonify({'message': 'Resource not found'}), 404
             return jsonify(user.to_dict()), 200
         except Exception as e:
             return jsonify({'message': f'Failed to get profile: {str(e)}'}), 500
@@ -238,14 +925,28 @@ def create_app(config_name=None):
                 if field in data:
                     setattr(user, field, data[field])
             
+            if 'latitude' in data or 'longitude' in data:
+                try:
+                    latitude, longitude = data.get('latitude'), data.get('longitude')
+                    if latitude is not None or longitude is not None:
+                        latitude, longitude = float(latitude), float(longitude)
+                        validate_point(latitude, longitude)
+                except (TypeError, ValueError):
+                    return jsonify({'message': 'latitude and longitude must be valid coordinates'}), 400
+                user.latitude, user.longitude = latitude, longitude
+            
             # Handle password update separately
             if 'password' in data and data['password']:
                 user.set_password(data['password'])
             
             db.session.commit()
+            user_cache.invalidate(user_id)
             
             return jsonify(user.to_dict()), 200
             
+        except PasswordHasherBusy:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             return jsonify({'message': f'Failed to update profile: {str(e)}'}), 500
@@ -256,41 +957,199 @@ def create_app(config_name=None):
         try:
             user_id = get_jwt_identity()
             chore_type = request.args.get('type', 'all')  # posted, accepted, completed, all
+            cursor = request.args.get('cursor')
+            per_page = parse_per_page(
+                request.args.get('per_page'),
+                app.config['CHORES_PER_PAGE'],
+                app.config['CHORES_MAX_PER_PAGE']
+            )
+            try:
+                fields = parse_fields(request.args.get('fields'))
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
+            if cursor:
+                try:
+                    last_key, last_id = decode_cursor(cursor)
+                    last_key = datetime.fromisoformat(last_key)
+                    last_id = int(last_id)
+                except (ValueError, TypeError):
+                    return jsonify({'message': 'Invalid cursor'}), 400
             
-            if chore_type == 'posted':
-                chores = Chore.query.filter_by(posted_by_id=user_id).order_by(Chore.posted_at.desc()).all()
-            elif chore_type == 'accepted':
-                chores = Chore.query.filter_by(accepted_by_id=user_id, status='accepted').order_by(Chore.accepted_at.desc()).all()
-            elif chore_type == 'completed':
-                chores = Chore.query.filter_by(completed_by_id=user_id, status='completed').order_by(Chore.completed_at.desc()).all()
-            else:
-                # All chores related to user
-                posted = Chore.query.filter_by(posted_by_id=user_id).all()
-                accepted = Chore.query.filter_by(accepted_by_id=user_id).all()
-                completed = Chore.query.filter_by(completed_by_id=user_id).all()
-                
-                # Combine and remove duplicates
-                chore_ids = set()
-                chores = []
-                for chore_list in [posted, accepted, completed]:
-                    for chore in chore_list:
-                        if chore.id not in chore_ids:
-                            chores.append(chore)
-                            chore_ids.add(chore.id)
+            # Each type seeks on its own (user, timestamp) index; "all" unions
+            # the three role lookups and orders by the latest activity. Settled
+            # history may live in the archive, which has the same indexes, so
+            # both tables are read and their pages merged.
+            def history_page(model):
+                query = model.query.options(*chore_load_options(fields, model))
+                if chore_type == 'posted':
+                    query = query.filter(model.posted_by_id == user_id)
+                    sort_key = model.posted_at
+                elif chore_type == 'accepted':
+                    query = query.filter(model.accepted_by_id == user_id, model.status == 'accepted')
+                    sort_key = model.accepted_at
+                elif chore_type == 'completed':
+                    query = query.filter(model.completed_by_id == user_id, model.status == 'completed')
+                    sort_key = model.completed_at
+                else:
+                    mine = db.union(
+                        db.select(model.id).where(model.posted_by_id == user_id),
+                        db.select(model.id).where(model.accepted_by_id == user_id),
+                        db.select(model.id).where(model.completed_by_id == user_id)
+                    )
+                    query = query.filter(model.id.in_(mine))
+                    sort_key = db.func.coalesce(model.completed_at, model.accepted_at, model.posted_at)
                 
-                # Sort by most recent activity
-                chores.sort(key=lambda x: x.posted_at, reverse=True)
+                if cursor:
+                    query = query.filter(or_(
+                        sort_key < last_key,
+                        and_(sort_key == last_key, model.id < last_id)
+                    ))
+                return query.add_columns(sort_key).order_by(sort_key.desc(), model.id.desc()).limit(per_page + 1).all()
             
-            return jsonify([chore.to_dict() for chore in chores]), 200
+            rows = history_page(Chore)
+            # Accepted chores are never settled, so never archived
+            if chore_type != 'accepted':
+                rows = sorted(
+                    rows + history_page(ArchivedChore),
+                    key=lambda row: (row[1], row[0].id),
+                    reverse=True
+                )[:per_page + 1]
+            items = [chore for chore, _ in rows[:per_page]]
+            next_cursor = None
+            if len(rows) > per_page:
+                next_cursor = encode_cursor(rows[per_page - 1][1], items[-1].id)
+            
+            return jsonify({'chores': serialize_chores(items, fields=fields), 'next_cursor': next_cursor}), 200
             
         except Exception as e:
             return jsonify({'message': f'Failed to get user chores: {str(e)}'}), 500
     
+    @app.route('/api/user/stats', methods=['GET'])
+    @jwt_required()
+    def get_user_stats():
+        try:
+            return jsonify(user_stats(get_jwt_identity())), 200
+        except Exception as e:
+            return jsonify({'message': f'Failed to get user stats: {str(e)}'}), 500
+    
     @app.route('/api/health', methods=['GET'])
     def health_check():
-        return jsonify({'status': 'healthy', 'timestamp': datetime.utcnow().isoformat()}), 200
+        return jsonify({
+            'status': 'healthy',
+            'timestamp': datetime.utcnow().isoformat(),
+            'passwordHashing': password_hasher.stats(),
+            'userCache': user_cache.stats(),
+            'tokenDenylist': token_denylist.stats(),
+            'rateLimits': rate_limiter.stats(),
+            'maintenance': chore_maintenance.stats(),
+            'ranking': feed_ranker.stats(),
+            'replica': replica_router.stats(),
+            'progress': progress_log.stats()
+        }), 200
+    
+    @app.route('/api/metrics', methods=['GET'])
+    @metrics_access_required
+    def metrics():
+        return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+    
+    @app.route('/api/metrics/profile', methods=['GET'])
+    @metrics_access_required
+    def metrics_profile():
+        profile = request_metrics.profile()
+        if profile is None:
+            return jsonify({'message': 'Profiling is disabled, set METRICS_PROFILE_INTERVAL (not available under gevent)'}), 404
+        return Response(profile, mimetype='text/plain')
+    
+    @app.cli.command('rebuild-application-counts')
+    def rebuild_application_counts_command():
+        """Recompute every chore's pending application count from chore_applications."""
+        rebuild_application_counts()
+        db.session.commit()
+        click.echo('Rebuilt pending application counts')
+    
+    @app.cli.command('rebuild-ratings')
+    def rebuild_ratings_command():
+        """Recompute every user's rating aggregates from the reviews table."""
+        updated = rebuild_ratings()
+        db.session.commit()
+        # Only reaches this process's cache; workers with a memory backend
+        # pick up the new ratings when their entries expire
+        user_cache.clear()
+        click.echo(f'Rebuilt ratings for {updated} reviewed users')
+    
+    @app.cli.command('rebuild-user-stats')
+    def rebuild_user_stats_command():
+        """Recompute every user's dashboard counters from live and archived chores."""
+        rebuild_user_stats()
+        db.session.commit()
+        click.echo('Rebuilt user chore stats')
+    
+    @app.cli.command('expire-chores')
+    def expire_chores_command():
+        """Expire overdue active chores now (the same pass the scheduler runs)."""
+        report = chore_maintenance.run(archive=False)
+        if report is None:
+            click.echo('Another worker holds the maintenance lease, try again later')
+        else:
+            click.echo(f"Expired {report['expired']} overdue chores in {report['seconds']}s")
+    
+    @app.cli.command('archive-chores')
+    @click.option('--older-than-days', type=int, help='Settled age to archive at [ARCHIVE_AFTER_DAYS]')
+    def archive_chores_command(older_than_days):
+        """Move long-settled chores to chores_archive now; safe to interrupt and rerun."""
+        if older_than_days is not None:
+            chore_maintenance.archive_after_days = older_than_days
+        if not chore_maintenance.archive_after_days:
+            click.echo('Archiving is disabled, set ARCHIVE_AFTER_DAYS or pass --older-than-days')
+            return
+        report = chore_maintenance.run(expire=False)
+        if report is None:
+            click.echo('Another worker holds the maintenance lease, try again later')
+        else:
+            click.echo(f"Archived {report['archived']} settled chores in {report['seconds']}s")
+    
+    @app.cli.command('sync-replica')
+    def sync_replica_command():
+        """Copy the SQLite primary over the SQLite replica once (the replication stand-in)."""
+        if not replica_router.enabled:
+            click.echo('No replica configured, set REPLICA_DATABASE_URL')
+            return
+        report = replica_router.sync()
+        click.echo(f"Synced replica in {report['seconds']}s")
+    
+    @app.cli.command('generate')
+    @click.option('--users', default=10000, show_default=True, help='Number of users')
+    @click.option('--chores', default=100000, show_default=True, help='Number of chores')
+    @click.option('--applications-per-chore', default=1.5, show_default=True, help='Mean applications per chore')
+    @click.option('--seed', default=1, show_default=True, help='Random seed')
+    @click.option('--anchor', type=click.DateTime(['%Y-%m-%d']), help='Date timestamps count back from [today]')
+    def generate_command(users, chores, applications_per_chore, seed, anchor):
+        """Replace the database with a synthetic dataset for load and benchmark work."""
+        from generate import generate_dataset  # Faker and Alembic, for this command only
+        started = time.perf_counter()
+        counts = generate_dataset(users, chores, applications_per_chore, seed, anchor, log=click.echo)
+        user_cache.clear()
+        summary = ', '.join(f'{count} {table}' for table, count in counts.items())
+        click.echo(f'Generated {summary} in {time.perf_counter() - started:.1f}s')
     
     # Error handlers
+    @app.errorhandler(PasswordHasherBusy)
+    def hasher_busy(error):
+        response = jsonify({'message': str(error)})
+        response.headers['Retry-After'] = '1'
+        return response, 429
+    
+    @jwt.expired_token_loader
+    def token_expired(jwt_header, jwt_payload):
+        return jsonify({'message': 'Token has expired'}), 401
+    
+    @jwt.revoked_token_loader
+    def token_revoked(jwt_header, jwt_payload):
+        if 'exp' not in jwt_payload:
+            # Issued before tokens expired; see revocation.py
+            return jsonify({'message': 'Token has no expiry, please log in again'}), 401
+        return jsonify({'message': 'Token has been revoked'}), 401
+    
     @app.errorhandler(404)
     def not_found(error):
         return jsonify({'message': 'Resource not found'}), 404
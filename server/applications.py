@@ -0,0 +1,68 @@
+from models import db, Chore, ChoreApplication
+
+# Applications to chores. A runner applies to an active chore; its poster then
+# picks one applicant, which accepts the chore on their behalf and rejects every
+# other pending application in the same transaction.
+#
+# Chore.pending_applications counts a chore's pending applications. apply()
+# bumps it in the conditional UPDATE that checks the chore is still open, and
+# accepting a chore zeroes it in the transition itself, so the poster's inbox
+# reads counts off the chores it lists instead of counting applications.
+# Expiry rejects what is left pending and zeroes the counter the same way.
+# rebuild_application_counts() recomputes them from chore_applications.
+
+def apply(chore_id, user_id, message=None):
+    """Add a pending application by user_id and count it; the caller commits.
+
+    Returns None when the chore is not open to this user (missing, not active,
+    or their own). Raises IntegrityError if they have already applied.
+    """
+    counted = db.session.execute(
+        db.update(Chore)
+        .where(Chore.id == chore_id, Chore.status == 'active', Chore.posted_by_id != user_id)
+        .values(pending_applications=Chore.pending_applications + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if counted.rowcount != 1:
+        return None
+    application = ChoreApplication(chore_id=chore_id, user_id=user_id, message=message, status='pending')
+    db.session.add(application)
+    db.session.flush()
+    return application
+
+def close_applications(chore_id, accepted_user_id):
+    """Settle a just-accepted chore's pending applications in one UPDATE.
+
+    The runner's own application (if any) is accepted and the rest rejected.
+    Returns the number of applications settled. Runs in the transaction that
+    accepted the chore, whose transition already zeroed its counter.
+    """
+    result = db.session.execute(
+        db.update(ChoreApplication)
+        .where(ChoreApplication.chore_id == chore_id, ChoreApplication.status == 'pending')
+        .values(status=db.case((ChoreApplication.user_id == accepted_user_id, 'accepted'), else_='rejected'))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+def reject_pending(chore_ids):
+    """Reject the pending applications of chores that closed without a runner (expired)"""
+    db.session.execute(
+        db.update(ChoreApplication)
+        .where(ChoreApplication.chore_id.in_(chore_ids), ChoreApplication.status == 'pending')
+        .values(status='rejected')
+        .execution_options(synchronize_session=False)
+    )
+
+def rebuild_application_counts():
+    """Recompute every live chore's pending count in one correlated pass; the caller commits"""
+    pending = (
+        db.select(db.func.count())
+        .where(ChoreApplication.chore_id == Chore.id, ChoreApplication.status == 'pending')
+        .scalar_subquery()
+    )
+    db.session.execute(
+        db.update(Chore)
+        .values(pending_applications=pending)
+        .execution_options(synchronize_session=False)
+    )
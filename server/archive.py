@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from models import db, Chore, ArchivedChore
+
+# Hot/cold split of the chores table. Chores that settled (completed, cancelled
+# or expired) more than ARCHIVE_AFTER_DAYS ago are moved to chores_archive, so
+# the live table, its indexes and the FTS index only grow with recent activity.
+#
+# archive_settled() runs from the maintenance scheduler under its lease. Each
+# batch copies rows and deletes them in one transaction that re-checks their
+# status, so an interrupted run leaves every chore in exactly one table and the
+# next run carries on from what is left.
+#
+# Archived rows keep their id, and reviews and applications keep pointing at
+# it. Reads by id go through find_chore() (or serializers.load_chores for a
+# page), which fall back to the archive. SQLite hands out max(id) + 1 for new
+# rows, so the newest chore is never archived: that would let its id be reused.
+#
+# Leaving the live table is a change to the feed: each archived row takes a new
+# change marker, so the feed ETag moves and since= lists it under 'removed'.
+
+SETTLED_STATUSES = ('completed', 'cancelled', 'expired')
+
+def find_chore(chore_id):
+    """The live chore with this id, else its archived copy, else None"""
+    return db.session.get(Chore, chore_id) or db.session.get(ArchivedChore, chore_id)
+
+def archive_settled(older_than_days, batch_size=500, renew=None):
+    """Move chores settled more than older_than_days ago to the archive.
+
+    Returns the number of chores moved. `renew` is called before each batch and
+    stops the run when it returns False (the lease was lost).
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    chores = Chore.__table__
+    archive = ArchivedChore.__table__
+    columns = [column.name for column in chores.columns]
+    moved = 0
+    for status in SETTLED_STATUSES:
+        while True:
+            if renew is not None and not renew():
+                return moved
+            # Range scan on (status, posted_at): a chore cannot settle before it
+            # was posted, so posted_at < cutoff bounds the candidates
+            newest_id = db.session.scalar(db.select(db.func.max(Chore.id)))
+            ids = db.session.scalars(
+                db.select(Chore.id)
+                .where(
+                    Chore.status == status,
+                    Chore.posted_at < cutoff,
+                    db.func.coalesce(Chore.completed_at, Chore.posted_at) < cutoff,
+                    Chore.id != newest_id
+                )
+                .order_by(Chore.posted_at)
+                .limit(batch_size)
+            ).all()
+            # End the read so the move below starts from a fresh snapshot
+            db.session.rollback()
+            if not ids:
+                break
+
+            settled = db.and_(chores.c.id.in_(ids), chores.c.status.in_(SETTLED_STATUSES))
+            now = datetime.utcnow()
+            db.session.execute(
+                db.insert(archive).from_select(
+                    columns + ['archived_at'],
+                    db.select(*(chores.c[name] for name in columns), db.literal(now, db.DateTime)).where(settled)
+                )
+            )
+            # Rows that are no longer settled were not copied; their markers are skipped
+            first = Chore.next_version(len(ids)) - len(ids) + 1
+            markers = {chore_id: version for version, chore_id in enumerate(ids, first)}
+            db.session.execute(
+                db.update(archive)
+                .where(archive.c.id.in_(ids))
+                .values(version=db.case(markers, value=archive.c.id))
+            )
+            result = db.session.execute(db.delete(chores).where(settled))
+            db.session.commit()
+            moved += result.rowcount
+            if len(ids) < batch_size:
+                break
+    return moved
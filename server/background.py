@@ -0,0 +1,32 @@
+import os
+import threading
+
+# Background threads that run once per serving process: the maintenance
+# scheduler, the progress log flusher, the replication stand-in and the
+# sampling profiler. Each is started from a before_request hook (or the first
+# request that needs it), so every forked worker starts its own on its first
+# request, and CLI commands, which serve none, never start one.
+
+class ProcessThread:
+    """A daemon thread running target, started at most once per process by ensure()"""
+
+    def __init__(self, target, name):
+        self.target = target
+        self.name = name
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        """Whether this process has started the thread"""
+        return self._pid == os.getpid()
+
+    def ensure(self):
+        # Returns None, so it can be registered as a before_request hook
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self.target, name=self.name, daemon=True).start()
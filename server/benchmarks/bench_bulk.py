@@ -0,0 +1,89 @@
+"""Compare one POST /api/chores per row with the bulk import, and time the export.
+
+    python benchmarks/bench_bulk.py --chores 100000 --rows 5000
+
+Loads one synthetic dataset, then:
+- creates --rows chores one request at a time, and the same rows again through
+  one POST /api/chores/import (NDJSON);
+- streams the whole chores table through GET /api/chores/export as NDJSON,
+  CSV and gzipped NDJSON, reporting rows per second and the peak Python memory
+  allocated while streaming, which should not grow with the table.
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from common import SERVER_DIR, use_database
+
+# The benchmark's requests run as user 1
+use_database(OPERATOR_USER_IDS='1')
+os.environ.setdefault('METRICS_ENABLED', '0')
+
+def sample_rows(count):
+    return [{
+        'title': f'Bulk chore {i}',
+        'description': 'Loaded by the bulk benchmark',
+        'location': 'Greenpoint, Brooklyn',
+        'latitude': 40.73,
+        'longitude': -73.95,
+        'payment': 20 + i % 80,
+        'category': 'Cleaning',
+        'urgency': 'medium',
+        'dueDate': '2030-01-01T12:00:00'
+    } for i in range(count)]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chores', type=int, default=100000)
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    os.chdir(SERVER_DIR)
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from generate import generate_dataset
+
+    app = create_app()
+    with app.app_context():
+        generate_dataset(users=max(2, args.chores // 10), chores=args.chores, log=lambda message: None)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=1)}'}
+    client = app.test_client()
+    rows = sample_rows(args.rows)
+
+    started = time.perf_counter()
+    for row in rows:
+        assert client.post('/api/chores', json=row, headers=headers).status_code == 201
+    single = time.perf_counter() - started
+
+    body = ''.join(json.dumps(row) + '\n' for row in rows).encode('utf-8')
+    started = time.perf_counter()
+    response = client.post('/api/chores/import', data=body, headers={**headers, 'Content-Type': 'application/x-ndjson'})
+    bulk = time.perf_counter() - started
+    assert response.json['created'] == args.rows, response.json
+
+    print(f'Import of {args.rows:,} chores')
+    print(f'  one request per row   {single:8.2f} s  {args.rows / single:10,.0f} rows/s')
+    print(f'  bulk import           {bulk:8.2f} s  {args.rows / bulk:10,.0f} rows/s ({single / bulk:.0f}x)')
+
+    print(f'Export of {args.chores + 2 * args.rows:,} chores')
+    for name, url, extra in (
+        ('ndjson', '/api/chores/export', {}),
+        ('csv', '/api/chores/export?format=csv', {}),
+        ('ndjson, gzip', '/api/chores/export', {'Accept-Encoding': 'gzip'}),
+    ):
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = client.get(url, headers={**headers, **extra}, buffered=False)
+        size = sum(len(chunk) for chunk in response.response)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        response.close()
+        print(f'  {name:13} {elapsed:8.2f} s  {(args.chores + 2 * args.rows) / elapsed:10,.0f} rows/s  '
+              f'{size / 1e6:8.1f} MB  peak {peak / 1e6:6.1f} MB')
+
+    with app.app_context():
+        from models import db
+        db.engine.dispose()
@@ -0,0 +1,313 @@
+"""Drive a mixed API workload and report per-endpoint latency percentiles.
+
+    python benchmarks/bench_endpoints.py --sizes 10000 100000 --requests 5000 --output before.json
+    python benchmarks/bench_endpoints.py --sizes 10000 100000 --requests 5000 --compare before.json
+    python benchmarks/bench_endpoints.py --sizes 100000 --requests 1000 --clients 8
+
+Each size loads a synthetic dataset (see generate.py) with that many chores and
+a tenth as many users, then replays a weighted mix of browse, filter, login,
+create, accept and complete requests through the WSGI test client, so numbers
+reflect one worker's Python and SQL cost without network overhead. For every
+endpoint it reports throughput, p50/p95/p99 latency, SQL statements per request
+and non-2xx responses; --output writes them as JSON and --compare prints the
+change against an earlier run's file.
+
+--clients N replays N mixes at once, one thread and test client each, against
+the same app, the way a threaded or gevent worker serves concurrent requests.
+Open and accepted chores are dealt out between the clients so they do not race
+for the same rows; the mix throughput is then the aggregate over wall time and
+the percentiles include time spent waiting on the GIL and on SQLite's writer lock.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+
+import numpy as np
+
+from common import SERVER_DIR, remove_database, use_database
+
+# Share of requests per operation
+WORKLOAD = {
+    'browse': 40,
+    'browse_cursor': 10,
+    'filter': 20,
+    'login': 5,
+    'create': 10,
+    'accept': 8,
+    'complete': 7,
+}
+CATEGORIES = ['Cleaning', 'Shopping', 'Pet Care', 'Gardening', 'Moving', 'Assembly', 'Technology', 'Events']
+SESSION_USERS = 200
+
+# Config reads DATABASE_URL at import time, so every size reuses one path
+DB_PATH = use_database()
+
+# SQL statements issued by each client thread, counted by one engine listener
+_statements = threading.local()
+
+def _count_statement(*args):
+    _statements.count = getattr(_statements, 'count', 0) + 1
+
+class Workload:
+    """Issues one request per call to run() and records what it cost"""
+
+    def __init__(self, client, rng, users, locations, open_chores, in_progress):
+        self.client = client
+        self.rng = rng
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.users = users
+        self.tokens = {user_id: token for user_id, _, token in users}
+        self.locations = locations
+        # Chores waiting for someone to accept or complete them, refilled as the mix runs
+        self.open = deque(open_chores)
+        self.in_progress = deque(in_progress)
+        self.next_cursor = ''
+
+    def _headers(self, user_id):
+        return {'Authorization': f'Bearer {self.tokens[user_id]}'}
+
+    def _other_user(self, user_id):
+        while True:
+            other = self.rng.choice(self.users)[0]
+            if other != user_id:
+                return other
+
+    def request(self, name, method, url, **kwargs):
+        statements = getattr(_statements, 'count', 0)
+        started = time.perf_counter()
+        response = self.client.open(url, method=method, **kwargs)
+        elapsed = time.perf_counter() - started
+        self.samples[name].append((elapsed, _statements.count - statements))
+        if not 200 <= response.status_code < 300:
+            self.errors[name] += 1
+        return response
+
+    def run(self, operation):
+        rng = self.rng
+        if operation == 'browse':
+            self.request('browse', 'GET', '/api/chores')
+        elif operation == 'browse_cursor':
+            response = self.request('browse_cursor', 'GET', f'/api/chores?cursor={self.next_cursor}')
+            self.next_cursor = (response.get_json() or {}).get('next_cursor') or ''
+        elif operation == 'filter':
+            url = f'/api/chores?category={rng.choice(CATEGORIES)}'
+            if rng.random() < 0.5:
+                url += f'&location={rng.choice(self.locations)}'
+            self.request('filter', 'GET', url)
+        elif operation == 'login':
+            _, email, _ = rng.choice(self.users)
+            self.request('login', 'POST', '/api/login', json={'email': email, 'password': 'password123'})
+        elif operation == 'create':
+            user_id = rng.choice(self.users)[0]
+            response = self.request('create', 'POST', '/api/chores', headers=self._headers(user_id), json={
+                'title': 'Benchmark chore',
+                'description': 'Created by the endpoint benchmark',
+                'location': f'Main Street, {rng.choice(self.locations)}',
+                'payment': rng.randint(10, 200),
+                'category': rng.choice(CATEGORIES),
+                'urgency': rng.choice(['low', 'medium', 'high'])
+            })
+            if response.status_code == 201:
+                self.open.append((response.get_json()['id'], user_id))
+        elif operation == 'accept' and self.open:
+            chore_id, poster_id = self.open.popleft()
+            worker_id = self._other_user(poster_id)
+            response = self.request('accept', 'PATCH', f'/api/chores/{chore_id}/accept', headers=self._headers(worker_id))
+            if response.status_code == 200:
+                self.in_progress.append((chore_id, worker_id))
+        elif operation == 'complete' and self.in_progress:
+            chore_id, worker_id = self.in_progress.popleft()
+            if worker_id not in self.tokens:
+                self.tokens[worker_id] = self._mint(worker_id)
+            self.request('complete', 'PATCH', f'/api/chores/{chore_id}/complete', headers=self._headers(worker_id))
+
+    def _mint(self, user_id):
+        from flask_jwt_extended import create_access_token
+        with self.client.application.app_context():
+            return create_access_token(identity=user_id)
+
+def report(workloads, wall_seconds):
+    """Pool every client's samples into per-endpoint stats and the mix's aggregate req/s"""
+    merged = defaultdict(list)
+    errors = defaultdict(int)
+    for workload in workloads:
+        for name, samples in workload.samples.items():
+            merged[name].extend(samples)
+        for name, count in workload.errors.items():
+            errors[name] += count
+
+    endpoints = {}
+    for name, samples in sorted(merged.items()):
+        latencies = np.array([elapsed for elapsed, _ in samples]) * 1000
+        statements = np.array([count for _, count in samples])
+        endpoints[name] = {
+            'requests': len(samples),
+            'errors': errors[name],
+            'throughput_rps': round(len(samples) / (latencies.sum() / 1000), 1),
+            'mean_ms': round(float(latencies.mean()), 3),
+            'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+            'p95_ms': round(float(np.percentile(latencies, 95)), 3),
+            'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+            'sql_per_request': round(float(statements.mean()), 2),
+        }
+    total = sum(len(samples) for samples in merged.values())
+    return {
+        'clients': len(workloads),
+        'requests': total,
+        'throughput_rps': round(total / wall_seconds, 1),
+        'endpoints': endpoints,
+    }
+
+def run(size, requests, warmup, seed, clients=1):
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from generate import generate_dataset
+    from models import db, Chore, User
+    from user_cache import user_cache
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        generate_dataset(users=max(2, size // 10), chores=size, seed=seed, log=lambda message: None)
+        user_cache.clear()
+        print(f'\n{size:,} chores loaded in {time.perf_counter() - started:.1f}s')
+        session_users = db.session.scalars(db.select(User).order_by(User.id).limit(SESSION_USERS)).all()
+        # Tokens are minted directly so only the login operation pays for bcrypt
+        users = [(user.id, user.email, create_access_token(identity=user.id)) for user in session_users]
+        locations = sorted({user.location.split(', ')[-1] for user in session_users if user.location})
+        open_chores = db.session.execute(
+            db.select(Chore.id, Chore.posted_by_id).where(Chore.status == 'active')
+            .order_by(Chore.id.desc()).limit(5000)
+        ).all()
+        in_progress = db.session.execute(
+            db.select(Chore.id, Chore.accepted_by_id).where(Chore.status == 'accepted')
+            .order_by(Chore.id.desc()).limit(5000)
+        ).all()
+        db.event.listen(db.engine, 'before_cursor_execute', _count_statement)
+
+    # Client i gets every clients-th open and accepted chore and its own seeded mix
+    workloads = [
+        Workload(app.test_client(), random.Random(seed + index), users, locations,
+                 open_chores[index::clients], in_progress[index::clients])
+        for index in range(clients)
+    ]
+    barrier = threading.Barrier(clients)
+    spans = [None] * clients
+    failures = []
+
+    def drive(index):
+        workload = workloads[index]
+        rng = workload.rng
+        operations = rng.choices(list(WORKLOAD), weights=list(WORKLOAD.values()), k=warmup + requests)
+        try:
+            for operation in operations[:warmup]:
+                workload.run(operation)
+            workload.samples.clear()
+            workload.errors.clear()
+            barrier.wait()
+            started = time.perf_counter()
+            for operation in operations[warmup:]:
+                workload.run(operation)
+            spans[index] = (started, time.perf_counter())
+        except Exception as e:
+            barrier.abort()
+            failures.append(e)
+
+    threads = [threading.Thread(target=drive, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if failures:
+        # A client that failed aborts the barrier the others wait on; report its error
+        raise next((e for e in failures if not isinstance(e, threading.BrokenBarrierError)), failures[0])
+    wall_seconds = max(end for _, end in spans) - min(started for started, _ in spans)
+    result = report(workloads, wall_seconds)
+
+    with app.app_context():
+        db.event.remove(db.engine, 'before_cursor_execute', _count_statement)
+
+    print(f"  mix: {result['requests']} requests from {clients} client(s), {result['throughput_rps']} req/s")
+    print(f"  {'endpoint':14} {'req':>6} {'err':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'sql/req':>8}")
+    for name, stats in result['endpoints'].items():
+        print(f"  {name:14} {stats['requests']:6} {stats['errors']:4} {stats['throughput_rps']:8.1f} "
+              f"{stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} {stats['sql_per_request']:8.2f}")
+
+    with app.app_context():
+        db.engine.dispose()
+    remove_database(DB_PATH)
+    return result
+
+def compare(results, baseline):
+    """Print each endpoint's change against a previous run, matched by size"""
+    print(f"\nChange vs {baseline.get('commit') or 'baseline'} (negative latency is faster)")
+    clients = baseline.get('config', {}).get('clients', 1)
+    for size, result in results.items():
+        before = baseline['results'].get(size)
+        if not before:
+            continue
+        print(f'  {int(size):,} chores')
+        if result['clients'] != clients:
+            print(f"    (baseline ran {clients} client(s), this run {result['clients']})")
+        for name, stats in result['endpoints'].items():
+            old = before['endpoints'].get(name)
+            if not old:
+                continue
+            deltas = [
+                f"{key} {(stats[key] - old[key]) / old[key] * 100:+6.1f}%" if old[key] else f'{key}    n/a'
+                for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps')
+            ]
+            deltas.append(f"sql/req {stats['sql_per_request'] - old['sql_per_request']:+.2f}")
+            print(f"    {name:14} {'  '.join(deltas)}")
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SERVER_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--requests', type=int, default=2000, help='measured requests per client')
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--clients', type=int, default=1, help='concurrent clients, one thread each')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='JSON file from an earlier run to diff against')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.compare) if args.compare else None
+    # Flask-Migrate resolves the migrations directory relative to the working directory
+    os.chdir(SERVER_DIR)
+    results = {str(size): run(size, args.requests, args.warmup, args.seed, args.clients) for size in args.sizes}
+
+    if output:
+        from config import Config
+        with open(output, 'w') as fh:
+            json.dump({
+                'commit': git_commit(),
+                'created_at': datetime.utcnow().isoformat(),
+                'config': {
+                    'requests': args.requests,
+                    'warmup': args.warmup,
+                    'seed': args.seed,
+                    'clients': args.clients,
+                    'workload': WORKLOAD,
+                    'bcrypt_log_rounds': Config.BCRYPT_LOG_ROUNDS,
+                },
+                'results': results,
+            }, fh, indent=2)
+        print(f'\nResults written to {output}')
+    if baseline:
+        with open(baseline) as fh:
+            compare(results, json.load(fh))
@@ -0,0 +1,69 @@
+"""Measure the overhead of request metrics and the sampling profiler.
+
+    python benchmarks/bench_metrics.py --chores 100000 --requests 3000 --rounds 5
+
+Loads one synthetic dataset, then times the same sequence of feed requests in
+fresh interpreters with metrics off, metrics on, and metrics on with the
+profiler sampling every 10 ms. Modes alternate each round and the median
+throughput per mode is compared against metrics off.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from common import SERVER_DIR, database_path
+
+MODES = {
+    'off': {'METRICS_ENABLED': '0'},
+    'metrics': {'METRICS_ENABLED': '1'},
+    'metrics+profiler': {'METRICS_ENABLED': '1', 'METRICS_PROFILE_INTERVAL': '0.01'},
+}
+
+THROUGHPUT = """
+import time
+from app import create_app
+app = create_app('production')
+client = app.test_client()
+urls = ['/api/chores', '/api/chores?cursor=', '/api/chores?category=Cleaning', '/api/chores?status=completed']
+for url in urls * 25:
+    client.get(url)
+started = time.perf_counter()
+for i in range({requests}):
+    response = client.get(urls[i % len(urls)])
+    assert response.status_code == 200, response.status_code
+print({requests} / (time.perf_counter() - started))
+"""
+
+def throughput(env, requests):
+    output = subprocess.run(
+        [sys.executable, '-c', THROUGHPUT.format(requests=requests)],
+        cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chores', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    path = database_path()
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}', PASSWORD_HASH_WORKERS='0', RATELIMIT_ENABLED='0')
+    subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'app', 'generate',
+         '--chores', str(args.chores), '--users', str(max(2, args.chores // 10))],
+        cwd=SERVER_DIR, env=env, capture_output=True, check=True
+    )
+
+    results = {mode: [] for mode in MODES}
+    for _ in range(args.rounds):
+        for mode, overrides in MODES.items():
+            results[mode].append(throughput(dict(env, **overrides), args.requests))
+
+    baseline = statistics.median(results['off'])
+    for mode, samples in results.items():
+        median = statistics.median(samples)
+        print(f'{mode:18} {median:8.0f} req/s   overhead {(baseline - median) / baseline * 100:+5.1f}%')
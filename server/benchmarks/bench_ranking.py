@@ -0,0 +1,113 @@
+"""Time the relevance feed: snapshot build, per-viewer scoring and top-k.
+
+    python benchmarks/bench_ranking.py --chores 100000 --active 50000 --viewers 200
+
+Loads one synthetic dataset and reopens --active of its chores, so the feature
+matrix is as large as a busy feed's. Then, for a sample of viewers with
+completed history, times FeedRanker.rank() for the first page against a
+per-chore Python loop computing the same scores followed by a full sort, and
+finally a whole GET /api/chores?sort=relevance request.
+"""
+import argparse
+import math
+import os
+import statistics
+import time
+
+from common import SERVER_DIR, use_database
+
+use_database()
+os.environ.setdefault('METRICS_ENABLED', '0')
+
+def python_rank(ranker, snapshot, user_id, per_page):
+    """The same scores one chore at a time, then a full sort"""
+    affinity, latitude, longitude, city = ranker._profile(user_id)
+    weights = ranker.weights
+    scored = []
+    for i in range(len(snapshot)):
+        if snapshot.posters[i] == user_id:
+            continue
+        score = float(snapshot.static_score[i])
+        score += weights['affinity'] * affinity.get(snapshot.category_names[snapshot.categories[i]], 0.0)
+        lat, lng = snapshot.latitudes[i], snapshot.longitudes[i]
+        if latitude is not None and not math.isnan(lat):
+            dlat = math.radians(lat - latitude)
+            dlng = math.radians(lng - longitude)
+            a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(latitude)) * math.cos(math.radians(lat)) * math.sin(dlng / 2) ** 2
+            score += weights['location'] * math.exp(-2 * 6371.0088 * math.asin(math.sqrt(min(a, 1.0))) / ranker.location_scale_km)
+        elif snapshot.cities[i] == snapshot.city_codes.get(city):
+            score += weights['location']
+        scored.append((-score, int(snapshot.ids[i])))
+    scored.sort()
+    return [chore_id for _, chore_id in scored[:per_page]]
+
+def median_ms(work, viewers):
+    samples = []
+    for user_id in viewers:
+        started = time.perf_counter()
+        work(user_id)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chores', type=int, default=100000)
+    parser.add_argument('--active', type=int, default=50000)
+    parser.add_argument('--viewers', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(SERVER_DIR)
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from generate import generate_dataset
+    from models import db, Chore
+    from ranking import feed_ranker
+
+    app = create_app()
+    with app.app_context():
+        generate_dataset(users=max(2, args.chores // 10), chores=args.chores, log=lambda message: None)
+        # Reopen the newest chores so the active set is --active rows
+        cutoff = db.session.scalar(
+            db.select(Chore.id).order_by(Chore.id.desc()).offset(args.active - 1).limit(1)
+        )
+        db.session.execute(
+            db.update(Chore).where(Chore.id >= cutoff)
+            .values(status='active', accepted_by_id=None, completed_by_id=None, accepted_at=None, completed_at=None)
+        )
+        db.session.commit()
+        viewers = db.session.scalars(
+            db.select(Chore.completed_by_id).where(Chore.completed_by_id.isnot(None))
+            .group_by(Chore.completed_by_id).limit(args.viewers)
+        ).all()
+
+        started = time.perf_counter()
+        snapshot = feed_ranker.snapshot()
+        build_ms = (time.perf_counter() - started) * 1000
+        for user_id in viewers:
+            feed_ranker._profile(user_id)
+
+        # Both variants must agree on the page before their timings mean anything
+        for user_id in viewers[:5]:
+            ids, _ = feed_ranker.rank(user_id, None, None, args.page_size)
+            assert ids == python_rank(feed_ranker, snapshot, user_id, args.page_size), user_id
+
+        vectorized = median_ms(lambda user_id: feed_ranker.rank(user_id, None, None, args.page_size), viewers)
+        looped = median_ms(lambda user_id: python_rank(feed_ranker, snapshot, user_id, args.page_size), viewers[:20])
+        tokens = {user_id: create_access_token(identity=user_id) for user_id in viewers}
+
+    client = app.test_client()
+    url = f'/api/chores?sort=relevance&per_page={args.page_size}&fields=title,payment,category'
+    request_ms = median_ms(
+        lambda user_id: client.get(url, headers={'Authorization': f'Bearer {tokens[user_id]}'}),
+        viewers
+    )
+
+    print(f'{len(snapshot):,} active chores, {len(viewers)} viewers, {args.page_size}-item pages')
+    print(f'  snapshot build          {build_ms:9.1f} ms (once per refresh interval)')
+    print(f'  python loop + sort      {looped:9.2f} ms/page')
+    print(f'  vectorized + top-k      {vectorized:9.2f} ms/page ({looped / vectorized:.0f}x)')
+    print(f'  full request            {request_ms:9.2f} ms/page')
+
+    with app.app_context():
+        db.engine.dispose()
@@ -0,0 +1,114 @@
+"""Compare the old ilike location/text scan with the FTS5 search path.
+
+    python benchmarks/bench_search.py --sizes 100000 1000000
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from common import remove_database, use_database
+
+# A small set of common chore words plus a long tail of rare ones, so queries
+# range from "matches most rows" (where LIMIT lets a scan stop early) to
+# "matches almost nothing" (where a scan must read the whole table)
+COMMON_WORDS = ('dog walk garden lawn mow clean kitchen move couch desk assemble paint fence '
+                'grocery delivery laptop setup party balloons window gutter snow shovel').split()
+RARE_WORDS = [f'term{i}' for i in range(20000)]
+LOCATIONS = ['Downtown, City Center', 'Suburbs, North District', 'West Side, Near Park',
+             'East District, Shopping Area', 'South End, Residential'] + [f'Street {i}' for i in range(2000)]
+QUERIES = ['dog', 'garden fence', 'term1234', 'nosuchword']
+LOCATION_QUERIES = ['north', 'street 1234']
+
+def words(rng, k):
+    return [rng.choice(COMMON_WORDS) if rng.random() < 0.8 else rng.choice(RARE_WORDS) for _ in range(k)]
+
+def populate(app, db, size, seed=1):
+    from flask_migrate import upgrade
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with app.app_context():
+        upgrade()
+        conn = db.engine.raw_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO users (name, email, password_hash, rating) VALUES ('Bench', 'bench@example.com', 'x', 0)"
+        )
+        user_id = cursor.lastrowid
+        batch = []
+        for i in range(size):
+            title = ' '.join(words(rng, 3))
+            description = ' '.join(words(rng, 20))
+            location = rng.choice(LOCATIONS[:5]) if rng.random() < 0.5 else rng.choice(LOCATIONS)
+            batch.append((
+                title, description, location, rng.uniform(10, 200), 'Other', 'low',
+                'active', user_id, now - timedelta(seconds=i), i + 1
+            ))
+            if len(batch) == 50000:
+                cursor.executemany(
+                    'INSERT INTO chores (title, description, location, payment, category, urgency, '
+                    'status, posted_by_id, posted_at, version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    batch
+                )
+                batch = []
+        if batch:
+            cursor.executemany(
+                'INSERT INTO chores (title, description, location, payment, category, urgency, '
+                'status, posted_by_id, posted_at, version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                batch
+            )
+        conn.commit()
+        conn.close()
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+# Config reads DATABASE_URL at import time, so every size reuses one path
+DB_PATH = use_database()
+
+def run(size, repeat):
+    from app import create_app
+    from models import db, Chore
+    from search import search_chores, filter_location
+
+    app = create_app()
+    started = time.perf_counter()
+    populate(app, db, size)
+    print(f'\n{size:,} chores loaded in {time.perf_counter() - started:.1f}s')
+
+    with app.app_context():
+        active = Chore.query.filter(Chore.status == 'active')
+        for text in QUERIES:
+            def ilike():
+                query = active
+                for term in text.split():
+                    query = query.filter(db.or_(Chore.title.ilike(f'%{term}%'), Chore.description.ilike(f'%{term}%')))
+                query.order_by(Chore.posted_at.desc()).limit(20).all()
+            ilike_ms = timed(ilike, repeat)
+            fts_ms = timed(lambda: search_chores(active, text, None, 20, app.config['SEARCH_CANDIDATE_LIMIT']), repeat)
+            print(f'  q={text!r:22} ilike {ilike_ms:9.1f} ms   fts5 {fts_ms:9.1f} ms')
+
+        for location in LOCATION_QUERIES:
+            ilike_ms = timed(lambda: active.filter(Chore.location.ilike(f'%{location}%'))
+                             .order_by(Chore.posted_at.desc()).limit(20).all(), repeat)
+            fts_ms = timed(lambda: filter_location(active, location)
+                           .order_by(Chore.posted_at.desc()).limit(20).all(), repeat)
+            print(f'  location={location!r:15} ilike {ilike_ms:9.1f} ms   fts5 {fts_ms:9.1f} ms')
+
+        db.engine.dispose()
+    remove_database(DB_PATH)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.repeat)
@@ -0,0 +1,73 @@
+"""Compare full and projected chore listings: bytes and time per page.
+
+    python benchmarks/bench_serialization.py --chores 100000 --page-size 100 --iterations 200
+
+Loads one synthetic dataset, then fetches the same pages of the feed four ways:
+full rows through Flask's default JSON provider (the old behaviour), full rows
+through FastJSONProvider, and the card projection (?fields=...) through each
+provider. Timings cover the query, serialization and encoding of one page;
+bytes are the response body size.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from common import SERVER_DIR, use_database
+
+# The fields a chore card in the feed actually renders
+CARD_FIELDS = 'title,payment,location,category,urgency,status,postedAt,postedBy'
+
+use_database()
+os.environ.setdefault('METRICS_ENABLED', '0')
+
+def measure(client, url, iterations):
+    size = len(client.get(url).data)
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = client.get(url)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+    return size, statistics.median(samples) * 1000
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chores', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    os.chdir(SERVER_DIR)
+    from flask.json.provider import DefaultJSONProvider
+    from app import create_app
+    from fastjson import FastJSONProvider, orjson
+    from generate import generate_dataset
+
+    app = create_app()
+    with app.app_context():
+        generate_dataset(users=max(2, args.chores // 10), chores=args.chores, log=lambda message: None)
+    client = app.test_client()
+
+    page = f'/api/chores?cursor=&per_page={args.page_size}'
+    variants = [
+        ('full, default provider', DefaultJSONProvider(app), page),
+        ('full, fast provider', FastJSONProvider(app), page),
+        ('fields, default provider', DefaultJSONProvider(app), f'{page}&fields={CARD_FIELDS}'),
+        ('fields, fast provider', FastJSONProvider(app), f'{page}&fields={CARD_FIELDS}'),
+    ]
+
+    print(f"{args.page_size}-item page, {args.chores:,} chores, encoder: {'orjson' if orjson else 'stdlib json'}")
+    print(f"  {'variant':26} {'bytes':>9} {'ms/page':>9} {'bytes saved':>12} {'time saved':>11}")
+    baseline = None
+    for name, provider, url in variants:
+        app.json = provider
+        size, ms = measure(client, url, args.iterations)
+        if baseline is None:
+            baseline = (size, ms)
+        print(f'  {name:26} {size:9,} {ms:9.2f} {(baseline[0] - size) / baseline[0] * 100:11.1f}% '
+              f'{(baseline[1] - ms) / baseline[1] * 100:10.1f}%')
+
+    with app.app_context():
+        from models import db
+        db.engine.dispose()
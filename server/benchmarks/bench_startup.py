@@ -0,0 +1,90 @@
+"""Measure app cold-start time and single-worker request throughput.
+
+    python benchmarks/bench_startup.py --chores 1000 --seconds 5
+
+Cold start is the wall time of importing the app and calling create_app() the
+way wsgi.py does for a serving worker, in a fresh interpreter against an
+existing database; throughput drives GET /api/chores through the WSGI test
+client, so it measures one worker's Python/SQL cost without network overhead.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from common import SERVER_DIR, use_database
+
+COLD_START = """
+import time
+started = time.perf_counter()
+from app import create_app
+app = create_app('{config}', migrations=False)
+print(time.perf_counter() - started)
+"""
+
+def cold_start(config_name, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', COLD_START.format(config=config_name)],
+            cwd=SERVER_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings), sum(timings) / len(timings)
+
+def populate(app, chores):
+    from models import db
+    with app.app_context():
+        conn = db.engine.raw_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO users (name, email, password_hash, rating) VALUES ('Bench', 'bench@example.com', 'x', 0)"
+        )
+        user_id = cursor.lastrowid
+        cursor.executemany(
+            'INSERT INTO chores (title, description, location, payment, category, urgency, status, '
+            'posted_by_id, posted_at, version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?)',
+            [(f'Chore {i}', 'Benchmark chore', 'Downtown', 20.0, 'Cleaning', 'low', 'active', user_id, i + 1)
+             for i in range(chores)]
+        )
+        conn.commit()
+        conn.close()
+
+def throughput(app, seconds):
+    client = app.test_client()
+    client.get('/api/chores')
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        response = client.get('/api/chores')
+        assert response.status_code == 200, response.status_code
+        count += 1
+    return count / (time.perf_counter() - started)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', default='production')
+    parser.add_argument('--chores', type=int, default=1000)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    use_database(PASSWORD_HASH_WORKERS='0')
+
+    # Build the schema once, the way a deployment would before starting workers
+    setup = subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'app', 'db', 'upgrade'],
+        cwd=SERVER_DIR, capture_output=True, text=True
+    )
+    from app import create_app
+    app = create_app(args.config)
+    if setup.returncode != 0:
+        from models import db
+        with app.app_context():
+            db.create_all()
+    populate(app, args.chores)
+
+    best, mean = cold_start(args.config, args.runs)
+    print(f'cold start: best {best * 1000:.1f} ms, mean {mean * 1000:.1f} ms over {args.runs} runs')
+    print(f'GET /api/chores: {throughput(app, args.seconds):.0f} req/s (one worker, {args.chores} chores)')
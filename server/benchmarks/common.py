@@ -0,0 +1,46 @@
+"""Setup shared by the benchmark scripts.
+
+Importing this puts the server directory on sys.path. Databases live in one
+private temporary directory that is removed, WAL files and all, when the script
+exits, so a crashed or interrupted run leaves nothing behind.
+"""
+import atexit
+import os
+import sys
+import tempfile
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+_workdir = None
+
+def database_path():
+    """A new, empty SQLite file in this run's temporary directory"""
+    global _workdir
+    if _workdir is None:
+        _workdir = tempfile.TemporaryDirectory(prefix='bench-')
+        atexit.register(_workdir.cleanup)
+    fd, path = tempfile.mkstemp(suffix='.db', dir=_workdir.name)
+    os.close(fd)
+    return path
+
+def use_database(**env):
+    """Point this process at a fresh database; returns its path.
+
+    Config reads DATABASE_URL at import time, so call this before importing the
+    app. Rate limiting (every simulated user shares the test client's address)
+    and the maintenance scheduler are off; env sets anything else.
+    """
+    path = database_path()
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ['RATELIMIT_ENABLED'] = '0'
+    os.environ['MAINTENANCE_ENABLED'] = '0'
+    os.environ.update(env)
+    return path
+
+def remove_database(path):
+    """Delete a database and its WAL sidecars, so the next run at the same path starts empty"""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
@@ -0,0 +1,204 @@
+import csv
+import gzip
+import io
+import json
+import zlib
+
+from flask import current_app
+
+from models import db, Chore
+from user_stats import record_chore_change
+from validation import parse_chore
+
+# Bulk export and import of chores, both in constant memory.
+#
+# Export streams rows from a server-side cursor (yield_per) and encodes them a
+# chunk at a time, optionally through a streaming gzip compressor, so the
+# response goes out with chunked transfer encoding while the query is still
+# being read.
+#
+# Import reads the request body incrementally (NDJSON line by line, or CSV row
+# by row, optionally gzip-compressed), validates every row with the same rules
+# as POST /api/chores, and inserts the valid ones in batched transactions. A
+# batch that fails as a whole is retried row by row so one bad row costs only
+# itself. Only the first max_errors problems are reported in full; a row the
+# database rejects is reported generically and its error logged server-side.
+
+FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+# (API field, column) pairs in export order; the import reads the same names
+EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('location', 'location'),
+    ('latitude', 'latitude'),
+    ('longitude', 'longitude'),
+    ('payment', 'payment'),
+    ('category', 'category'),
+    ('urgency', 'urgency'),
+    ('estimatedTime', 'estimated_time'),
+    ('status', 'status'),
+    ('postedById', 'posted_by_id'),
+    ('acceptedById', 'accepted_by_id'),
+    ('completedById', 'completed_by_id'),
+    ('postedAt', 'posted_at'),
+    ('acceptedAt', 'accepted_at'),
+    ('completedAt', 'completed_at'),
+    ('dueDate', 'due_date'),
+    ('version', 'version'),
+)
+
+def parse_format(value, content_type=None):
+    """Resolve format= (or a request Content-Type) to 'ndjson' or 'csv'.
+
+    Raises ValueError for anything else.
+    """
+    if value is None and content_type:
+        mimetype = content_type.split(';', 1)[0].strip()
+        value = next((name for name, known in FORMATS.items() if known == mimetype), None)
+    value = value or 'ndjson'
+    if value not in FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+    return value
+
+# Export
+
+def _export_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+def _encode_ndjson(rows, dumps):
+    return ''.join(
+        dumps({key: _export_value(value) for (key, _), value in zip(EXPORT_COLUMNS, row)}) + '\n'
+        for row in rows
+    )
+
+def _encode_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+def export_chores(query, format, dumps, chunk_size=1000, compress=False):
+    """Yield the encoded rows of `query` (a select of the EXPORT_COLUMNS) chunk by chunk"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def emit(text):
+        data = text.encode('utf-8')
+        return compressor.compress(data) if compressor else data
+
+    if format == 'csv':
+        yield emit(_encode_csv([[key for key, _ in EXPORT_COLUMNS]]))
+    result = db.session.execute(query.execution_options(stream_results=True, yield_per=chunk_size))
+    for rows in result.partitions():
+        data = emit(_encode_csv(rows) if format == 'csv' else _encode_ndjson(rows, dumps))
+        # The compressor buffers small inputs; only send what it has released
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+def export_query(model, status=None, category=None, since=None):
+    """Select of the export columns of live (Chore) or archived chores, in id order"""
+    query = db.select(*(getattr(model, column) for _, column in EXPORT_COLUMNS))
+    if status:
+        query = query.where(model.status == status)
+    if category:
+        query = query.where(model.category == category)
+    if since is not None:
+        query = query.where(model.version > since)
+    return query.order_by(model.id)
+
+# Import
+
+def _read_rows(stream, format, compressed):
+    """Yield (line number, row dict or error message) from an upload stream"""
+    stream = gzip.GzipFile(fileobj=stream, mode='rb') if compressed else io.BufferedReader(stream)
+    text = io.TextIOWrapper(stream, encoding='utf-8', errors='replace', newline='' if format == 'csv' else None)
+    if format == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Empty CSV cells mean "not given", as an absent JSON key would
+            yield reader.line_num, {key: value for key, value in row.items() if key and value != ''}
+        return
+    for number, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, 'Invalid JSON'
+            continue
+        yield number, row if isinstance(row, dict) else 'Each line must be a JSON object'
+
+def _insert_batch(batch, user_id):
+    """Insert validated (line, values) pairs in one transaction; returns the new ids"""
+    # One compiled statement run as executemany, over a block of change markers
+    # reserved up front; the block then identifies the batch's rows
+    last = Chore.next_version(len(batch))
+    first = last - len(batch) + 1
+    db.session.execute(
+        db.insert(Chore).values(posted_by_id=user_id, status='active'),
+        [dict(values, version=version) for version, (_, values) in enumerate(batch, first)]
+    )
+    ids = db.session.scalars(
+        db.select(Chore.id).where(Chore.version.between(first, last)).order_by(Chore.version)
+    ).all()
+    record_chore_change(ids, None, 'active')
+    db.session.commit()
+    return ids
+
+def import_chores(stream, format, user_id, batch_size=500, max_errors=100, compressed=False, on_batch=None):
+    """Create chores posted by user_id from an NDJSON or CSV stream.
+
+    Returns a report with the number of rows read and created and the first
+    max_errors errors as {'line', 'message'}. `on_batch` is called with the ids
+    of every committed batch.
+    """
+    report = {'rows': 0, 'created': 0, 'failed': 0, 'errors': []}
+
+    def fail(line, message):
+        report['failed'] += 1
+        if len(report['errors']) < max_errors:
+            report['errors'].append({'line': line, 'message': message})
+
+    def flush(batch):
+        try:
+            committed = [_insert_batch(batch, user_id)]
+        except Exception:
+            db.session.rollback()
+            # Find the offending rows by retrying one per transaction
+            committed = []
+            for line, values in batch:
+                try:
+                    committed.append(_insert_batch([(line, values)], user_id))
+                except Exception:
+                    db.session.rollback()
+                    current_app.logger.exception('Bulk import failed to insert line %s', line)
+                    fail(line, 'Failed to insert this row')
+        for ids in committed:
+            report['created'] += len(ids)
+            if on_batch is not None:
+                on_batch(ids)
+
+    batch = []
+    try:
+        for line, row in _read_rows(stream, format, compressed):
+            report['rows'] += 1
+            if isinstance(row, str):
+                fail(line, row)
+                continue
+            try:
+                batch.append((line, parse_chore(row)))
+            except ValueError as e:
+                fail(line, str(e))
+                continue
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+    except (OSError, EOFError, zlib.error, csv.Error) as e:
+        # Truncated or corrupt upload: keep what was read before it
+        fail(None, f'Unreadable upload, stopped reading: {e}')
+    if batch:
+        flush(batch)
+    return report
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,14 +9,154 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///chorerun.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_ACCESS_TOKEN_EXPIRES = False  # Tokens don't expire for demo purposes
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:3000').split(',')
+    
+    # Optional read replica for the read-only endpoints. A user's own writes pin
+    # them to the primary for REPLICA_PIN_SECONDS; 'memory' pins are per
+    # worker, so the app refuses to start with them when GUNICORN_WORKERS > 1;
+    # use 'sqlite:///path' (gunicorn.conf.py picks a shared file when unset).
+    # REPLICA_STANDIN_SYNC_SECONDS > 0 copies a SQLite primary over a SQLite
+    # replica that often, standing in for replication in local testing
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+    REPLICA_PIN_BACKEND = os.environ.get('REPLICA_PIN_BACKEND', 'memory')
+    REPLICA_STANDIN_SYNC_SECONDS = float(os.environ.get('REPLICA_STANDIN_SYNC_SECONDS', 0))
+    
+    # Short-lived access tokens, renewed through /api/refresh with a refresh
+    # token. Logout revokes by jti; workers pick up each other's revocations
+    # within the sync interval, each sync re-reading the overlap before the
+    # last one for revocations that committed late (see revocation.py)
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.environ.get('JWT_ACCESS_TOKEN_MINUTES', 15)))
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_DAYS', 30)))
+    TOKEN_DENYLIST_SYNC_SECONDS = float(os.environ.get('TOKEN_DENYLIST_SYNC_SECONDS', 1))
+    TOKEN_DENYLIST_SYNC_OVERLAP_SECONDS = int(os.environ.get('TOKEN_DENYLIST_SYNC_OVERLAP_SECONDS', 60))
+    TOKEN_DENYLIST_PRUNE_SECONDS = 300
+    
+    # Comma-separated user ids allowed on the operator endpoints (bulk export
+    # and import); nobody when unset
+    OPERATOR_USER_IDS = frozenset(
+        int(user_id) for user_id in os.environ.get('OPERATOR_USER_IDS', '').split(',') if user_id.strip()
+    )
+    
+    # Pagination
+    CHORES_PER_PAGE = 20
+    CHORES_MAX_PER_PAGE = int(os.environ.get('CHORES_MAX_PER_PAGE', 100))
+    APPLICATIONS_PER_PAGE = 20
+    APPLICATIONS_MAX_PER_PAGE = 100
+    
+    # Server-Sent Events: 'memory' for a single worker (the app refuses to
+    # start with it when GUNICORN_WORKERS > 1), or 'sqlite:///path' to share
+    # events between workers on one host. gunicorn.conf.py picks a shared file
+    # when this is unset
+    CHORE_EVENTS_BACKEND = os.environ.get('CHORE_EVENTS_BACKEND', 'memory')
+    CHORE_EVENTS_BUFFER_SIZE = 1000
+    CHORE_EVENTS_HEARTBEAT = 15
+    
+    # Password hashing: bcrypt cost, hashing process pool size (0 = hash inline)
+    # and how many hashes may be queued before requests get a 429. Both are per
+    # server worker: a host runs GUNICORN_WORKERS x PASSWORD_HASH_WORKERS
+    # hashing processes and queues up to GUNICORN_WORKERS x
+    # PASSWORD_HASH_MAX_PENDING hashes. The default pool splits half the
+    # host's CPUs between the workers, one process each at least
+    SERVER_WORKERS = int(os.environ.get('GUNICORN_WORKERS', 1))
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get(
+        'PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2 // SERVER_WORKERS)
+    ))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 32))
+    PASSWORD_HASH_TIMEOUT = 10
+    
+    # Token buckets as (burst, tokens per second) per route class, keyed by
+    # JWT user or client IP. 'memory' buckets are per worker; use
+    # 'sqlite:///path' (or another shared backend) to enforce limits across
+    # workers. Each worker sheds load with a 503 once this many requests are
+    # in flight (0 = never)
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', '1') == '1'
+    RATELIMIT_BACKEND = os.environ.get('RATELIMIT_BACKEND', 'memory')
+    RATELIMIT_RULES = {
+        'auth': (10, 0.2),
+        'write': (30, 1.0),
+        'read': (120, 10.0),
+    }
+    RATELIMIT_MAX_ENTRIES = 100000
+    RATELIMIT_MAX_IN_FLIGHT = int(os.environ.get('RATELIMIT_MAX_IN_FLIGHT', 64))
+    
+    # User cache: 'memory' is per worker, so the app refuses to start with it
+    # when GUNICORN_WORKERS > 1; use 'sqlite:///path' (or another shared
+    # backend). gunicorn.conf.py picks a shared file when this is unset
+    USER_CACHE_BACKEND = os.environ.get('USER_CACHE_BACKEND', 'memory')
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAX_ENTRIES = 10000
+    
+    # Full-text search ranks only the newest N matches of a query
+    SEARCH_CANDIDATE_LIMIT = int(os.environ.get('SEARCH_CANDIDATE_LIMIT', 5000))
+    
+    # near=lat,lng radius search
+    GEO_DEFAULT_RADIUS_KM = 10
+    GEO_MAX_RADIUS_KM = 100
+    
+    # sort=relevance feed ranking. The active-chore feature matrix is rebuilt at
+    # most this often; weights scale each signal's 0..1 score
+    RANKING_REFRESH_SECONDS = int(os.environ.get('RANKING_REFRESH_SECONDS', 30))
+    RANKING_WEIGHTS = {'affinity': 3.0, 'location': 2.0, 'payment': 1.0, 'urgency': 1.0, 'due': 1.0, 'rating': 1.0}
+    RANKING_LOCATION_SCALE_KM = 10
+    RANKING_DUE_HORIZON_DAYS = 7
+    
+    # Background job expiring active chores past their due date. Every worker
+    # runs the scheduler; a lease makes sure only one of them runs each pass
+    MAINTENANCE_ENABLED = os.environ.get('MAINTENANCE_ENABLED', '1') == '1'
+    MAINTENANCE_INTERVAL = int(os.environ.get('MAINTENANCE_INTERVAL', 60))
+    MAINTENANCE_BATCH_SIZE = 500
+    MAINTENANCE_LEASE_SECONDS = 120
+    
+    # The maintenance pass also moves chores settled more than this many days
+    # ago to chores_archive, keeping the live table to recent activity (0 = off)
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 90))
+    ARCHIVE_BATCH_SIZE = 500
+    
+    # Chore progress log (see progress.py): entries are buffered per worker and
+    # written in one batch every PROGRESS_FLUSH_SECONDS or PROGRESS_BATCH_SIZE
+    # entries, whichever comes first (0 writes each one through)
+    PROGRESS_FLUSH_SECONDS = float(os.environ.get('PROGRESS_FLUSH_SECONDS', 1))
+    PROGRESS_BATCH_SIZE = 500
+    PROGRESS_PER_PAGE = 100
+    PROGRESS_MAX_PER_PAGE = 500
+    
+    # Bulk export rows per server-side cursor fetch; bulk import rows per
+    # transaction, and how many row errors its report lists in full
+    BULK_EXPORT_CHUNK_SIZE = 1000
+    BULK_IMPORT_BATCH_SIZE = 500
+    BULK_IMPORT_MAX_ERRORS = 100
+    
+    # Request metrics on /api/metrics. Statements slower than the threshold are
+    # kept as samples; a non-zero profile interval (seconds) turns on the
+    # sampling profiler behind /api/metrics/profile (not under gevent, see
+    # metrics.py). Both endpoints answer operators, and callers from these
+    # addresses without a token; empty the list when a proxy on the same host
+    # forwards public traffic, as it would look local
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    METRICS_ALLOWED_ADDRESSES = frozenset(
+        address.strip() for address in os.environ.get('METRICS_ALLOWED_ADDRESSES', '127.0.0.1,::1').split(',')
+        if address.strip()
+    )
+    METRICS_SLOW_QUERY_MS = int(os.environ.get('METRICS_SLOW_QUERY_MS', 100))
+    METRICS_SLOW_QUERY_SAMPLES = 50
+    METRICS_PROFILE_INTERVAL = float(os.environ.get('METRICS_PROFILE_INTERVAL', 0))
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
 class ProductionConfig(Config):
     DEBUG = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        'pool_pre_ping': True,
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    }
 
 config = {
     'development': DevelopmentConfig,
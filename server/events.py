@@ -0,0 +1,150 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from sqlite_store import SQLiteStore, sqlite_path
+
+# Chore event fan-out for the /api/chores/stream Server-Sent Events endpoint.
+#
+# Every worker keeps one ring buffer of recent events guarded by a condition
+# variable. Subscribers hold nothing but the id of the last event they sent, so
+# an idle connection costs a blocked generator rather than a queue, a thread or
+# a DB connection (run under a gevent/eventlet worker to make the wait
+# cooperative). Backends decide how published events reach each worker's buffer.
+
+class InProcessBackend:
+    """Delivers events only to subscribers of this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last_id = 0
+        self._deliver = None
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, event_type, data):
+        with self._lock:
+            self.last_id += 1
+            self._deliver(self.last_id, event_type, data)
+
+class SQLiteBackend(SQLiteStore):
+    """Shares events between workers on one host through a SQLite file.
+
+    Stands in for a real broker: publishers append rows, and one poller thread
+    per worker reads new rows in id order and hands them to the local buffer.
+    """
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS chore_stream_events ('
+        'id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, data TEXT NOT NULL)',
+    )
+
+    def __init__(self, path, poll_interval=0.5, retain=10000):
+        self.poll_interval = poll_interval
+        self.retain = retain
+        super().__init__(path)
+        self.last_id = self._connect().execute('SELECT COALESCE(MAX(id), 0) FROM chore_stream_events').fetchone()[0]
+
+    def start(self, deliver):
+        thread = threading.Thread(target=self._poll, args=(deliver,), daemon=True, name='chore-events-poller')
+        thread.start()
+
+    def publish(self, event_type, data):
+        conn = self._connect()
+        cursor = conn.execute(
+            'INSERT INTO chore_stream_events (type, data) VALUES (?, ?)',
+            (event_type, json.dumps(data))
+        )
+        if cursor.lastrowid % 1000 == 0:
+            conn.execute('DELETE FROM chore_stream_events WHERE id <= ?', (cursor.lastrowid - self.retain,))
+
+    def _poll(self, deliver):
+        while True:
+            try:
+                rows = self._connect().execute(
+                    'SELECT id, type, data FROM chore_stream_events WHERE id > ? ORDER BY id',
+                    (self.last_id,)
+                ).fetchall()
+                for event_id, event_type, data in rows:
+                    deliver(event_id, event_type, json.loads(data))
+                    self.last_id = event_id
+            except sqlite3.Error:
+                pass
+            time.sleep(self.poll_interval)
+
+class ChoreEventBroker:
+    """Ring buffer of recent chore events shared by all local subscribers"""
+
+    def __init__(self, backend=None, buffer_size=1000, heartbeat=15):
+        self.backend = backend or InProcessBackend()
+        self.heartbeat = heartbeat
+        self._events = deque(maxlen=buffer_size)
+        self._head = self.backend.last_id
+        self._condition = threading.Condition()
+        self.backend.start(self._deliver)
+
+    def _deliver(self, event_id, event_type, data):
+        with self._condition:
+            self._events.append((event_id, event_type, data))
+            self._head = event_id
+            self._condition.notify_all()
+
+    def publish(self, event_type, data):
+        """Publish an event; call only after the change it describes has committed"""
+        self.backend.publish(event_type, data)
+
+    def last_event_id(self):
+        with self._condition:
+            return self._head
+
+    def _events_after(self, last_id):
+        """Events newer than last_id, or None if they can no longer be replayed"""
+        if last_id == self._head:
+            return []
+        oldest = self._events[0][0] if self._events else self._head + 1
+        if last_id > self._head or last_id < oldest - 1:
+            # Id from another process lifetime, or older than the buffer
+            return None
+        return [event for event in self._events if event[0] > last_id]
+
+    def stream(self, last_event_id=None):
+        """Generate SSE frames, resuming after last_event_id when given"""
+        last_id = self.last_event_id() if last_event_id is None else last_event_id
+        yield f'retry: 3000\nid: {last_id}\n\n'
+
+        while True:
+            with self._condition:
+                events = self._events_after(last_id)
+                if events == []:
+                    self._condition.wait(self.heartbeat)
+                    events = self._events_after(last_id)
+
+            if events is None:
+                # Client fell too far behind to replay; tell it to refetch the feed
+                last_id = self.last_event_id()
+                yield f'id: {last_id}\nevent: reset\ndata: {{}}\n\n'
+            elif not events:
+                yield ': keepalive\n\n'
+            else:
+                for event_id, event_type, data in events:
+                    yield f'id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n'
+                last_id = events[-1][0]
+
+def create_broker(app):
+    """Build the broker described by the CHORE_EVENTS_* settings"""
+    backend_url = app.config['CHORE_EVENTS_BACKEND']
+    path = sqlite_path(backend_url)
+    if path is None and app.config['SERVER_WORKERS'] > 1:
+        # Streams connected to other workers would never see this worker's events
+        raise RuntimeError(
+            f"CHORE_EVENTS_BACKEND {backend_url!r} is per worker but {app.config['SERVER_WORKERS']} "
+            "workers serve requests; configure a shared backend such as 'sqlite:///path'"
+        )
+    backend = SQLiteBackend(path) if path else InProcessBackend()
+    return ChoreEventBroker(
+        backend,
+        buffer_size=app.config['CHORE_EVENTS_BUFFER_SIZE'],
+        heartbeat=app.config['CHORE_EVENTS_HEARTBEAT']
+    )
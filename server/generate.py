@@ -0,0 +1,344 @@
+from datetime import date
+
+import numpy as np
+from faker import Faker
+from flask_migrate import downgrade, upgrade
+
+from models import db
+from geo import cells_for
+from hashing import password_hasher
+from ratings import rebuild_ratings
+from search import deferred_index
+from user_stats import rebuild_user_stats
+from applications import rebuild_application_counts
+
+# Synthetic dataset for load and benchmark work. Faker only fills small pools of
+# names, places and text up front; every row is then assembled by indexing those
+# pools with NumPy draws, so the per-row cost stays flat and a given seed always
+# yields the same rows. Rows carry explicit ids and go in through executemany in
+# large batches, bypassing the ORM.
+#
+# Skew: posters and workers follow a Zipf law over users and chores a Zipf law
+# over places, categories and urgencies have fixed shares, and chores older than
+# ACTIVE_WINDOW_DAYS are settled (completed or cancelled). Timestamps count back
+# from the anchor date, so the same seed and anchor give an identical database.
+
+CATEGORIES = {
+    # name: (share of chores, median payment, titles)
+    'Cleaning': (0.22, 70, ['House Cleaning Service', 'Deep Clean Kitchen', 'Bathroom Scrub',
+                            'Window Washing', 'Move-out Cleaning', 'Carpet Shampoo']),
+    'Shopping': (0.14, 35, ['Grocery Shopping and Delivery', 'Pharmacy Pickup', 'Weekly Errands',
+                            'Hardware Store Run', 'Return Packages']),
+    'Pet Care': (0.13, 25, ['Dog Walking', 'Cat Sitting', 'Pet Feeding While Away',
+                            'Dog Bath and Brush', 'Take Dog to the Vet']),
+    'Gardening': (0.12, 60, ['Garden Weeding and Maintenance', 'Lawn Mowing', 'Hedge Trimming',
+                             'Leaf Raking', 'Plant Vegetable Beds']),
+    'Moving': (0.11, 100, ['Move Heavy Furniture', 'Help Loading a Truck', 'Carry Boxes Upstairs',
+                           'Haul Away Old Couch', 'Storage Unit Move']),
+    'Assembly': (0.10, 55, ['Furniture Assembly - IKEA Desk', 'Assemble Bed Frame', 'Build Bookshelf',
+                            'Mount TV on Wall', 'Assemble Crib']),
+    'Technology': (0.10, 70, ['Computer Setup and Tech Support', 'Wi-Fi Troubleshooting', 'Printer Setup',
+                              'Phone Data Transfer', 'Smart Home Install']),
+    'Events': (0.08, 90, ['Event Setup - Birthday Party', 'Party Cleanup', 'Serve at Dinner Party',
+                          'Decorate for the Holidays', 'Wedding Setup Help']),
+}
+URGENCIES = {'low': 0.5, 'medium': 0.35, 'high': 0.15}
+ESTIMATED_TIMES = ['30 minutes', '1 hour', '1-2 hours', '2 hours', '2-3 hours', '3-4 hours', 'Half day', 'Full day']
+RECENT_STATUSES = {'active': 0.6, 'accepted': 0.15, 'completed': 0.2, 'cancelled': 0.05}
+SETTLED_STATUSES = {'completed': 0.9, 'cancelled': 0.1}
+REVIEW_STARS = {1: 0.03, 2: 0.04, 3: 0.10, 4: 0.28, 5: 0.55}
+
+HISTORY_DAYS = 365
+ACTIVE_WINDOW_DAYS = 30
+USER_SKEW = 0.9  # Zipf exponents: with 100k users the busiest poster has ~4% of chores
+PLACE_SKEW = 1.1
+BATCH_SIZE = 50000
+PASSWORD = 'password123'  # every generated user, same as seed.py
+
+MINUTE = np.timedelta64(60 * 10**6, 'us')
+DAY = 24 * 60 * MINUTE
+
+USER_COLUMNS = ('id', 'name', 'email', 'password_hash', 'phone', 'location', 'latitude', 'longitude',
+                'bio', 'rating', 'rating_count', 'rating_sum', 'created_at')
+CHORE_COLUMNS = ('id', 'title', 'description', 'location', 'latitude', 'longitude', 'geo_cell', 'payment',
+                 'category', 'urgency', 'estimated_time', 'status', 'posted_by_id', 'accepted_by_id',
+                 'completed_by_id', 'posted_at', 'accepted_at', 'completed_at', 'due_date', 'version')
+APPLICATION_COLUMNS = ('id', 'chore_id', 'user_id', 'message', 'status', 'applied_at')
+REVIEW_COLUMNS = ('id', 'chore_id', 'reviewer_id', 'reviewee_id', 'rating', 'comment', 'created_at')
+
+def _pick(rng, shares, count):
+    """Indexes into shares' keys, drawn with its weights"""
+    weights = np.fromiter(shares.values(), dtype=np.float64)
+    return rng.choice(len(weights), count, p=weights / weights.sum())
+
+def _zipf(rng, size, count, exponent):
+    """Indexes in [0, size), index 0 hottest"""
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return rng.choice(size, count, p=weights / weights.sum())
+
+def _timestamps(values):
+    """datetime64 values as the strings SQLAlchemy stores for DateTime, NaT as None"""
+    return [None if text == 'NaT' else text.replace('T', ' ') for text in np.datetime_as_string(values, unit='us')]
+
+def _nullable(values, mask):
+    return [value if keep else None for value, keep in zip(values.tolist(), mask.tolist())]
+
+def _elapsed(rng, start, end, cap):
+    """Random instants after start, at most cap later and never past end"""
+    return start + (rng.random(len(start)) * np.minimum(end - start, cap).astype(np.int64)).astype('timedelta64[us]')
+
+class Generator:
+    def __init__(self, users, applications_per_chore, seed, anchor):
+        self.users = users
+        self.applications_per_chore = applications_per_chore
+        self.rng = np.random.default_rng(seed)
+        self.anchor = np.datetime64(anchor, 'us')
+
+        fake = Faker('en_US')
+        fake.seed_instance(seed)
+        places = sorted({fake.local_latlng(country_code='US') for _ in range(3000)})
+        self.place_lats = np.array([float(place[0]) for place in places])
+        self.place_lngs = np.array([float(place[1]) for place in places])
+        self.place_names = np.array([place[2] for place in places], dtype=object)
+        self.streets = np.array([fake.street_name() for _ in range(500)], dtype=object)
+        self.first_names = np.array([fake.first_name() for _ in range(500)], dtype=object)
+        self.last_names = np.array([fake.last_name() for _ in range(500)], dtype=object)
+        self.bios = np.array([fake.sentence(nb_words=14) for _ in range(1000)], dtype=object)
+        self.descriptions = np.array([fake.paragraph(nb_sentences=4) for _ in range(5000)], dtype=object)
+        self.messages = np.array([fake.sentence(nb_words=10) for _ in range(1000)], dtype=object)
+
+        self.categories = np.array(list(CATEGORIES), dtype=object)
+        self.medians = np.array([median for _, median, _ in CATEGORIES.values()], dtype=np.float64)
+        self.titles = np.array([title for _, _, titles in CATEGORIES.values() for title in titles], dtype=object)
+        self.title_counts = np.array([len(titles) for _, _, titles in CATEGORIES.values()])
+        self.title_starts = np.cumsum(self.title_counts) - self.title_counts
+
+        # Popularity ranks are shuffled so hot posters and workers are spread over ids
+        self.poster_ranks = self.rng.permutation(users) + 1
+        self.worker_ranks = self.rng.permutation(users) + 1
+        self.next_application_id = 1
+        self.next_review_id = 1
+
+    def _places(self, count, spread):
+        """(location text, latitude, longitude) around Zipf-popular places"""
+        place = _zipf(self.rng, len(self.place_names), count, PLACE_SKEW)
+        street = self.rng.integers(0, len(self.streets), count)
+        locations = (self.streets[street] + ', ' + self.place_names[place]).tolist()
+        latitudes = np.clip(self.place_lats[place] + self.rng.normal(0, spread, count), -90, 90)
+        longitudes = np.clip(self.place_lngs[place] + self.rng.normal(0, spread, count), -180, 180)
+        return locations, latitudes, longitudes
+
+    def user_rows(self, first_id, count, password_hash):
+        rng = self.rng
+        ids = np.arange(first_id, first_id + count)
+        first = self.first_names[rng.integers(0, len(self.first_names), count)]
+        last = self.last_names[rng.integers(0, len(self.last_names), count)]
+        locations, latitudes, longitudes = self._places(count, 0.05)
+        created_at = self.anchor - (HISTORY_DAYS * DAY + (rng.random(count) * HISTORY_DAYS * DAY).astype('timedelta64[us]'))
+        return list(zip(
+            ids.tolist(),
+            (first + ' ' + last).tolist(),
+            [f'{a}.{b}{i}@example.com'.lower() for a, b, i in zip(first, last, ids.tolist())],
+            [password_hash] * count,
+            [f'+1-555-{i % 10000:04d}' for i in ids.tolist()],
+            locations,
+            np.round(latitudes, 6).tolist(),
+            np.round(longitudes, 6).tolist(),
+            self.bios[rng.integers(0, len(self.bios), count)].tolist(),
+            [0.0] * count,
+            [0] * count,
+            [0] * count,
+            _timestamps(created_at)
+        ))
+
+    def chore_batch(self, first_id, posted_at):
+        """Rows for chores, their applications and their reviews"""
+        rng = self.rng
+        count = len(posted_at)
+        ids = np.arange(first_id, first_id + count)
+        age = self.anchor - posted_at
+
+        category = _pick(rng, {name: share for name, (share, _, _) in CATEGORIES.items()}, count)
+        title = self.title_starts[category] + rng.integers(0, self.title_counts[category])
+        payment = np.maximum(5, np.round(self.medians[category] * rng.lognormal(0, 0.4, count) / 5) * 5)
+        urgency = _pick(rng, URGENCIES, count)
+        estimated_time = rng.integers(0, len(ESTIMATED_TIMES), count)
+        locations, latitudes, longitudes = self._places(count, 0.05)
+        latitudes, longitudes = np.round(latitudes, 6), np.round(longitudes, 6)
+        has_due = rng.random(count) < 0.7
+        due_date = np.where(has_due, posted_at + rng.integers(1, 15, count) * DAY, np.datetime64('NaT', 'us'))
+
+        recent = age < ACTIVE_WINDOW_DAYS * DAY
+        recent_status = np.array(list(RECENT_STATUSES))[_pick(rng, RECENT_STATUSES, count)]
+        settled_status = np.array(list(SETTLED_STATUSES))[_pick(rng, SETTLED_STATUSES, count)]
+        status = np.where(recent, recent_status, settled_status)
+
+        poster = self.poster_ranks[_zipf(rng, self.users, count, USER_SKEW)]
+        worker = self.worker_ranks[_zipf(rng, self.users, count, USER_SKEW)]
+        worker = np.where(worker == poster, worker % self.users + 1, worker)
+        accepted = (status == 'accepted') | (status == 'completed')
+        completed = status == 'completed'
+        accepted_at = np.where(accepted, _elapsed(rng, posted_at, self.anchor, 3 * DAY), np.datetime64('NaT', 'us'))
+        completed_at = np.where(completed, _elapsed(rng, np.where(accepted, accepted_at, posted_at), self.anchor, 3 * DAY),
+                                np.datetime64('NaT', 'us'))
+
+        chores = list(zip(
+            ids.tolist(),
+            self.titles[title].tolist(),
+            self.descriptions[rng.integers(0, len(self.descriptions), count)].tolist(),
+            locations,
+            latitudes.tolist(),
+            longitudes.tolist(),
+            cells_for(latitudes, longitudes).tolist(),
+            payment.tolist(),
+            self.categories[category].tolist(),
+            np.array(list(URGENCIES))[urgency].tolist(),
+            np.array(ESTIMATED_TIMES)[estimated_time].tolist(),
+            status.tolist(),
+            poster.tolist(),
+            _nullable(worker, accepted),
+            _nullable(worker, completed),
+            _timestamps(posted_at),
+            _timestamps(accepted_at),
+            _timestamps(completed_at),
+            _timestamps(due_date),
+            ids.tolist()  # version: one bump per chore, in posting order
+        ))
+        applications = self._applications(ids, status, poster, worker, accepted, posted_at, accepted_at)
+        reviews = self._reviews(ids, poster, worker, completed, completed_at)
+        return chores, applications, reviews
+
+    def _applications(self, ids, status, poster, worker, accepted, posted_at, accepted_at):
+        """The accepted worker's application plus Poisson-many others per chore"""
+        rng = self.rng
+        per_chore = rng.poisson(self.applications_per_chore, len(ids))
+        chore = np.repeat(np.arange(len(ids)), per_chore)
+        applicant = rng.integers(1, self.users + 1, len(chore))
+        keep = (applicant != poster[chore]) & ~(accepted[chore] & (applicant == worker[chore]))
+        chore, applicant = chore[keep], applicant[keep]
+
+        hired = np.flatnonzero(accepted)
+        chore = np.concatenate([hired, chore])
+        applicant = np.concatenate([worker[hired], applicant])
+        _, first = np.unique(chore * (self.users + 1) + applicant, return_index=True)
+        first.sort()
+        chore, applicant = chore[first], applicant[first]
+
+        is_hired = np.arange(len(chore)) < len(hired)
+        app_status = np.where(is_hired, 'accepted', np.where(status[chore] == 'active', 'pending', 'rejected'))
+        decided_by = np.where(accepted[chore], accepted_at[chore], self.anchor)
+        applied_at = _elapsed(rng, posted_at[chore], decided_by, 2 * DAY)
+        has_message = rng.random(len(chore)) < 0.5
+        messages = self.messages[rng.integers(0, len(self.messages), len(chore))]
+
+        count = len(chore)
+        app_ids = np.arange(self.next_application_id, self.next_application_id + count)
+        self.next_application_id += count
+        return list(zip(
+            app_ids.tolist(),
+            ids[chore].tolist(),
+            applicant.tolist(),
+            _nullable(messages, has_message),
+            app_status.tolist(),
+            _timestamps(applied_at)
+        ))
+
+    def _reviews(self, ids, poster, worker, completed, completed_at):
+        """Posters review their worker on 60% of completed chores, workers the poster on 40%"""
+        rng = self.rng
+        done = np.flatnonzero(completed)
+        by_poster = done[rng.random(len(done)) < 0.6]
+        by_worker = done[rng.random(len(done)) < 0.4]
+        chore = np.concatenate([by_poster, by_worker])
+        reviewer = np.concatenate([poster[by_poster], worker[by_worker]])
+        reviewee = np.concatenate([worker[by_poster], poster[by_worker]])
+        stars = np.array(list(REVIEW_STARS))[_pick(rng, REVIEW_STARS, len(chore))]
+        has_comment = rng.random(len(chore)) < 0.5
+        comments = self.messages[rng.integers(0, len(self.messages), len(chore))]
+        created_at = _elapsed(rng, completed_at[chore], self.anchor, 2 * DAY)
+
+        count = len(chore)
+        review_ids = np.arange(self.next_review_id, self.next_review_id + count)
+        self.next_review_id += count
+        return list(zip(
+            review_ids.tolist(),
+            ids[chore].tolist(),
+            reviewer.tolist(),
+            reviewee.tolist(),
+            stars.tolist(),
+            _nullable(comments, has_comment),
+            _timestamps(created_at)
+        ))
+
+def generate_dataset(users=10000, chores=100000, applications_per_chore=1.5, seed=1, anchor=None, log=print):
+    """Replace the database contents with a synthetic dataset.
+
+    Resets the schema through migrations like seed.py, then bulk loads users,
+    chores, applications and reviews and rebuilds rating aggregates. Every user
+    logs in with PASSWORD. Returns the number of rows written per table.
+    """
+    if users < 2:
+        raise ValueError('At least two users are needed so chores can change hands')
+    generator = Generator(users, applications_per_chore, seed, anchor or date.today())
+
+    log('Resetting schema...')
+    downgrade(revision='base')
+    upgrade()
+
+    # One bcrypt hash at the configured cost, shared by every generated user
+    password_hash = password_hasher.hash(PASSWORD)
+    marker = '?' if db.engine.dialect.paramstyle == 'qmark' else '%s'
+    counts = {'users': 0, 'chores': 0, 'chore_applications': 0, 'reviews': 0}
+
+    conn = db.engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        sqlite = db.engine.dialect.name == 'sqlite'
+        if sqlite:
+            # Throwaway data: skip fsyncs for the load, restored below
+            cursor.execute('PRAGMA synchronous=OFF')
+            cursor.execute('PRAGMA cache_size=-262144')
+
+        def insert(table, columns, rows):
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})",
+                rows
+            )
+            counts[table] += len(rows)
+
+        log(f'Creating {users} users...')
+        for first in range(1, users + 1, BATCH_SIZE):
+            insert('users', USER_COLUMNS, generator.user_rows(first, min(BATCH_SIZE, users - first + 1), password_hash))
+            conn.commit()
+
+        # Oldest first, so ids, versions and posted_at all ascend together
+        log(f'Creating {chores} chores with applications and reviews...')
+        ages = np.sort(generator.rng.random(chores))[::-1] * HISTORY_DAYS * DAY
+        posted_at = generator.anchor - ages.astype(np.int64).astype('timedelta64[us]')
+        with deferred_index(cursor):
+            for start in range(0, chores, BATCH_SIZE):
+                chore_rows, application_rows, review_rows = generator.chore_batch(start + 1, posted_at[start:start + BATCH_SIZE])
+                insert('chores', CHORE_COLUMNS, chore_rows)
+                insert('chore_applications', APPLICATION_COLUMNS, application_rows)
+                insert('reviews', REVIEW_COLUMNS, review_rows)
+                conn.commit()
+                log(f"  {counts['chores']} / {chores} chores")
+            # Chore n carries change marker n; hand out the next ones after them
+            cursor.execute(f'UPDATE chore_version_counter SET value = {marker} WHERE id = 1', (chores,))
+            conn.commit()
+            log('Building the search index...')
+
+        if sqlite:
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA cache_size=-2000')
+    finally:
+        conn.close()
+
+    log('Rebuilding rating aggregates...')
+    rebuild_ratings()
+    log('Rebuilding user chore stats...')
+    rebuild_user_stats()
+    log('Rebuilding application counts...')
+    rebuild_application_counts()
+    db.session.commit()
+    return counts
@@ -0,0 +1,126 @@
+import math
+
+import numpy as np
+from models import Chore
+from pagination import encode_cursor, decode_cursor
+
+# "Chores near me" without a spatial extension. Each chore stores the id of the
+# fixed lat/lng grid cell it falls in; cells are numbered row-major so every
+# latitude row of a bounding box is one contiguous cell range. A radius query
+# turns into an IN list of the covering cells, which SQLite answers with
+# equality probes on the (status, geo_cell) index, and exact haversine distances
+# are then computed for the surviving candidates in one vectorized NumPy pass.
+
+CELL_DEGREES = 0.1
+LNG_CELLS = int(round(360 / CELL_DEGREES))
+EARTH_RADIUS_KM = 6371.0088
+
+def cell_for(latitude, longitude):
+    """Grid cell id containing a point"""
+    row = int(math.floor((latitude + 90) / CELL_DEGREES))
+    col = int(math.floor((longitude + 180) / CELL_DEGREES)) % LNG_CELLS
+    return row * LNG_CELLS + col
+
+def cells_for(latitudes, longitudes):
+    """Vectorized cell_for over arrays of points"""
+    rows = np.floor((np.asarray(latitudes) + 90) / CELL_DEGREES).astype(np.int64)
+    cols = np.floor((np.asarray(longitudes) + 180) / CELL_DEGREES).astype(np.int64) % LNG_CELLS
+    return rows * LNG_CELLS + cols
+
+def parse_point(value):
+    """Parse 'lat,lng' into floats, raising ValueError if malformed or out of range"""
+    latitude, longitude = (float(part) for part in value.split(','))
+    validate_point(latitude, longitude)
+    return latitude, longitude
+
+def validate_point(latitude, longitude):
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('Coordinates out of range')
+
+def _cell_ranges(latitude, longitude, radius_km):
+    """Contiguous (first, last) cell id ranges covering the radius' bounding box"""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = max(-90.0, latitude - lat_delta), min(90.0, latitude + lat_delta)
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 89.9:
+        lng_delta = 180.0
+    else:
+        lng_delta = min(180.0, lat_delta / math.cos(math.radians(widest)))
+
+    first_row = int(math.floor((min_lat + 90) / CELL_DEGREES))
+    last_row = int(math.floor((max_lat + 90) / CELL_DEGREES))
+    if lng_delta >= 180.0:
+        col_spans = [(0, LNG_CELLS - 1)]
+    else:
+        first_col = int(math.floor((longitude - lng_delta + 180) / CELL_DEGREES))
+        last_col = int(math.floor((longitude + lng_delta + 180) / CELL_DEGREES))
+        if first_col < 0:
+            col_spans = [(0, last_col), (first_col % LNG_CELLS, LNG_CELLS - 1)]
+        elif last_col >= LNG_CELLS:
+            col_spans = [(first_col, LNG_CELLS - 1), (0, last_col % LNG_CELLS)]
+        else:
+            col_spans = [(first_col, last_col)]
+
+    return [
+        (row * LNG_CELLS + first, row * LNG_CELLS + last)
+        for row in range(first_row, last_row + 1)
+        for first, last in col_spans
+    ]
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distances from one point to arrays of points"""
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlng = np.radians(longitudes) - math.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def nearby_chores(query, latitude, longitude, radius_km, cursor, per_page):
+    """Chores within radius_km, nearest first, paginated by a (distance, id) cursor.
+
+    Returns (chores, distances_by_id, next_cursor); raises ValueError for a
+    malformed cursor.
+    """
+    cells = [cell for first, last in _cell_ranges(latitude, longitude, radius_km) for cell in range(first, last + 1)]
+    candidates = query.with_entities(Chore.id, Chore.latitude, Chore.longitude).filter(
+        Chore.geo_cell.in_(cells)
+    ).all()
+    if not candidates:
+        return [], {}, None
+
+    ids = np.fromiter((row[0] for row in candidates), dtype=np.int64, count=len(candidates))
+    lats = np.fromiter((row[1] for row in candidates), dtype=np.float64, count=len(candidates))
+    lngs = np.fromiter((row[2] for row in candidates), dtype=np.float64, count=len(candidates))
+    distances = haversine_km(latitude, longitude, lats, lngs)
+
+    keep = distances <= radius_km
+    if cursor:
+        last_distance, last_id = decode_cursor(cursor)
+        last_distance, last_id = float(last_distance), int(last_id)
+        keep &= (distances > last_distance) | ((distances == last_distance) & (ids > last_id))
+    ids, distances = ids[keep], distances[keep]
+
+    # Partial selection of the next page, then an exact sort of just that page
+    # (ties on the boundary distance are all kept so the id tiebreak stays exact)
+    limit = min(per_page + 1, len(ids))
+    if limit == 0:
+        return [], {}, None
+    if limit < len(ids):
+        threshold = distances[np.argpartition(distances, limit - 1)[limit - 1]]
+        nearest = np.flatnonzero(distances <= threshold)
+    else:
+        nearest = np.arange(len(ids))
+    nearest = nearest[np.lexsort((ids[nearest], distances[nearest]))]
+
+    page = nearest[:per_page]
+    page_ids = [int(chore_id) for chore_id in ids[page]]
+    distances_by_id = {int(ids[i]): float(distances[i]) for i in page}
+    chores = {chore.id: chore for chore in Chore.query.filter(Chore.id.in_(page_ids)).all()}
+
+    next_cursor = None
+    if len(nearest) > per_page:
+        last = page[-1]
+        next_cursor = encode_cursor(float(distances[last]), int(ids[last]))
+
+    return [chores[chore_id] for chore_id in page_ids if chore_id in chores], distances_by_id, next_cursor
@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+import tempfile
+
+from dotenv import load_dotenv
+
+# Multi-worker production serving profile, see wsgi.py.
+#
+# gevent workers let one process hold thousands of idle /api/chores/stream
+# connections; each request still gets a pooled DB connection only while it
+# runs. Set GUNICORN_WORKER_CLASS=gthread to run without gevent.
+
+# Read .env as config.py will, so settings made there count as configured below
+load_dotenv()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# Workers inherit this, so per-worker pools can size themselves per host (see config.py)
+os.environ['GUNICORN_WORKERS'] = str(workers)
+# Per-worker backends keep each worker's changes to itself: user caches serve
+# users another worker changed, events only reach that worker's streams, and
+# a write pins its author to the primary only in the worker that served it.
+# Unless configured, the workers share SQLite files of this server's own
+SHARED_BACKENDS = {
+    'USER_CACHE_BACKEND': 'user-cache',
+    'CHORE_EVENTS_BACKEND': 'chore-events',
+    'REPLICA_PIN_BACKEND': 'replica-pins',
+}
+shared_paths = []
+if workers > 1:
+    for setting, name in SHARED_BACKENDS.items():
+        if setting not in os.environ:
+            path = os.path.join(tempfile.gettempdir(), f'chorerun-{name}-{os.getpid()}.db')
+            os.environ[setting] = f'sqlite:///{path}'
+            shared_paths.append(path)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 2000))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = 1000
+
+# Not preloaded: gevent must patch threading before the app builds its locks
+# and condition variables, and each worker gets its own engine and pools
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+
+def on_exit(server):
+    for path in shared_paths:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
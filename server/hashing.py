@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+# bcrypt is deliberately slow, so hashing runs in a small process pool instead
+# of on the request thread. A semaphore caps how many hashes may be queued or
+# running; once it is exhausted callers get PasswordHasherBusy immediately and
+# the route answers 429 rather than letting a login burst starve every worker.
+# Pool and semaphore are per server worker; config.py sizes the pool per host.
+# Latencies feed a histogram exported on /api/metrics.
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool is saturated"""
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+def _check(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+class PasswordHasher:
+    # Upper bounds (seconds) of the latency histogram buckets
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.workers = 0
+        self.timeout = 10
+        self._executor = None
+        self._executor_pid = None
+        self._slots = None
+        self._lock = threading.Lock()
+        self._reset_stats()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config['BCRYPT_LOG_ROUNDS']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self._slots = threading.BoundedSemaphore(app.config['PASSWORD_HASH_MAX_PENDING'])
+        app.extensions['password_hasher'] = self
+
+    def _reset_stats(self):
+        self._count = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+        self._buckets = [0] * len(self.BUCKETS)
+
+    def _get_executor(self):
+        # Created lazily and per process so forked server workers never share a pool
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return self._timed(func, *args)
+
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusy('Password hashing is saturated, retry shortly')
+        try:
+            with self._lock:
+                executor = self._get_executor()
+            return self._timed(lambda *a: executor.submit(func, *a).result(timeout=self.timeout), *args)
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def _timed(self, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._count += 1
+                self._total_seconds += elapsed
+                self._max_seconds = max(self._max_seconds, elapsed)
+                for i, bound in enumerate(self.BUCKETS):
+                    if elapsed <= bound:
+                        self._buckets[i] += 1
+                        break
+
+    def hash(self, password):
+        """Return a bcrypt hash of password at the configured cost"""
+        return self._run(_hash, password.encode('utf-8'), self.rounds).decode('utf-8')
+
+    def check(self, password, hashed):
+        """Check password against a stored bcrypt hash"""
+        return self._run(_check, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed):
+        """True when a stored hash was made with a different cost factor"""
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'count': self._count,
+                'rejected': self._rejected,
+                'total_seconds': round(self._total_seconds, 6),
+                'max_seconds': round(self._max_seconds, 6),
+                'buckets': dict(zip(self.BUCKETS, self._buckets))
+            }
+
+password_hasher = PasswordHasher()
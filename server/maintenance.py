@@ -0,0 +1,193 @@
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Chore, MaintenanceLease
+from archive import archive_settled
+from user_stats import record_chore_change
+from progress import progress_log
+from applications import reject_pending
+from background import ProcessThread
+
+# Background maintenance: moves active chores whose due date has passed to
+# 'expired', so they drop out of the feed and the status='active' working set.
+#
+# Every serving worker runs a scheduler thread, started on its first request,
+# that wakes every MAINTENANCE_INTERVAL seconds (with jitter) and tries to take
+# a lease row. Only the holder runs the job, so any number of workers or hosts
+# sharing the database can run the scheduler. A holder that dies simply lets
+# its lease lapse.
+#
+# The job walks ix_chores_status_due_date in batches. Each batch is one short
+# transaction that re-checks status, so a chore accepted in the meantime is
+# left alone. Every expired row gets its own change marker for delta sync.
+#
+# The same pass then moves long-settled chores to the archive (see archive.py)
+# when ARCHIVE_AFTER_DAYS is set.
+
+LEASE_NAME = 'expire_overdue'
+
+def acquire_lease(name, holder, seconds):
+    """Take or renew the named lease; True if holder owns it until now + seconds"""
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=seconds)
+    result = db.session.execute(
+        db.update(MaintenanceLease)
+        .where(
+            MaintenanceLease.name == name,
+            db.or_(MaintenanceLease.expires_at < now, MaintenanceLease.holder == holder)
+        )
+        .values(holder=holder, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        db.session.commit()
+        return True
+    try:
+        db.session.add(MaintenanceLease(name=name, holder=holder, expires_at=expires_at))
+        db.session.commit()
+        return True
+    except IntegrityError:
+        # Someone else holds an unexpired lease
+        db.session.rollback()
+        return False
+
+def release_lease(name, holder):
+    db.session.execute(
+        db.update(MaintenanceLease)
+        .where(MaintenanceLease.name == name, MaintenanceLease.holder == holder)
+        .values(expires_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+def expire_overdue(batch_size=500, now=None, renew=None):
+    """Expire active chores due before now, one committed batch at a time.
+
+    Returns the ids expired. `renew` is called before each batch and stops the
+    run when it returns False (the lease was lost).
+    """
+    now = now or datetime.utcnow()
+    chores = Chore.__table__
+    expired = []
+    while renew is None or renew():
+        # Range scan on (status, due_date); expired rows drop out of it, so
+        # every pass starts from the oldest remaining
+        ids = db.session.scalars(
+            db.select(Chore.id)
+            .where(Chore.status == 'active', Chore.due_date < now)
+            .order_by(Chore.due_date)
+            .limit(batch_size)
+        ).all()
+        # End the read so the write below starts from a fresh snapshot
+        db.session.rollback()
+        if not ids:
+            break
+
+        # One statement per row so each gets a distinct change marker, and a
+        # chore accepted since the scan no longer matches status='active'
+        # (its reserved marker is then skipped)
+        batch = []
+        first = Chore.next_version(len(ids)) - len(ids) + 1
+        for version, chore_id in enumerate(ids, first):
+            result = db.session.execute(
+                db.update(chores)
+                .where(chores.c.id == chore_id, chores.c.status == 'active')
+                .values(status='expired', version=version, pending_applications=0)
+            )
+            if result.rowcount == 1:
+                batch.append(chore_id)
+        record_chore_change(batch, 'active', 'expired')
+        reject_pending(batch)
+        db.session.commit()
+        expired.extend(batch)
+        if len(ids) < batch_size:
+            break
+    return expired
+
+class ChoreMaintenance:
+    def __init__(self, app=None):
+        self.enabled = False
+        self.interval = 60
+        self.batch_size = 500
+        self.lease_seconds = 120
+        self.archive_after_days = 0
+        self.archive_batch_size = 500
+        self.holder = None
+        self.last_run = None
+        self._app = None
+        self._scheduler = ProcessThread(self._schedule, 'chore-maintenance')
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config['MAINTENANCE_ENABLED']
+        self.interval = app.config['MAINTENANCE_INTERVAL']
+        self.batch_size = app.config['MAINTENANCE_BATCH_SIZE']
+        self.lease_seconds = app.config['MAINTENANCE_LEASE_SECONDS']
+        self.archive_after_days = app.config['ARCHIVE_AFTER_DAYS']
+        self.archive_batch_size = app.config['ARCHIVE_BATCH_SIZE']
+        self._app = app
+        app.extensions['chore_maintenance'] = self
+        if self.enabled:
+            app.before_request(self._scheduler.ensure)
+
+    def _schedule(self):
+        # One scheduler per serving process (see background.py); CLI commands never start it
+        self.holder = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        while True:
+            # Jitter keeps workers started together from polling the lease in step
+            time.sleep(self.interval * random.uniform(0.8, 1.2))
+            with self._app.app_context():
+                try:
+                    self.run()
+                except Exception:
+                    db.session.rollback()
+                    self._app.logger.exception('Chore maintenance run failed')
+
+    def run(self, holder=None, expire=True, archive=True):
+        """Run one pass if the lease can be taken; returns its report, or None"""
+        holder = holder or self.holder or f'{socket.gethostname()}:{os.getpid()}'
+        if not acquire_lease(LEASE_NAME, holder, self.lease_seconds):
+            return None
+
+        started = time.perf_counter()
+        renew = lambda: acquire_lease(LEASE_NAME, holder, self.lease_seconds)
+        expired, archived = [], 0
+        try:
+            if expire:
+                expired = expire_overdue(self.batch_size, renew=renew)
+            if archive and self.archive_after_days:
+                archived = archive_settled(self.archive_after_days, self.archive_batch_size, renew=renew)
+        finally:
+            release_lease(LEASE_NAME, holder)
+
+        progress_log.record_many(expired, 'expired')
+        # One event per batch rather than per chore, since clients refetch on each
+        chore_events = self._app.extensions['chore_events']
+        for i in range(0, len(expired), self.batch_size):
+            chore_events.publish('chores.expired', {'ids': expired[i:i + self.batch_size], 'status': 'expired'})
+
+        report = {
+            'expired': len(expired),
+            'archived': archived,
+            'seconds': round(time.perf_counter() - started, 3),
+            'finished_at': datetime.utcnow().isoformat()
+        }
+        self.last_run = report
+        if expired or archived:
+            self._app.logger.info(
+                'Expired %d overdue and archived %d settled chores in %.3fs',
+                len(expired), archived, report['seconds']
+            )
+        return report
+
+    def stats(self):
+        return {'enabled': self.enabled, 'last_run': self.last_run}
+
+chore_maintenance = ChoreMaintenance()
@@ -0,0 +1,256 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from flask import g, has_app_context, request
+from sqlalchemy import event
+
+from background import ProcessThread
+from hashing import password_hasher
+from models import db
+
+# Per-route request metrics in Prometheus text format: a latency histogram,
+# response status counts, and SQL statement counts and time attributed to the
+# request that issued them through SQLAlchemy cursor events. Statements slower
+# than a threshold are kept as samples with their text.
+#
+# Counters are per worker process; Prometheus sums them across scrape targets.
+# The password hashing latency histogram (hashing.py) is exported alongside.
+#
+# With METRICS_PROFILE_INTERVAL set, a background thread also samples the
+# Python stacks of in-flight requests and folds them into collapsed-stack
+# counts for flame graphs. It reads sys._current_frames(), which sees OS
+# threads only: under gevent every request is a greenlet on one thread, so the
+# samples would be meaningless and the profiler refuses to start there.
+
+class RouteStats:
+    __slots__ = ('buckets', 'count', 'seconds', 'statuses', 'sql_statements', 'sql_seconds')
+
+    def __init__(self, bucket_count):
+        self.buckets = [0] * bucket_count
+        self.count = 0
+        self.seconds = 0.0
+        self.statuses = Counter()
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+def _gevent_patched():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class RequestMetrics:
+    # Upper bounds (seconds) of the request latency histogram buckets
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    MAX_STACKS = 10000
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.slow_query_seconds = 0.1
+        self.profile_interval = 0
+        self.slow_queries = deque(maxlen=50)
+        self._routes = {}
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._stacks = Counter()
+        self._profiler = ProcessThread(self._sample, 'request-metrics-profiler')
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config['METRICS_ENABLED']
+        self.slow_query_seconds = app.config['METRICS_SLOW_QUERY_MS'] / 1000
+        self.slow_queries = deque(maxlen=app.config['METRICS_SLOW_QUERY_SAMPLES'])
+        self.profile_interval = app.config['METRICS_PROFILE_INTERVAL']
+        if self.profile_interval and _gevent_patched():
+            app.logger.warning('METRICS_PROFILE_INTERVAL ignored: the profiler cannot sample greenlets')
+            self.profile_interval = 0
+        app.extensions['request_metrics'] = self
+        if not self.enabled:
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        # Every bind, so statements routed to the read replica are counted too
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+                event.listen(engine, 'handle_error', self._handle_error)
+
+    # Request hooks
+
+    def _route(self):
+        rule = request.url_rule
+        return request.method, rule.rule if rule is not None else 'unmatched'
+
+    def _before_request(self):
+        g.request_metrics = [time.perf_counter(), 0, 0.0]
+        if self.profile_interval:
+            self._profiler.ensure()
+            with self._lock:
+                self._in_flight[threading.get_ident()] = self._route()[1]
+
+    def _after_request(self, response):
+        state = g.pop('request_metrics', None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state[0]
+        key = self._route()
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = RouteStats(len(self.BUCKETS))
+            stats.count += 1
+            stats.seconds += elapsed
+            for i, bound in enumerate(self.BUCKETS):
+                if elapsed <= bound:
+                    stats.buckets[i] += 1
+                    break
+            stats.statuses[response.status_code] += 1
+            stats.sql_statements += state[1]
+            stats.sql_seconds += state[2]
+            if self.profile_interval:
+                self._in_flight.pop(threading.get_ident(), None)
+        return response
+
+    # SQLAlchemy engine hooks
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('request_metrics_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['request_metrics_started'].pop()
+        state = g.get('request_metrics') if has_app_context() else None
+        if state is not None:
+            state[1] += 1
+            state[2] += elapsed
+        if elapsed >= self.slow_query_seconds:
+            route = ' '.join(self._route()) if state is not None else 'background'
+            self.slow_queries.append((route, elapsed, ' '.join(statement.split())[:500]))
+
+    def _handle_error(self, context):
+        # A failed statement never reaches after_cursor_execute
+        started = context.connection.info.get('request_metrics_started') if context.connection is not None else None
+        if started:
+            started.pop()
+
+    # Sampling profiler
+
+    def _sample(self):
+        # Stacks are counted as tuples of code objects and only formatted when read
+        while True:
+            time.sleep(self.profile_interval)
+            frames = sys._current_frames()
+            with self._lock:
+                in_flight = list(self._in_flight.items())
+            for thread_id, route in in_flight:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                key = (route, tuple(stack))
+                with self._lock:
+                    if key in self._stacks or len(self._stacks) < self.MAX_STACKS:
+                        self._stacks[key] += 1
+
+    def profile(self):
+        """Collapsed stacks ("route;frame;frame count" per line), or None when profiling is off"""
+        if not self.profile_interval:
+            return None
+        with self._lock:
+            stacks = self._stacks.most_common()
+        lines = []
+        for (route, codes), count in stacks:
+            frames = ';'.join(f'{os.path.basename(code.co_filename)}:{code.co_name}' for code in reversed(codes))
+            lines.append(f'{route};{frames} {count}\n')
+        return ''.join(lines)
+
+    # Exposition
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            routes = sorted(self._routes.items())
+            routes = [(key, stats.count, stats.seconds, list(stats.buckets), dict(stats.statuses),
+                       stats.sql_statements, stats.sql_seconds) for key, stats in routes]
+        slow_queries = list(self.slow_queries)
+
+        lines = [
+            '# HELP chorerun_http_request_duration_seconds Request latency by route.',
+            '# TYPE chorerun_http_request_duration_seconds histogram',
+        ]
+        for (method, route), count, seconds, buckets, _, _, _ in routes:
+            labels = f'method="{method}",route="{_label(route)}"'
+            cumulative = 0
+            for bound, bucket in zip(self.BUCKETS, buckets):
+                cumulative += bucket
+                lines.append(f'chorerun_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'chorerun_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'chorerun_http_request_duration_seconds_sum{{{labels}}} {seconds:.6f}')
+            lines.append(f'chorerun_http_request_duration_seconds_count{{{labels}}} {count}')
+
+        lines += [
+            '# HELP chorerun_http_responses_total Responses by route and status code.',
+            '# TYPE chorerun_http_responses_total counter',
+        ]
+        for (method, route), _, _, _, statuses, _, _ in routes:
+            for status, count in sorted(statuses.items()):
+                lines.append(
+                    f'chorerun_http_responses_total{{method="{method}",route="{_label(route)}",status="{status}"}} {count}'
+                )
+
+        lines += [
+            '# HELP chorerun_sql_statements_total SQL statements executed by requests, by route.',
+            '# TYPE chorerun_sql_statements_total counter',
+        ]
+        for (method, route), _, _, _, _, statements, _ in routes:
+            lines.append(f'chorerun_sql_statements_total{{method="{method}",route="{_label(route)}"}} {statements}')
+
+        lines += [
+            '# HELP chorerun_sql_seconds_total Time spent executing SQL for requests, by route.',
+            '# TYPE chorerun_sql_seconds_total counter',
+        ]
+        for (method, route), _, _, _, _, _, sql_seconds in routes:
+            lines.append(f'chorerun_sql_seconds_total{{method="{method}",route="{_label(route)}"}} {sql_seconds:.6f}')
+
+        lines += [
+            f'# HELP chorerun_slow_query_seconds Most recent statements slower than {self.slow_query_seconds}s.',
+            '# TYPE chorerun_slow_query_seconds gauge',
+        ]
+        for i, (route, elapsed, statement) in enumerate(reversed(slow_queries)):
+            lines.append(
+                f'chorerun_slow_query_seconds{{sample="{i}",route="{_label(route)}",statement="{_label(statement)}"}} {elapsed:.6f}'
+            )
+
+        hashing = password_hasher.stats()
+        lines += [
+            '# HELP chorerun_password_hash_duration_seconds Password hash and check latency, queueing included.',
+            '# TYPE chorerun_password_hash_duration_seconds histogram',
+        ]
+        cumulative = 0
+        for bound, bucket in hashing['buckets'].items():
+            cumulative += bucket
+            lines.append(f'chorerun_password_hash_duration_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines += [
+            f'chorerun_password_hash_duration_seconds_bucket{{le="+Inf"}} {hashing["count"]}',
+            f'chorerun_password_hash_duration_seconds_sum {hashing["total_seconds"]:.6f}',
+            f'chorerun_password_hash_duration_seconds_count {hashing["count"]}',
+            '# HELP chorerun_password_hash_rejected_total Hashes refused with a 429 because the pool was saturated.',
+            '# TYPE chorerun_password_hash_rejected_total counter',
+            f'chorerun_password_hash_rejected_total {hashing["rejected"]}',
+        ]
+
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
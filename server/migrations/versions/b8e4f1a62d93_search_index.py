@@ -0,0 +1,53 @@
+"""search index
+
+Revision ID: b8e4f1a62d93
+Revises: 7c52d0e9a4b1
+Create Date: 2026-10-17 16:18:14.671844
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4f1a62d93'
+down_revision = '7c52d0e9a4b1'
+branch_labels = None
+depends_on = None
+
+FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS chores_fts USING fts5(
+        title, description, location,
+        content='chores', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS chores_fts_insert AFTER INSERT ON chores BEGIN
+        INSERT INTO chores_fts (rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS chores_fts_delete AFTER DELETE ON chores BEGIN
+        INSERT INTO chores_fts (chores_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS chores_fts_update AFTER UPDATE OF title, description, location ON chores BEGIN
+        INSERT INTO chores_fts (chores_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO chores_fts (rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+]
+
+
+def upgrade():
+    # Full-text index over chores (see search.py), SQLite only. Adopted
+    # databases may already have it; rebuilding covers one that fell behind
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in FTS_SCHEMA:
+            op.execute(statement)
+        op.execute("INSERT INTO chores_fts (chores_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for name in ('chores_fts_update', 'chores_fts_delete', 'chores_fts_insert'):
+            op.execute(f'DROP TRIGGER IF EXISTS {name}')
+        op.execute('DROP TABLE IF EXISTS chores_fts')
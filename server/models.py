@@ -1,8 +1,27 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm import declared_attr
 from datetime import datetime
-import bcrypt
 
-db = SQLAlchemy()
+from hashing import password_hasher
+from replicas import RoutingSession
+
+# Reads of replica-routed requests go to the replica bind, see replicas.py
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def enable_sqlite_pragmas(engine, busy_timeout_ms):
+    """Use WAL and a busy timeout on every SQLite connection so readers never
+    block the writer and concurrent writers wait instead of failing"""
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout_ms)}')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -13,8 +32,12 @@ class User(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     phone = db.Column(db.String(20), nullable=True)
     location = db.Column(db.String(200), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
     bio = db.Column(db.Text, nullable=True)
-    rating = db.Column(db.Float, default=0.0)
+    rating = db.Column(db.Float, default=0.0)  # rating_sum / rating_count, see ratings.py
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -24,11 +47,15 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Check if provided password matches hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.check(password, self.password_hash)
+    
+    def password_needs_rehash(self):
+        """True when the stored hash predates the configured bcrypt cost"""
+        return password_hasher.needs_rehash(self.password_hash)
     
     def to_dict(self):
         return {
@@ -37,23 +64,29 @@ class User(db.Model):
             'email': self.email,
             'phone': self.phone,
             'location': self.location,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
             'bio': self.bio,
             'rating': self.rating,
+            'rating_count': self.rating_count,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
-class Chore(db.Model):
-    __tablename__ = 'chores'
+class ChoreColumns:
+    """Columns and serialization shared by live chores and their archived copies"""
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     location = db.Column(db.String(200), nullable=False)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    geo_cell = db.Column(db.Integer, nullable=True)  # grid bucket, see geo.cell_for
     payment = db.Column(db.Float, nullable=False)
     category = db.Column(db.String(100), nullable=False)
     urgency = db.Column(db.String(50), nullable=False)  # low, medium, high
     estimated_time = db.Column(db.String(50), nullable=True)
-    status = db.Column(db.String(50), default='active')  # active, accepted, completed, cancelled
+    status = db.Column(db.String(50), default='active')  # active, accepted, completed, cancelled, expired
     
     # User relationships
     posted_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -66,12 +99,21 @@ class Chore(db.Model):
     completed_at = db.Column(db.DateTime, nullable=True)
     due_date = db.Column(db.DateTime, nullable=True)
     
-    def to_dict(self, include_user_details=True):
+    # Monotonic change marker, bumped on every create/accept/complete for delta sync
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Pending applications, kept by applications.py for the poster's inbox
+    pending_applications = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    def to_dict(self, include_user_details=True, users=None):
+        """Serialize chore; pass a preloaded id->User map as `users` to avoid lazy loads"""
         result = {
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'location': self.location,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
             'payment': self.payment,
             'category': self.category,
             'urgency': self.urgency,
@@ -80,19 +122,126 @@ class Chore(db.Model):
             'postedAt': self.posted_at.isoformat() if self.posted_at else None,
             'acceptedAt': self.accepted_at.isoformat() if self.accepted_at else None,
             'completedAt': self.completed_at.isoformat() if self.completed_at else None,
-            'dueDate': self.due_date.isoformat() if self.due_date else None
+            'dueDate': self.due_date.isoformat() if self.due_date else None,
+            'version': self.version
         }
         
         if include_user_details:
+            if users is not None:
+                poster = users.get(self.posted_by_id)
+                accepter = users.get(self.accepted_by_id)
+                completer = users.get(self.completed_by_id)
+            else:
+                poster, accepter, completer = self.poster, self.accepter, self.completer
+            
             result.update({
-                'postedBy': self.poster.name if self.poster else None,
-                'acceptedBy': self.accepter.name if self.accepter else None,
-                'completedBy': self.completer.name if self.completer else None,
-                'posterDetails': self.poster.to_dict() if self.poster else None
+                'postedBy': poster.name if poster else None,
+                'acceptedBy': accepter.name if accepter else None,
+                'completedBy': completer.name if completer else None,
+                'posterDetails': poster.to_dict() if poster else None
             })
         
         return result
 
+class Chore(ChoreColumns, db.Model):
+    __tablename__ = 'chores'
+    
+    @declared_attr.directive
+    def __table_args__(cls):
+        return (
+            # Backs the since= delta scan; markers are handed out once each
+            db.Index('ix_chores_version', 'version', unique=True),
+            # Backs the status-filtered feed and its (posted_at, id) keyset cursor
+            db.Index('ix_chores_status_posted_at_id', 'status', cls.posted_at.desc(), 'id'),
+            # Backs the bucketed "near me" candidate scan
+            db.Index('ix_chores_status_geo_cell', 'status', 'geo_cell'),
+            # Backs the overdue range scan in maintenance.expire_overdue
+            db.Index('ix_chores_status_due_date', 'status', 'due_date'),
+            # Back "my chores": each role's lookup, and its per-type sort order
+            db.Index('ix_chores_posted_by_id_posted_at', 'posted_by_id', 'posted_at'),
+            db.Index('ix_chores_accepted_by_id_accepted_at', 'accepted_by_id', 'accepted_at'),
+            db.Index('ix_chores_completed_by_id_completed_at', 'completed_by_id', 'completed_at'),
+        )
+    
+    @classmethod
+    def current_version(cls):
+        """The last change marker handed out (one primary-key lookup)"""
+        return db.session.scalar(db.select(ChoreVersionCounter.value)) or 0
+    
+    @classmethod
+    def next_version(cls, count=1):
+        """Reserve `count` change markers and return the highest; the others precede it.
+        
+        One UPDATE ... RETURNING on the counter row, which stays locked until
+        the caller's transaction ends: concurrent writers take markers one
+        after the other and commit in marker order, on PostgreSQL as on SQLite.
+        A rolled back write gives its markers back; a lost race may skip one.
+        """
+        return db.session.execute(
+            db.update(ChoreVersionCounter)
+            .where(ChoreVersionCounter.id == 1)
+            .values(value=ChoreVersionCounter.value + count)
+            .returning(ChoreVersionCounter.value)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+    
+    @classmethod
+    def transition(cls, chore_id, from_status, *conditions, **values):
+        """Atomically move a chore out of from_status in one conditional UPDATE.
+        
+        Returns True only for the caller whose statement changed the row, so
+        concurrent requests racing on the same chore get exactly one winner.
+        """
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.id == chore_id, cls.status == from_status, *conditions)
+            .values(version=cls.next_version(), **values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+class ChoreVersionCounter(db.Model):
+    """The single row (id 1) handing out chore change markers, see Chore.next_version"""
+    __tablename__ = 'chore_version_counter'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+# Databases built with create_all() get the row too; migrations insert their own
+event.listen(
+    ChoreVersionCounter.__table__, 'after_create',
+    db.DDL('INSERT INTO chore_version_counter (id, value) VALUES (1, 0)')
+)
+
+class ArchivedChore(ChoreColumns, db.Model):
+    """A settled chore moved out of the live table by archive.archive_settled"""
+    __tablename__ = 'chores_archive'
+    
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    poster = db.relationship('User', foreign_keys='ArchivedChore.posted_by_id', viewonly=True)
+    accepter = db.relationship('User', foreign_keys='ArchivedChore.accepted_by_id', viewonly=True)
+    completer = db.relationship('User', foreign_keys='ArchivedChore.completed_by_id', viewonly=True)
+    
+    __table_args__ = (
+        # Backs the archived ids listed as removed by since= delta sync
+        db.Index('ix_chores_archive_version', 'version'),
+        # Back the archived half of "my chores", same as on the live table
+        db.Index('ix_chores_archive_posted_by_id_posted_at', 'posted_by_id', 'posted_at'),
+        db.Index('ix_chores_archive_accepted_by_id_accepted_at', 'accepted_by_id', 'accepted_at'),
+        db.Index('ix_chores_archive_completed_by_id_completed_at', 'completed_by_id', 'completed_at'),
+    )
+
+class UserChoreStat(db.Model):
+    """Count and payment total of one user's chores in one role and status, see user_stats.py"""
+    __tablename__ = 'user_chore_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    role = db.Column(db.String(10), primary_key=True)  # poster, worker
+    status = db.Column(db.String(50), primary_key=True)
+    chore_count = db.Column(db.Integer, nullable=False, default=0)
+    payment_total = db.Column(db.Float, nullable=False, default=0.0)
+
 class ChoreApplication(db.Model):
     __tablename__ = 'chore_applications'
     
@@ -107,7 +256,18 @@ class ChoreApplication(db.Model):
     chore = db.relationship('Chore', backref='applications')
     user = db.relationship('User', backref='applications')
     
-    def to_dict(self):
+    __table_args__ = (
+        # One application per user per chore
+        db.UniqueConstraint('chore_id', 'user_id', name='uq_chore_applications_chore_user'),
+        # Back the per-chore list and the pending lookups, in applied order
+        db.Index('ix_chore_applications_chore_id_status_applied_at', 'chore_id', 'status', 'applied_at'),
+        # Backs the applicant's own list, newest first
+        db.Index('ix_chore_applications_user_id_applied_at', 'user_id', 'applied_at'),
+    )
+    
+    def to_dict(self, users=None, chores=None):
+        user = users.get(self.user_id) if users is not None else self.user
+        chore = chores.get(self.chore_id) if chores is not None else self.chore
         return {
             'id': self.id,
             'chore_id': self.chore_id,
@@ -115,8 +275,35 @@ class ChoreApplication(db.Model):
             'message': self.message,
             'status': self.status,
             'applied_at': self.applied_at.isoformat() if self.applied_at else None,
-            'user_name': self.user.name if self.user else None,
-            'chore_title': self.chore.title if self.chore else None
+            'user_name': user.name if user else None,
+            'chore_title': chore.title if chore else None
+        }
+
+class ChoreEvent(db.Model):
+    """One entry of a chore's append-only progress log, see progress.py"""
+    __tablename__ = 'chore_events'
+    
+    # Insert order across all chores; readers resume after the last seq they saw
+    seq = db.Column(db.Integer, primary_key=True)
+    # No foreign key: the log stays when its chore moves to chores_archive
+    chore_id = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(30), nullable=False)  # posted, accepted, en_route, ..., contact
+    actor_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    data = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Backs the per-chore read and its after_seq resume
+        db.Index('ix_chore_events_chore_id_seq', 'chore_id', 'seq'),
+    )
+    
+    def to_dict(self):
+        return {
+            'seq': self.seq,
+            'type': self.event_type,
+            'actorId': self.actor_id,
+            'data': self.data,
+            'at': self.created_at.isoformat()
         }
 
 class Review(db.Model):
@@ -135,7 +322,15 @@ class Review(db.Model):
     reviewer = db.relationship('User', foreign_keys=[reviewer_id], backref='reviews_given')
     reviewee = db.relationship('User', foreign_keys=[reviewee_id], backref='reviews_received')
     
-    def to_dict(self):
+    __table_args__ = (
+        # One review per reviewer per chore, so aggregates can't be inflated
+        db.UniqueConstraint('chore_id', 'reviewer_id', name='uq_reviews_chore_reviewer'),
+    )
+    
+    def to_dict(self, users=None, chores=None):
+        reviewer = users.get(self.reviewer_id) if users is not None else self.reviewer
+        reviewee = users.get(self.reviewee_id) if users is not None else self.reviewee
+        chore = chores.get(self.chore_id) if chores is not None else self.chore
         return {
             'id': self.id,
             'chore_id': self.chore_id,
@@ -144,7 +339,27 @@ class Review(db.Model):
             'rating': self.rating,
             'comment': self.comment,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'reviewer_name': self.reviewer.name if self.reviewer else None,
-            'reviewee_name': self.reviewee.name if self.reviewee else None,
-            'chore_title': self.chore.title if self.chore else None
-        }
\ No newline at end of file
+            'reviewer_name': reviewer.name if reviewer else None,
+            'reviewee_name': reviewee.name if reviewee else None,
+            'chore_title': chore.title if chore else None
+        }
+
+class RevokedToken(db.Model):
+    """A JWT revoked before its expiry, kept until it would have expired anyway"""
+    __tablename__ = 'revoked_tokens'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    token_type = db.Column(db.String(10), nullable=False)  # access, refresh
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    # Workers read new revocations by this, see revocation.py
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class MaintenanceLease(db.Model):
+    """Time-limited claim on a maintenance job, so one worker runs it at a time"""
+    __tablename__ = 'maintenance_leases'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(100), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
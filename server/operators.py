@@ -0,0 +1,33 @@
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+# Operator-only endpoints (bulk export and import, metrics). Operators are the
+# user ids listed in OPERATOR_USER_IDS; everyone else gets a 403, and a request
+# without a valid access token the usual 401. The metrics endpoints also admit
+# callers from METRICS_ALLOWED_ADDRESSES, so a local scraper needs no token.
+
+def is_operator(user_id):
+    return user_id in current_app.config['OPERATOR_USER_IDS']
+
+def operator_required(view):
+    """Like @jwt_required(), but only for operators"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        verify_jwt_in_request()
+        if not is_operator(get_jwt_identity()):
+            return jsonify({'message': 'Operator access required'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+def metrics_access_required(view):
+    """Like @operator_required, but also open to METRICS_ALLOWED_ADDRESSES"""
+    gated = operator_required(view)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.remote_addr in current_app.config['METRICS_ALLOWED_ADDRESSES']:
+            return view(*args, **kwargs)
+        return gated(*args, **kwargs)
+    return wrapper
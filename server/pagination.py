@@ -0,0 +1,31 @@
+import base64
+import json
+from datetime import datetime
+
+# Opaque keyset cursors. A cursor encodes the sort key of the last row on a
+# page so the next page can seek straight to it instead of using OFFSET.
+
+def encode_cursor(*values):
+    """Encode a tuple of sort-key values into an opaque URL-safe string"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(payload, list):
+        raise ValueError('Invalid cursor')
+    return payload
+
+def parse_per_page(value, default, maximum):
+    """Parse a per_page argument and clamp it to [1, maximum]"""
+    try:
+        per_page = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        per_page = default
+    return max(1, min(per_page, maximum))
@@ -0,0 +1,145 @@
+import atexit
+import threading
+import time
+from datetime import datetime
+
+from background import ProcessThread
+from models import db, ChoreEvent
+
+# Append-only progress log behind the tracking page. Every status transition
+# (posted, accepted, completed, expired) and every step a runner reports adds a
+# row to chore_events; rows are never updated, so the history survives the
+# overwrite of status and the *_at columns on the chore itself.
+#
+# Writes are buffered: record() appends to an in-memory list and returns, and a
+# flusher thread per worker inserts the buffer in one executemany transaction
+# every PROGRESS_FLUSH_SECONDS, or as soon as PROGRESS_BATCH_SIZE entries are
+# waiting. The transitions themselves stay one UPDATE long. Entries still
+# buffered when a worker is killed are lost; a clean shutdown flushes them.
+#
+# seq is the row's primary key, handed out in insert order, so a reader that
+# remembers the last seq it saw asks only for what came after it on the
+# (chore_id, seq) index. A read for a chore with entries not yet committed,
+# buffered or part of a flush in progress, flushes first (waiting for that
+# flush), so the runner who just reported a step sees it.
+
+STEPS = ('en_route', 'arrived', 'started')
+
+class ProgressLog:
+    def __init__(self, app=None):
+        self.flush_seconds = 1.0
+        self.batch_size = 500
+        self.written = 0
+        self.flushes = 0
+        self.failures = 0
+        self._buffer = []
+        self._pending = set()
+        self._app = None
+        self._flusher = ProcessThread(self._flush_forever, 'progress-flusher')
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.flush_seconds = app.config['PROGRESS_FLUSH_SECONDS']
+        self.batch_size = app.config['PROGRESS_BATCH_SIZE']
+        self._app = app
+        app.extensions['progress_log'] = self
+        # Zero writes through, for CLI commands and scripts without a flusher
+        if self.flush_seconds:
+            app.before_request(self._flusher.ensure)
+            atexit.register(self._flush_at_exit)
+
+    # Writing
+
+    def record(self, chore_id, event_type, actor_id=None, data=None):
+        """Queue one event for chore_id; call after the change it describes has committed"""
+        self.record_many([chore_id], event_type, actor_id, data)
+
+    def record_many(self, chore_ids, event_type, actor_id=None, data=None):
+        """Queue the same event for several chores (a batch expiry or import)"""
+        now = datetime.utcnow()
+        entries = [
+            {'chore_id': chore_id, 'event_type': event_type, 'actor_id': actor_id, 'data': data, 'created_at': now}
+            for chore_id in chore_ids
+        ]
+        if not entries:
+            return
+        with self._lock:
+            self._buffer.extend(entries)
+            self._pending.update(chore_ids)
+            full = len(self._buffer) >= self.batch_size
+        if not self._flusher.running:
+            # No flusher in this process (CLI commands, scripts): write through,
+            # keeping the entries buffered for the next attempt if that fails
+            try:
+                self.flush()
+            except Exception:
+                self._app.logger.exception('Progress log write failed')
+        elif full:
+            self._wake.set()
+
+    def flush(self):
+        """Insert everything buffered so far in one transaction; returns the number written"""
+        with self._flush_lock:
+            # Their chores stay pending until the insert commits, so a read
+            # meanwhile waits on the flush lock instead of missing them
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            if not entries:
+                return 0
+            try:
+                with self._app.app_context():
+                    db.session.execute(db.insert(ChoreEvent), entries)
+                    db.session.commit()
+            except Exception:
+                # Put them back in front of anything queued since, for the next pass
+                with self._lock:
+                    self._buffer[:0] = entries
+                self.failures += 1
+                raise
+            with self._lock:
+                self._pending = {entry['chore_id'] for entry in self._buffer}
+            self.written += len(entries)
+            self.flushes += 1
+            return len(entries)
+
+    def _flush_forever(self):
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                self._app.logger.exception('Progress log flush failed')
+                time.sleep(self.flush_seconds)
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    # Reading
+
+    def events(self, chore_id, after_seq=0, limit=100):
+        """Events of chore_id with seq > after_seq, oldest first"""
+        if chore_id in self._pending:
+            self.flush()
+            # End the read so the query below starts from a snapshot that has them
+            db.session.rollback()
+        return db.session.scalars(
+            db.select(ChoreEvent)
+            .where(ChoreEvent.chore_id == chore_id, ChoreEvent.seq > after_seq)
+            .order_by(ChoreEvent.seq)
+            .limit(limit)
+        ).all()
+
+    def stats(self):
+        with self._lock:
+            buffered = len(self._buffer)
+        return {'buffered': buffered, 'written': self.written, 'flushes': self.flushes, 'failures': self.failures}
+
+progress_log = ProgressLog()
@@ -0,0 +1,248 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+
+from geo import haversine_km
+from models import db, Chore, ArchivedChore, User
+from pagination import encode_cursor, decode_cursor
+from user_cache import user_cache
+
+# Personalized ordering for GET /api/chores?sort=relevance.
+#
+# Each worker keeps a feature matrix of every active chore: one NumPy column per
+# signal, built in a single query and rebuilt once it is older than
+# RANKING_REFRESH_SECONDS (due dates keep moving even when no chore does). The
+# viewer-independent signals (payment, urgency, due date, poster rating) are
+# folded into one static score when the snapshot is built. A request then only
+# adds the viewer's category affinity and location match, as vector operations
+# over the candidates, and takes the top of the page with argpartition instead
+# of sorting everything. Scores only change when the snapshot does, which keeps
+# the (score, id) cursor stable while a viewer pages through.
+#
+# A snapshot can lag the database by the refresh interval: new chores show up
+# on the next rebuild, and chores accepted since are filtered out when the page
+# is loaded, so a page may come back a little short.
+
+URGENCY_SCORES = {'low': 0.0, 'medium': 0.5, 'high': 1.0}
+# Poster ratings are shrunk towards this mean by RATING_PRIOR_WEIGHT phantom reviews
+RATING_PRIOR = 3.5
+RATING_PRIOR_WEIGHT = 3
+
+def _city(location):
+    return location.rsplit(',', 1)[-1].strip().lower() if location else ''
+
+class Snapshot:
+    """Column arrays describing the active chores at one change marker"""
+
+    def __init__(self, rows, version, weights, due_horizon_seconds):
+        self.version = version
+        self.built_at = time.monotonic()
+        count = len(rows)
+        columns = list(zip(*rows)) if rows else [()] * 9
+        ids, categories, locations, lats, lngs, payments, urgencies, due_dates, posters = columns[:9]
+        rating_sums, rating_counts = (columns[9], columns[10]) if rows else ((), ())
+
+        self.ids = np.fromiter(ids, dtype=np.int64, count=count)
+        self.posters = np.fromiter(posters, dtype=np.int64, count=count)
+        self.latitudes = np.array(lats, dtype=np.float64)
+        self.longitudes = np.array(lngs, dtype=np.float64)
+
+        # Categories and cities as small integer codes, so a viewer's
+        # preferences become a lookup table indexed by the code column
+        self.category_names = sorted(set(categories))
+        category_codes = {name: code for code, name in enumerate(self.category_names)}
+        self.categories = np.fromiter((category_codes[name] for name in categories), dtype=np.int32, count=count)
+        cities = [_city(location) for location in locations]
+        self.city_codes = {name: code for code, name in enumerate(sorted(set(cities)))}
+        self.cities = np.fromiter((self.city_codes[name] for name in cities), dtype=np.int32, count=count)
+
+        payments = np.array(payments, dtype=np.float64)
+        payment_score = np.log1p(payments) / np.log1p(payments.max()) if count else payments
+        urgency_score = np.fromiter((URGENCY_SCORES.get(level, 0.0) for level in urgencies), dtype=np.float64, count=count)
+        rating_score = (
+            (np.array(rating_sums, dtype=np.float64) + RATING_PRIOR * RATING_PRIOR_WEIGHT)
+            / (np.array(rating_counts, dtype=np.float64) + RATING_PRIOR_WEIGHT) / 5
+        )
+        # Due now scores 1, falling to 0 at the horizon; no due date scores 0
+        now = datetime.utcnow()
+        due_in = np.array(
+            [(due - now).total_seconds() if due is not None else np.nan for due in due_dates], dtype=np.float64
+        )
+        due_score = np.nan_to_num(1 - np.clip(due_in / due_horizon_seconds, 0, 1), nan=0.0)
+        self.static_score = (
+            weights['payment'] * payment_score
+            + weights['urgency'] * urgency_score
+            + weights['due'] * due_score
+            + weights['rating'] * rating_score
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+class FeedRanker:
+    MAX_PROFILES = 10000
+
+    def __init__(self, app=None):
+        self.refresh_seconds = 30
+        self.weights = {}
+        self.location_scale_km = 10
+        self.due_horizon_seconds = 7 * 86400
+        self.rebuilds = 0
+        self._snapshot = None
+        self._rebuild_lock = threading.Lock()
+        self._profiles = OrderedDict()
+        self._profiles_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config['RANKING_REFRESH_SECONDS']
+        self.weights = app.config['RANKING_WEIGHTS']
+        self.location_scale_km = app.config['RANKING_LOCATION_SCALE_KM']
+        self.due_horizon_seconds = app.config['RANKING_DUE_HORIZON_DAYS'] * 86400
+        self._snapshot = None
+        app.extensions['feed_ranker'] = self
+
+    # Feature matrix
+
+    def snapshot(self):
+        """The current snapshot, rebuilding it first if it is due"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.built_at < self.refresh_seconds:
+            return snapshot
+        # One request rebuilds; concurrent ones keep serving the previous snapshot
+        if not self._rebuild_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            if self._snapshot is not snapshot:
+                return self._snapshot
+            self._snapshot = self._build(Chore.current_version())
+            self.rebuilds += 1
+            return self._snapshot
+        finally:
+            self._rebuild_lock.release()
+
+    def _build(self, version):
+        rows = db.session.execute(
+            db.select(
+                Chore.id, Chore.category, Chore.location, Chore.latitude, Chore.longitude,
+                Chore.payment, Chore.urgency, Chore.due_date, Chore.posted_by_id,
+                User.rating_sum, User.rating_count
+            )
+            .join(User, User.id == Chore.posted_by_id)
+            .where(Chore.status == 'active')
+        ).all()
+        return Snapshot(rows, version, self.weights, self.due_horizon_seconds)
+
+    # Viewer profile
+
+    def _profile(self, user_id):
+        """(category -> share of the viewer's completed chores, latitude, longitude, city)"""
+        now = time.monotonic()
+        with self._profiles_lock:
+            cached = self._profiles.get(user_id)
+            if cached is not None and cached[0] > now:
+                self._profiles.move_to_end(user_id)
+                return cached[1]
+
+        # Archived chores count too, or a long-time runner's affinity would
+        # only reflect the last ARCHIVE_AFTER_DAYS; both sides seek on their
+        # (completed_by_id, completed_at) index
+        completed = db.union_all(
+            db.select(Chore.category).where(Chore.completed_by_id == user_id),
+            db.select(ArchivedChore.category).where(ArchivedChore.completed_by_id == user_id)
+        ).subquery()
+        history = db.session.execute(
+            db.select(completed.c.category, db.func.count()).group_by(completed.c.category)
+        ).all()
+        total = sum(count for _, count in history)
+        affinity = {category: count / total for category, count in history}
+        user = user_cache.get(user_id)
+        profile = (
+            affinity,
+            user.latitude if user else None,
+            user.longitude if user else None,
+            _city(user.location) if user else ''
+        )
+        with self._profiles_lock:
+            self._profiles[user_id] = (now + self.refresh_seconds, profile)
+            self._profiles.move_to_end(user_id)
+            while len(self._profiles) > self.MAX_PROFILES:
+                self._profiles.popitem(last=False)
+        return profile
+
+    # Scoring
+
+    def scores(self, snapshot, user_id=None):
+        """Relevance of every chore in the snapshot for one viewer (None = anonymous)"""
+        if user_id is None:
+            return snapshot.static_score
+        weights = self.weights
+        score = snapshot.static_score.copy()
+
+        affinity, latitude, longitude, city = self._profile(user_id)
+        if affinity:
+            table = np.array([affinity.get(name, 0.0) for name in snapshot.category_names], dtype=np.float64)
+            score += weights['affinity'] * table[snapshot.categories]
+
+        city_code = snapshot.city_codes.get(city)
+        same_city = (snapshot.cities == city_code) if city_code is not None else np.zeros(len(snapshot), dtype=bool)
+        if latitude is not None and longitude is not None:
+            distances = haversine_km(latitude, longitude, snapshot.latitudes, snapshot.longitudes)
+            location = np.where(np.isnan(distances), same_city, np.exp(-distances / self.location_scale_km))
+        else:
+            location = same_city
+        score += weights['location'] * location
+
+        # Never recommend viewers their own chores
+        score[snapshot.posters == user_id] = -np.inf
+        return score
+
+    def rank(self, user_id, category, cursor, per_page):
+        """Ids of the next page by descending relevance, and the cursor after it.
+
+        Raises ValueError for a malformed cursor.
+        """
+        snapshot = self.snapshot()
+        if not len(snapshot):
+            return [], None
+        score = self.scores(snapshot, user_id)
+        ids = snapshot.ids
+
+        keep = np.isfinite(score)
+        if category:
+            code = snapshot.category_names.index(category) if category in snapshot.category_names else -1
+            keep &= snapshot.categories == code
+        if cursor:
+            last_score, last_id = decode_cursor(cursor)
+            last_score, last_id = float(last_score), int(last_id)
+            keep &= (score < last_score) | ((score == last_score) & (ids > last_id))
+        candidates = np.flatnonzero(keep)
+
+        # Partial selection of the next page, then an exact sort of just that page
+        limit = min(per_page + 1, len(candidates))
+        if limit == 0:
+            return [], None
+        if limit < len(candidates):
+            top = candidates[np.argpartition(-score[candidates], limit - 1)[:limit]]
+        else:
+            top = candidates
+        top = top[np.lexsort((ids[top], -score[top]))]
+
+        page = top[:per_page]
+        next_cursor = None
+        if len(top) > per_page:
+            next_cursor = encode_cursor(float(score[page[-1]]), int(ids[page[-1]]))
+        return [int(chore_id) for chore_id in ids[page]], next_cursor
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            'chores': len(snapshot) if snapshot is not None else 0,
+            'version': snapshot.version if snapshot is not None else None,
+            'rebuilds': self.rebuilds
+        }
+
+feed_ranker = FeedRanker()
@@ -0,0 +1,230 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, jsonify, request
+from flask_jwt_extended import decode_token
+
+from sqlite_store import SQLiteStore, sqlite_path
+
+# Token-bucket rate limiting per route class and identity, plus load shedding.
+#
+# Every request is classified (auth, write or read) and charged one token from
+# the bucket of its identity: the JWT user when a valid access token is sent,
+# otherwise the client IP. Auth routes are always keyed by IP, since their
+# callers have no token yet. An empty bucket answers 429 with Retry-After set
+# to when the next token arrives.
+#
+# Buckets live in a per-worker LRU by default, which lets a client get
+# `workers` times its limit; multi-worker deployments should configure the
+# shared backend. Behind a reverse proxy, wrap the app in ProxyFix so
+# remote_addr is the client rather than the proxy.
+#
+# Independently, each worker counts requests in flight and answers 503 once
+# the count reaches RATELIMIT_MAX_IN_FLIGHT, so excess load is rejected cheaply
+# instead of queueing for database connections until the pool times out.
+
+class RateLimited(Exception):
+    """Raised when a request is rejected by a bucket or by load shedding"""
+
+    def __init__(self, message, retry_after, status_code):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+def _refill(tokens, updated_at, now, burst, rate):
+    return min(burst, tokens + (now - updated_at) * rate)
+
+class MemoryBackend:
+    """Buckets local to this process, least recently used evicted first"""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, burst, rate):
+        """Take one token; returns seconds until one is available, 0 if taken"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = _refill(tokens, updated_at, now, burst, rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                wait = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                wait = (1 - tokens) / rate
+            self._buckets.move_to_end(key)
+            # An evicted bucket comes back full, which only ever errs towards allowing
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+class SQLiteBackend(SQLiteStore):
+    """Buckets shared by every worker on one host through a SQLite file.
+
+    Stands in for a networked store such as Redis.
+    """
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS rate_limit_buckets ('
+        'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_updated_at ON rate_limit_buckets (updated_at)',
+    )
+
+    def __init__(self, path, max_entries=100000):
+        self.max_entries = max_entries
+        super().__init__(path)
+
+    def take(self, key, burst, rate):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?', (key,)).fetchone()
+            tokens = _refill(*row, now, burst, rate) if row else burst
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            if row is None:
+                overflow = conn.execute('SELECT COUNT(*) FROM rate_limit_buckets').fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        'DELETE FROM rate_limit_buckets WHERE key IN '
+                        '(SELECT key FROM rate_limit_buckets ORDER BY updated_at LIMIT ?)',
+                        (overflow,)
+                    )
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return wait
+
+    def clear(self):
+        self._connect().execute('DELETE FROM rate_limit_buckets')
+
+class RateLimiter:
+    # Endpoints callers reach before they hold an access token
+    AUTH_ENDPOINTS = {'login', 'register', 'refresh'}
+    # Never limited: probes and scrapes must keep working under load
+    EXEMPT_ENDPOINTS = {'health_check', 'metrics', 'metrics_profile'}
+    TOKEN_CACHE_SIZE = 10000
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.rules = {}
+        self.max_in_flight = 0
+        self.backend = MemoryBackend()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._rejected = {}
+        self._shed = 0
+        self._tokens = OrderedDict()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config['RATELIMIT_ENABLED']
+        self.rules = app.config['RATELIMIT_RULES']
+        self.max_in_flight = app.config['RATELIMIT_MAX_IN_FLIGHT']
+        backend_url = app.config['RATELIMIT_BACKEND']
+        max_entries = app.config['RATELIMIT_MAX_ENTRIES']
+        path = sqlite_path(backend_url)
+        self.backend = SQLiteBackend(path, max_entries) if path else MemoryBackend(max_entries)
+        self._rejected = {route_class: 0 for route_class in self.rules}
+        app.extensions['rate_limiter'] = self
+        if not self.enabled:
+            return
+
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+        app.register_error_handler(RateLimited, self._rejected_response)
+
+    def _classify(self):
+        if request.endpoint in self.AUTH_ENDPOINTS:
+            return 'auth'
+        if request.method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+            return 'write'
+        return 'read'
+
+    def _identity(self, route_class):
+        header = request.headers.get('Authorization', '')
+        if route_class != 'auth' and header.startswith('Bearer '):
+            user_id = self._token_user(header[len('Bearer '):])
+            if user_id is not None:
+                return f'user:{user_id}'
+        return f'ip:{request.remote_addr}'
+
+    def _token_user(self, token):
+        # Clients resend the same token for its whole lifetime, so verified
+        # tokens are remembered until they expire rather than decoded twice
+        # per request (here and again in @jwt_required)
+        now = time.time()
+        with self._lock:
+            cached = self._tokens.get(token)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        try:
+            claims = decode_token(token)
+        except Exception:
+            # Expired or invalid tokens are limited by IP; the route itself rejects them
+            return None
+        if claims.get('type') != 'access':
+            return None
+        with self._lock:
+            self._tokens[token] = (claims['sub'], claims.get('exp', float('inf')))
+            while len(self._tokens) > self.TOKEN_CACHE_SIZE:
+                self._tokens.popitem(last=False)
+        return claims['sub']
+
+    def _before_request(self):
+        if request.endpoint in self.EXEMPT_ENDPOINTS or request.method == 'OPTIONS':
+            return
+
+        if self.max_in_flight:
+            with self._lock:
+                if self._in_flight >= self.max_in_flight:
+                    self._shed += 1
+                    raise RateLimited('Server is busy, retry shortly', 1, 503)
+                self._in_flight += 1
+            g.rate_limit_in_flight = True
+
+        route_class = self._classify()
+        burst, rate = self.rules[route_class]
+        wait = self.backend.take(f'{route_class}:{self._identity(route_class)}', burst, rate)
+        if wait:
+            with self._lock:
+                self._rejected[route_class] += 1
+            raise RateLimited('Too many requests, slow down', math.ceil(wait), 429)
+
+    def _teardown_request(self, exc):
+        if g.pop('rate_limit_in_flight', False):
+            with self._lock:
+                self._in_flight -= 1
+
+    def _rejected_response(self, error):
+        response = jsonify({'message': str(error)})
+        response.status_code = error.status_code
+        response.headers['Retry-After'] = str(error.retry_after)
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': self._in_flight,
+                'shed': self._shed,
+                'rejected': dict(self._rejected)
+            }
+
+rate_limiter = RateLimiter()
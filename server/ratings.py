@@ -0,0 +1,56 @@
+from models import db, User, Review
+
+# User.rating is the mean of the reviews a user has received. rating_count and
+# rating_sum are kept next to it and folded forward by record_review() inside the
+# transaction that inserts the review, so serializing a user never aggregates
+# over reviews. rebuild_ratings() recomputes everything from the reviews table.
+
+def record_review(review):
+    """Insert a review and fold it into its reviewee's aggregates.
+
+    Runs in the caller's transaction; the single UPDATE reads and writes the
+    counters atomically, so concurrent reviews of one user never lose updates.
+    """
+    db.session.add(review)
+    db.session.flush()
+    db.session.execute(
+        db.update(User)
+        .where(User.id == review.reviewee_id)
+        .values(
+            rating_count=User.rating_count + 1,
+            rating_sum=User.rating_sum + review.rating,
+            rating=db.cast(User.rating_sum + review.rating, db.Float) / (User.rating_count + 1)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+def rebuild_ratings():
+    """Recompute every user's aggregates from the reviews table in one grouped pass.
+
+    Returns the number of users that have at least one review. The caller commits.
+    """
+    totals = (
+        db.select(
+            Review.reviewee_id,
+            db.func.count().label('review_count'),
+            db.func.sum(Review.rating).label('rating_total')
+        )
+        .group_by(Review.reviewee_id)
+        .subquery()
+    )
+    db.session.execute(
+        db.update(User)
+        .values(rating_count=0, rating_sum=0, rating=0.0)
+        .execution_options(synchronize_session=False)
+    )
+    result = db.session.execute(
+        db.update(User)
+        .where(User.id == totals.c.reviewee_id)
+        .values(
+            rating_count=totals.c.review_count,
+            rating_sum=totals.c.rating_total,
+            rating=db.cast(totals.c.rating_total, db.Float) / totals.c.review_count
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,191 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import decode_token, get_jwt
+from flask_sqlalchemy.session import Session
+
+from background import ProcessThread
+from sqlite_store import SQLiteStore, sqlite_path
+
+# Read/write splitting. With SQLALCHEMY_BINDS['replica'] configured, the
+# read-only endpoints in REPLICA_ENDPOINTS run their SELECTs against the
+# replica and everything else (and every write, wherever it comes from) uses
+# the primary.
+#
+# Replicas lag, so a user who just wrote is pinned to the primary for
+# REPLICA_PIN_SECONDS and reads their own writes. Pins live in a per-worker
+# LRU by default; with several workers use the shared backend, or a user's next
+# request may land on a worker that never saw the write.
+#
+# For local testing on SQLite, a stand-in "replication" thread copies the
+# primary file over the replica file every REPLICA_STANDIN_SYNC_SECONDS with
+# the online backup API, so the replica lags by up to that interval.
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+class RoutingSession(Session):
+    """Session that sends reads of replica-routed requests to the replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, 'is_dml', False):
+            router = current_app.extensions.get('replica_router') if has_request_context() else None
+            if router is not None and router.enabled and router.use_replica():
+                return self._db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+class MemoryPins:
+    """Pins local to this process, least recently pinned evicted first"""
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._pins = OrderedDict()
+        self._lock = threading.Lock()
+
+    def pin(self, user_id, until):
+        with self._lock:
+            self._pins[user_id] = until
+            self._pins.move_to_end(user_id)
+            while len(self._pins) > self.max_entries:
+                self._pins.popitem(last=False)
+
+    def pinned_until(self, user_id):
+        with self._lock:
+            return self._pins.get(user_id, 0.0)
+
+class SQLitePins(SQLiteStore):
+    """Pins shared by every worker on one host through a SQLite file"""
+    SCHEMA = ('CREATE TABLE IF NOT EXISTS replica_pins (user_id INTEGER PRIMARY KEY, until REAL NOT NULL)',)
+
+    def __init__(self, path):
+        self._writes = 0
+        super().__init__(path)
+
+    def pin(self, user_id, until):
+        conn = self._connect()
+        conn.execute('INSERT OR REPLACE INTO replica_pins (user_id, until) VALUES (?, ?)', (user_id, until))
+        # Expired pins are dead weight; drop them every so often
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            conn.execute('DELETE FROM replica_pins WHERE until < ?', (time.time(),))
+
+    def pinned_until(self, user_id):
+        row = self._connect().execute('SELECT until FROM replica_pins WHERE user_id = ?', (user_id,)).fetchone()
+        return row[0] if row else 0.0
+
+class ReplicaRouter:
+    # Read-only endpoints whose queries may be served by the replica
+    REPLICA_ENDPOINTS = {'get_chores', 'get_chore', 'get_profile', 'get_user_chores'}
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.pin_seconds = 5
+        self.pins = MemoryPins()
+        self.standin_interval = 0
+        self.last_sync = None
+        self.routed = {'replica': 0, 'primary': 0}
+        self._app = None
+        self._standin = ProcessThread(self._replicate_forever, 'replica-standin')
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = 'replica' in app.config['SQLALCHEMY_BINDS']
+        self.pin_seconds = app.config['REPLICA_PIN_SECONDS']
+        backend_url = app.config['REPLICA_PIN_BACKEND']
+        path = sqlite_path(backend_url)
+        if self.enabled and path is None and app.config['SERVER_WORKERS'] > 1:
+            # The author's next read on another worker could hit the lagging replica
+            raise RuntimeError(
+                f"REPLICA_PIN_BACKEND {backend_url!r} is per worker but {app.config['SERVER_WORKERS']} "
+                "workers serve requests; configure a shared backend such as 'sqlite:///path'"
+            )
+        self.pins = SQLitePins(path) if path else MemoryPins()
+        self.standin_interval = app.config['REPLICA_STANDIN_SYNC_SECONDS'] if self.enabled else 0
+        self.routed = {'replica': 0, 'primary': 0}
+        self._app = app
+        app.extensions['replica_router'] = self
+        if not self.enabled:
+            return
+
+        app.after_request(self._after_request)
+        if self.standin_interval:
+            app.before_request(self._standin.ensure)
+
+    # Routing
+
+    def _request_user(self):
+        # Routes that already verified the token have its claims; others
+        # (get_chores) may still carry one, and the pin must apply to them too
+        try:
+            return get_jwt().get('sub')
+        except RuntimeError:
+            pass
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            return None
+        try:
+            return decode_token(header[len('Bearer '):]).get('sub')
+        except Exception:
+            return None
+
+    def use_replica(self):
+        """Whether the current request's reads go to the replica (decided once per request)"""
+        decision = g.get('use_replica')
+        if decision is None:
+            decision = request.endpoint in self.REPLICA_ENDPOINTS and request.method == 'GET'
+            if decision:
+                user_id = self._request_user()
+                decision = user_id is None or self.pins.pinned_until(user_id) < time.time()
+            g.use_replica = decision
+            with self._lock:
+                self.routed['replica' if decision else 'primary'] += 1
+        return decision
+
+    def _after_request(self, response):
+        # Successful writes pin their author to the primary for a while
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            user_id = self._request_user()
+            if user_id is not None:
+                self.pins.pin(user_id, time.time() + self.pin_seconds)
+        return response
+
+    # SQLite replication stand-in
+
+    def _replicate_forever(self):
+        while True:
+            time.sleep(self.standin_interval)
+            try:
+                self.sync()
+            except Exception:
+                self._app.logger.exception('Replica stand-in sync failed')
+
+    def sync(self):
+        """Copy the primary SQLite file over the replica in one consistent snapshot"""
+        with self._app.app_context():
+            engines = self._app.extensions['sqlalchemy'].engines
+            primary, replica = engines[None].url, engines['replica'].url
+        if primary.get_backend_name() != 'sqlite' or replica.get_backend_name() != 'sqlite':
+            raise RuntimeError('The replica stand-in only copies between SQLite files')
+        started = time.perf_counter()
+        source = sqlite3.connect(primary.database)
+        target = sqlite3.connect(replica.database, timeout=30)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.last_sync = {'at': time.time(), 'seconds': round(time.perf_counter() - started, 3)}
+        return self.last_sync
+
+    def stats(self):
+        with self._lock:
+            stats = {'enabled': self.enabled, 'routed': dict(self.routed)}
+        if self.last_sync is not None:
+            stats['lag_seconds'] = round(time.time() - self.last_sync['at'], 1)
+        return stats
+
+replica_router = ReplicaRouter()
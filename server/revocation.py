@@ -0,0 +1,113 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from models import db, RevokedToken
+
+# Denylist of revoked JWTs, checked on every @jwt_required request.
+#
+# The revoked_tokens table is the source of truth; each worker keeps a
+# jti -> expiry map of it in memory, so the check is a dict lookup. At most
+# once per sync interval a request first pulls rows revoked since the previous
+# sync started (a range scan on ix_revoked_tokens_revoked_at), which is how
+# revocations made by other workers arrive. The worker that revokes a token
+# adds it locally at once; everyone else may accept it for up to one sync
+# interval.
+#
+# The window reaches TOKEN_DENYLIST_SYNC_OVERLAP_SECONDS further back. On
+# PostgreSQL a revocation can commit well after its revoked_at, and after rows
+# with later ids, so neither the highest id nor the last sync time alone marks
+# everything seen; re-reading the last minute's few revocations catches late
+# commits and clock skew between hosts. Entries are dropped from memory and
+# deleted from the table once the token has expired, since expired tokens are
+# rejected before the denylist is consulted.
+#
+# Tokens without an exp claim (issued before tokens expired) are treated as
+# revoked: they could never be pruned, and would otherwise stay valid forever.
+
+def _utc(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+class TokenDenylist:
+    def __init__(self, app=None, jwt=None):
+        self.sync_interval = 1.0
+        self.sync_overlap = timedelta(seconds=60)
+        self.prune_interval = 300
+        self.syncs = 0
+        self._revoked = {}
+        self._synced_at = None
+        self._next_sync = 0.0
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, jwt)
+
+    def init_app(self, app, jwt):
+        self.sync_interval = app.config['TOKEN_DENYLIST_SYNC_SECONDS']
+        self.sync_overlap = timedelta(seconds=app.config['TOKEN_DENYLIST_SYNC_OVERLAP_SECONDS'])
+        self.prune_interval = app.config['TOKEN_DENYLIST_PRUNE_SECONDS']
+        with self._lock:
+            self._revoked.clear()
+            self._synced_at = None
+            self._next_sync = 0.0
+        jwt.token_in_blocklist_loader(self._token_in_blocklist)
+        app.extensions['token_denylist'] = self
+
+    def _token_in_blocklist(self, jwt_header, jwt_payload):
+        return 'exp' not in jwt_payload or self.is_revoked(jwt_payload['jti'])
+
+    def is_revoked(self, jti):
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        return jti in self._revoked
+
+    def sync(self):
+        """Pull revocations recorded since the last sync and prune expired entries"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_sync:
+                return
+            started = datetime.utcnow()
+            query = db.select(RevokedToken.jti, RevokedToken.expires_at)
+            if self._synced_at is not None:
+                query = query.where(RevokedToken.revoked_at >= self._synced_at - self.sync_overlap)
+            with Session(db.engine) as session:
+                rows = session.execute(query).all()
+            for jti, expires_at in rows:
+                self._revoked[jti] = expires_at
+            self._synced_at = started
+            if now >= self._next_prune:
+                cutoff = datetime.utcnow()
+                self._revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > cutoff}
+                self._next_prune = now + self.prune_interval
+            self._next_sync = now + self.sync_interval
+            self.syncs += 1
+
+    def revoke(self, jwt_payload):
+        """Record a decoded token as revoked in the current session; the caller commits.
+
+        Also deletes rows for tokens that have expired since, keeping the table
+        no larger than the set of live revoked tokens. Tokens without exp are
+        rejected everywhere already and need no row.
+        """
+        jti = jwt_payload['jti']
+        if 'exp' not in jwt_payload or self.is_revoked(jti):
+            return
+        expires_at = _utc(jwt_payload['exp'])
+        db.session.execute(db.delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        db.session.add(RevokedToken(
+            jti=jti,
+            token_type=jwt_payload['type'],
+            user_id=jwt_payload['sub'],
+            expires_at=expires_at
+        ))
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._revoked), 'syncs': self.syncs}
+
+token_denylist = TokenDenylist()
@@ -0,0 +1,116 @@
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from models import db, Chore
+from pagination import encode_cursor, decode_cursor
+
+# Full-text chore search. On SQLite the chores table is mirrored into an FTS5
+# external-content index kept in sync by triggers (both created by migration
+# b8e4f1a62d93), so every writer, not just create_chore, updates it in the same
+# transaction. Other engines fall back to unranked LIKE matching until they get
+# a native index.
+
+chores_fts = db.table('chores_fts', db.column('rowid'), db.column('rank'), db.column('chores_fts'))
+
+def uses_fts():
+    return db.engine.dialect.name == 'sqlite'
+
+@contextmanager
+def deferred_index(cursor):
+    """Bulk-load chores without per-row index upkeep.
+
+    Drops the FTS sync triggers on a raw DBAPI cursor, then rebuilds the index
+    in one pass and restores the triggers on exit. A no-op off SQLite.
+    """
+    if not uses_fts():
+        yield
+        return
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'chores_fts_%'")
+    triggers = cursor.fetchall()
+    for name, _ in triggers:
+        cursor.execute(f'DROP TRIGGER {name}')
+    try:
+        yield
+    finally:
+        cursor.execute("INSERT INTO chores_fts (chores_fts) VALUES ('rebuild')")
+        for _, sql in triggers:
+            cursor.execute(sql)
+        cursor.connection.commit()
+
+def _terms(text):
+    return re.findall(r'\w+', text.lower())
+
+def _match_expression(text, column=None):
+    """Turn free text into an FTS5 query: every term must match, the last one as a prefix"""
+    terms = ' '.join(f'"{term}"' for term in _terms(text))
+    if terms:
+        terms += '*'
+    if column and terms:
+        return f'{column} : ({terms})'
+    return terms
+
+def filter_location(query, location):
+    """Restrict a chore query to a location, via the FTS index when available"""
+    if uses_fts():
+        match = _match_expression(location, column='location')
+        if not match:
+            return query
+        return query.filter(Chore.id.in_(
+            db.select(chores_fts.c.rowid).where(chores_fts.c.chores_fts.op('MATCH')(match))
+        ))
+    return query.filter(Chore.location.ilike(f'%{location}%'))
+
+def search_chores(query, text, cursor, per_page, candidate_limit):
+    """Relevance-ranked, cursor-paginated search over title, description and location.
+
+    Only the newest candidate_limit matches that pass the query's filters are
+    scored, which bounds the cost of very common terms. Returns (chores,
+    next_cursor); raises ValueError for a malformed cursor.
+    """
+    if not _terms(text):
+        return [], None
+
+    if uses_fts():
+        # FTS5 walks the doclist in rowid order and stops at the limit, so
+        # bm25() (exposed as rank, lower is better) runs on the window only.
+        # The status/category/location filters join in before the limit, or
+        # a common term's window would fill up with chores they then drop
+        candidates = (
+            db.select(chores_fts.c.rowid.label('chore_id'), chores_fts.c.rank.label('rank'))
+            .join(Chore, Chore.id == chores_fts.c.rowid)
+            .where(chores_fts.c.chores_fts.op('MATCH')(_match_expression(text)))
+        )
+        if query.whereclause is not None:
+            candidates = candidates.where(query.whereclause)
+        candidates = candidates.order_by(chores_fts.c.rowid.desc()).limit(candidate_limit).subquery()
+        query = query.join(candidates, candidates.c.chore_id == Chore.id).add_columns(candidates.c.rank)
+        if cursor:
+            rank, last_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                candidates.c.rank > float(rank),
+                and_(candidates.c.rank == float(rank), Chore.id > int(last_id))
+            ))
+        rows = query.order_by(candidates.c.rank, Chore.id).limit(per_page + 1).all()
+        items = [chore for chore, _ in rows[:per_page]]
+        next_cursor = encode_cursor(rows[per_page - 1][1], items[-1].id) if len(rows) > per_page else None
+        return items, next_cursor
+
+    for term in _terms(text):
+        pattern = f'%{term}%'
+        query = query.filter(or_(
+            Chore.title.ilike(pattern), Chore.description.ilike(pattern), Chore.location.ilike(pattern)
+        ))
+    if cursor:
+        posted_at, last_id = decode_cursor(cursor)
+        posted_at = datetime.fromisoformat(posted_at)
+        query = query.filter(or_(
+            Chore.posted_at < posted_at,
+            and_(Chore.posted_at == posted_at, Chore.id > int(last_id))
+        ))
+    rows = query.order_by(Chore.posted_at.desc(), Chore.id).limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = encode_cursor(items[-1].posted_at, items[-1].id) if len(rows) > per_page else None
+    return items, next_cursor
@@ -1,3 +1,4 @@
+from flask_migrate import downgrade, upgrade
 from app import create_app
 from models import db, User, Chore, ChoreApplication, Review
 from datetime import datetime, timedelta
@@ -9,8 +10,8 @@ def seed_database():
     with app.app_context():
         # Clear existing data
         print("Clearing existing data...")
-        db.drop_all()
-        db.create_all()
+        downgrade(revision='base')
+        upgrade()
         
         # Create sample users
         print("Creating sample users...")
@@ -64,8 +65,7 @@ def seed_database():
                 email=user_data['email'],
                 phone=user_data['phone'],
                 location=user_data['location'],
-                bio=user_data['bio'],
-                rating=round(random.uniform(4.0, 5.0), 1)
+                bio=user_data['bio']
             )
             user.set_password(user_data['password'])
             users.append(user)
@@ -0,0 +1,131 @@
+from sqlalchemy.orm import load_only
+
+from models import Chore, ArchivedChore
+from user_cache import user_cache
+
+# Batched serialization helpers. Each one loads every related row for a page
+# in a single IN query so listing endpoints cost a fixed number of statements
+# regardless of page size. Users come through the read-through user cache.
+
+def load_users(user_ids):
+    """Return an id -> CachedUser map, querying only cache misses"""
+    return user_cache.get_many(user_ids)
+
+def load_chores(chore_ids):
+    """Return an id -> Chore map for the given ids, falling back to the archive
+    for any not in the live table (one query, two with archived ids)"""
+    ids = {chore_id for chore_id in chore_ids if chore_id is not None}
+    if not ids:
+        return {}
+    chores = {chore.id: chore for chore in Chore.query.filter(Chore.id.in_(ids)).all()}
+    missing = ids - chores.keys()
+    if missing:
+        chores.update(
+            (chore.id, chore) for chore in ArchivedChore.query.filter(ArchivedChore.id.in_(missing)).all()
+        )
+    return chores
+
+# fields= projections for chore listings. Each field maps to the one column it
+# needs, so the query loads only those; user-derived fields additionally need
+# a user id column and the batched user load, which is skipped when none are
+# asked for. Projected rows carry raw datetimes for the encoder to format.
+
+CHORE_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'location': 'location',
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'payment': 'payment',
+    'category': 'category',
+    'urgency': 'urgency',
+    'estimatedTime': 'estimated_time',
+    'status': 'status',
+    'postedAt': 'posted_at',
+    'acceptedAt': 'accepted_at',
+    'completedAt': 'completed_at',
+    'dueDate': 'due_date',
+    'version': 'version',
+}
+USER_FIELDS = {
+    'postedBy': 'posted_by_id',
+    'acceptedBy': 'accepted_by_id',
+    'completedBy': 'completed_by_id',
+    'posterDetails': 'posted_by_id',
+}
+# Read by the listing code itself (cursors, delta sync) whatever the projection
+REQUIRED_COLUMNS = ('id', 'posted_at', 'version', 'status')
+
+def parse_fields(value):
+    """Parse a comma-separated fields= argument; None (all fields) when absent.
+
+    Raises ValueError naming any unknown field.
+    """
+    if value is None:
+        return None
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in CHORE_FIELDS and field not in USER_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def chore_load_options(fields, model=Chore):
+    """Query options that load only the columns a projection needs (of Chore or ArchivedChore)"""
+    if fields is None:
+        return ()
+    names = set(REQUIRED_COLUMNS)
+    names.update(CHORE_FIELDS[field] for field in fields if field in CHORE_FIELDS)
+    names.update(USER_FIELDS[field] for field in fields if field in USER_FIELDS)
+    return (load_only(*(getattr(model, name) for name in sorted(names))),)
+
+def project_chores(chores, fields):
+    """Serialize chores to just the requested fields (plus id)"""
+    columns = [(field, CHORE_FIELDS[field]) for field in fields if field in CHORE_FIELDS]
+    if 'id' not in fields:
+        columns.insert(0, ('id', 'id'))
+    user_fields = [(field, USER_FIELDS[field]) for field in fields if field in USER_FIELDS]
+    users = load_users(
+        getattr(chore, column) for chore in chores for _, column in user_fields
+    ) if user_fields else {}
+
+    result = []
+    for chore in chores:
+        row = {key: getattr(chore, column) for key, column in columns}
+        for key, column in user_fields:
+            user = users.get(getattr(chore, column))
+            if key == 'posterDetails':
+                row[key] = user.to_dict() if user else None
+            else:
+                row[key] = user.name if user else None
+        result.append(row)
+    return result
+
+def serialize_chores(chores, include_user_details=True, fields=None):
+    chores = list(chores)
+    if fields is not None:
+        return project_chores(chores, fields)
+    users = None
+    if include_user_details:
+        users = load_users(
+            user_id
+            for chore in chores
+            for user_id in (chore.posted_by_id, chore.accepted_by_id, chore.completed_by_id)
+        )
+    return [chore.to_dict(include_user_details, users=users) for chore in chores]
+
+def serialize_applications(applications):
+    applications = list(applications)
+    users = load_users(application.user_id for application in applications)
+    chores = load_chores(application.chore_id for application in applications)
+    return [application.to_dict(users=users, chores=chores) for application in applications]
+
+def serialize_reviews(reviews):
+    reviews = list(reviews)
+    users = load_users(
+        user_id
+        for review in reviews
+        for user_id in (review.reviewer_id, review.reviewee_id)
+    )
+    chores = load_chores(review.chore_id for review in reviews)
+    return [review.to_dict(users=users, chores=chores) for review in reviews]
@@ -0,0 +1,34 @@
+import sqlite3
+import threading
+
+# Shared SQLite file behind the cross-worker backends (user cache, rate limit
+# buckets, replica pins, chore events). Each stands in for a networked store
+# such as Redis or a broker: every worker on a host opens the same file, one
+# autocommit connection per thread, in WAL mode so readers never block the
+# writer. Backends configured as 'sqlite:///path' subclass SQLiteStore and list
+# the tables they need in SCHEMA.
+
+def sqlite_path(url):
+    """The file of a 'sqlite:///path' backend URL, or None for any other backend"""
+    return url[len('sqlite:///'):] if url.startswith('sqlite:///') else None
+
+class SQLiteStore:
+    # CREATE ... IF NOT EXISTS statements run once when the store is opened
+    SCHEMA = ()
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        for statement in self.SCHEMA:
+            conn.execute(statement)
+
+    def _connect(self):
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
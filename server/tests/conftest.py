@@ -0,0 +1,72 @@
+import itertools
+import os
+import sys
+import tempfile
+
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+# Config reads the environment at import, so this runs before the app is imported
+_db_dir = tempfile.TemporaryDirectory()
+os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(_db_dir.name, "test.db")}'
+os.environ['BCRYPT_LOG_ROUNDS'] = '4'
+os.environ['PASSWORD_HASH_WORKERS'] = '0'
+os.environ['RATELIMIT_ENABLED'] = '0'
+os.environ['MAINTENANCE_ENABLED'] = '0'
+os.environ['PROGRESS_FLUSH_SECONDS'] = '0'
+os.environ.pop('REPLICA_DATABASE_URL', None)
+
+from flask_migrate import upgrade
+
+from app import create_app
+from models import db
+
+_emails = itertools.count(1)
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=os.path.join(SERVER_DIR, 'migrations'))
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+    _db_dir.cleanup()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture(scope='session')
+def register(app):
+    """Register a fresh user; returns (user id, auth headers)"""
+    client = app.test_client()
+    def register(name='Test User'):
+        response = client.post('/api/register', json={
+            'name': name,
+            'email': f'user{next(_emails)}@example.com',
+            'password': 'password123'
+        })
+        assert response.status_code == 201, response.json
+        return response.json['id'], {'Authorization': f"Bearer {response.json['token']}"}
+    return register
+
+@pytest.fixture
+def post_chore(client):
+    """Create an active chore as the given user; returns its id"""
+    def post_chore(headers, **fields):
+        payload = {
+            'title': 'Test chore',
+            'description': 'Something to do',
+            'location': 'Greenpoint, Brooklyn',
+            'payment': 25,
+            'category': 'Cleaning',
+            'urgency': 'medium',
+            **fields
+        }
+        response = client.post('/api/chores', json=payload, headers=headers)
+        assert response.status_code == 201, response.json
+        return response.json['id']
+    return post_chore
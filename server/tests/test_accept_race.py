@@ -0,0 +1,56 @@
+import threading
+from collections import Counter
+
+from models import db, Chore
+from user_stats import user_stats
+
+RUNNERS = 200
+
+def race(app, chore_id, action, runners):
+    """Fire one request per runner at the same moment; returns the status codes by runner id"""
+    barrier = threading.Barrier(len(runners))
+    results = {}
+
+    def attempt(runner_id, headers):
+        client = app.test_client()
+        barrier.wait()
+        results[runner_id] = client.patch(f'/api/chores/{chore_id}/{action}', headers=headers).status_code
+
+    threads = [threading.Thread(target=attempt, args=runner) for runner in runners]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_accepts_have_exactly_one_winner(app, register, post_chore):
+    poster_id, poster = register('Poster')
+    chore_id = post_chore(poster)
+    runners = [register(f'Runner {i}') for i in range(RUNNERS)]
+
+    results = race(app, chore_id, 'accept', runners)
+
+    assert Counter(results.values()) == {200: 1, 409: RUNNERS - 1}
+    winner = next(runner_id for runner_id, status in results.items() if status == 200)
+    with app.app_context():
+        chore = db.session.get(Chore, chore_id)
+        assert chore.status == 'accepted'
+        assert chore.accepted_by_id == winner
+        # Counters moved once, for the winner only
+        assert user_stats(poster_id)['posted'] == {'accepted': {'count': 1, 'payment': 25.0}}
+        assert user_stats(winner)['working'] == {'accepted': {'count': 1, 'payment': 25.0}}
+
+def test_concurrent_completes_have_exactly_one_winner(app, client, register, post_chore):
+    _, poster = register('Poster')
+    chore_id = post_chore(poster)
+    runner_id, runner = register('Runner')
+    assert client.patch(f'/api/chores/{chore_id}/accept', headers=runner).status_code == 200
+
+    # The same runner completing from many devices at once
+    results = race(app, chore_id, 'complete', [(i, runner) for i in range(50)])
+
+    assert Counter(results.values()) == {200: 1, 409: 49}
+    with app.app_context():
+        chore = db.session.get(Chore, chore_id)
+        assert (chore.status, chore.completed_by_id) == ('completed', runner_id)
+        assert user_stats(runner_id)['working'] == {'completed': {'count': 1, 'payment': 25.0}}
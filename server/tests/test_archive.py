@@ -0,0 +1,75 @@
+from archive import archive_settled, find_chore
+from models import db, Chore, ArchivedChore
+
+def test_archiving_moves_the_feed_forward(app, client, register, post_chore):
+    _, poster = register()
+    _, runner = register()
+    settled = post_chore(poster)
+    post_chore(poster)  # newest id, left active
+    assert client.patch(f'/api/chores/{settled}/accept', headers=runner).status_code == 200
+    assert client.patch(f'/api/chores/{settled}/complete', headers=runner).status_code == 200
+
+    before = client.get('/api/chores?status=completed&per_page=100')
+    assert settled in [chore['id'] for chore in before.json]
+    version = int(before.headers['X-Chores-Version'])
+    with app.app_context():
+        archive_settled(older_than_days=0)
+        assert db.session.get(ArchivedChore, settled) is not None
+        assert Chore.current_version() > version
+
+    # The old ETag no longer matches, and the delta lists the chore as removed
+    after = client.get('/api/chores?status=completed&per_page=100', headers={'If-None-Match': before.headers['ETag']})
+    assert after.status_code == 200
+    assert settled not in [chore['id'] for chore in after.json]
+    delta = client.get(f'/api/chores?status=completed&since={version}')
+    assert settled in delta.json['removed']
+    assert delta.json['version'] > version
+
+def test_delta_pages_through_archived_removals(app, client, register, post_chore):
+    _, poster = register()
+    _, runner = register()
+    ids = [post_chore(poster) for _ in range(3)]
+    for chore_id in ids:
+        client.patch(f'/api/chores/{chore_id}/accept', headers=runner)
+        client.patch(f'/api/chores/{chore_id}/complete', headers=runner)
+    post_chore(poster)  # newest id, left active
+    version = int(client.get('/api/chores').headers['X-Chores-Version'])
+    with app.app_context():
+        archive_settled(older_than_days=0)
+
+    removed, since = [], version
+    while True:
+        delta = client.get(f'/api/chores?status=completed&since={since}&per_page=2').json
+        removed += delta['removed']
+        since = delta['version']
+        if not delta['has_more']:
+            break
+    assert set(ids) <= set(removed)
+
+def test_archived_chores_still_resolve_by_id(app, client, register, post_chore):
+    _, poster = register()
+    _, runner = register()
+    settled = post_chore(poster)
+    client.patch(f'/api/chores/{settled}/accept', headers=runner)
+    client.patch(f'/api/chores/{settled}/complete', headers=runner)
+    post_chore(poster)  # takes over the newest id and the highest marker
+
+    with app.app_context():
+        archive_settled(older_than_days=0)
+        assert isinstance(find_chore(settled), ArchivedChore)
+    response = client.get(f'/api/chores/{settled}')
+    assert response.status_code == 200
+    assert response.json['status'] == 'completed'
+
+def test_archived_work_still_shapes_feed_affinity(app, client, register, post_chore):
+    _, poster = register()
+    runner_id, runner = register()
+    for category in ('Gardening', 'Gardening', 'Moving'):
+        chore_id = post_chore(poster, category=category)
+        client.patch(f'/api/chores/{chore_id}/accept', headers=runner)
+        client.patch(f'/api/chores/{chore_id}/complete', headers=runner)
+
+    with app.app_context():
+        archive_settled(older_than_days=0)
+        affinity = app.extensions['feed_ranker']._profile(runner_id)[0]
+    assert affinity == {'Gardening': 2 / 3, 'Moving': 1 / 3}
@@ -0,0 +1,56 @@
+import uuid
+from datetime import datetime, timedelta
+
+import jwt
+
+from models import db, RevokedToken
+from revocation import token_denylist
+
+def test_token_without_exp_is_rejected(app, client, register):
+    user_id, headers = register()
+    assert client.get('/api/user/profile', headers=headers).status_code == 200
+
+    # A token as issued before access tokens expired: signed and valid, no exp
+    legacy = jwt.encode(
+        {'sub': user_id, 'jti': str(uuid.uuid4()), 'type': 'access', 'fresh': False},
+        app.config['JWT_SECRET_KEY'],
+        algorithm='HS256'
+    )
+    response = client.get('/api/user/profile', headers={'Authorization': f'Bearer {legacy}'})
+    assert response.status_code == 401
+
+def test_refresh_token_without_exp_is_rejected(app, client, register):
+    user_id, _ = register()
+    legacy = jwt.encode(
+        {'sub': user_id, 'jti': str(uuid.uuid4()), 'type': 'refresh'},
+        app.config['JWT_SECRET_KEY'],
+        algorithm='HS256'
+    )
+    response = client.post('/api/refresh', headers={'Authorization': f'Bearer {legacy}'})
+    assert response.status_code == 401
+
+def test_logout_revokes_the_access_token(client, register):
+    _, headers = register()
+    assert client.post('/api/logout', headers=headers).status_code == 200
+    assert client.get('/api/user/profile', headers=headers).status_code == 401
+
+def test_denylist_sync_picks_up_a_revocation_that_committed_late(app, register, monkeypatch):
+    user_id, _ = register()
+    expires_at = datetime.utcnow() + timedelta(days=30)
+    early, late = str(uuid.uuid4()), str(uuid.uuid4())
+    monkeypatch.setattr(token_denylist, '_next_sync', 0.0)
+    with app.app_context():
+        db.session.add(RevokedToken(id=10**6 + 1, jti=late, token_type='refresh', user_id=user_id, expires_at=expires_at))
+        db.session.commit()
+        token_denylist.sync()
+        assert token_denylist.is_revoked(late)
+
+        # Revoked just before that sync, with a lower id, but committed after it
+        db.session.add(RevokedToken(
+            id=10**6, jti=early, token_type='refresh', user_id=user_id, expires_at=expires_at,
+            revoked_at=datetime.utcnow() - timedelta(seconds=5)
+        ))
+        db.session.commit()
+        monkeypatch.setattr(token_denylist, '_next_sync', 0.0)
+        token_denylist.sync()
+        assert token_denylist.is_revoked(early)
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+import bulk
+
+def ndjson(*rows):
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+ROW = {
+    'title': 'Imported chore',
+    'description': 'From a bulk upload',
+    'location': 'Greenpoint, Brooklyn',
+    'payment': 30,
+    'category': 'Cleaning',
+    'urgency': 'low',
+}
+
+@pytest.fixture
+def operator(app, register, monkeypatch):
+    user_id, headers = register('Operator')
+    monkeypatch.setitem(app.config, 'OPERATOR_USER_IDS', frozenset([user_id]))
+    return headers
+
+def test_bulk_endpoints_are_operator_only(client, register, operator):
+    _, headers = register()
+    assert client.get('/api/chores/export', headers=headers).status_code == 403
+    assert client.post('/api/chores/import', data=ndjson(ROW), headers=headers,
+                       content_type='application/x-ndjson').status_code == 403
+    assert client.get('/api/chores/export').status_code == 401
+
+    assert client.get('/api/chores/export', headers=operator).status_code == 200
+    response = client.post('/api/chores/import', data=ndjson(ROW), headers=operator,
+                           content_type='application/x-ndjson')
+    assert response.status_code == 201
+    assert response.json['created'] == 1
+
+def test_import_rejects_wrong_types_before_inserting(client, operator):
+    rows = [
+        dict(ROW, title=['not', 'a', 'string']),
+        dict(ROW, category={'name': 'Cleaning'}),
+        dict(ROW, payment=True),
+        dict(ROW, title='x' * 201),
+        ROW,
+    ]
+    response = client.post('/api/chores/import', data=ndjson(*rows), headers=operator,
+                           content_type='application/x-ndjson')
+    assert response.status_code == 201
+    assert response.json['created'] == 1
+    assert [error['message'] for error in response.json['errors']] == [
+        'title must be a string',
+        'category must be a string',
+        'payment must be a number',
+        'title must be at most 200 characters',
+    ]
+
+def test_insert_failures_do_not_leak_database_errors(client, operator, monkeypatch):
+    def broken(batch, user_id):
+        raise RuntimeError('INSERT INTO chores (title, ...) VALUES (?, ...)')
+    monkeypatch.setattr(bulk, '_insert_batch', broken)
+
+    response = client.post('/api/chores/import', data=ndjson(ROW, ROW), headers=operator,
+                           content_type='application/x-ndjson')
+    assert response.status_code == 400
+    assert response.json['errors'] == [
+        {'line': 1, 'message': 'Failed to insert this row'},
+        {'line': 2, 'message': 'Failed to insert this row'},
+    ]
@@ -0,0 +1,20 @@
+import pytest
+from flask import Flask
+
+from config import Config
+from events import InProcessBackend, SQLiteBackend, create_broker
+
+def events_app(**config):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(config)
+    return app
+
+def test_in_process_backend_refused_with_several_workers():
+    with pytest.raises(RuntimeError, match='per worker'):
+        create_broker(events_app(CHORE_EVENTS_BACKEND='memory', SERVER_WORKERS=3))
+
+def test_backend_choice(tmp_path):
+    assert isinstance(create_broker(events_app(CHORE_EVENTS_BACKEND='memory', SERVER_WORKERS=1)).backend, InProcessBackend)
+    shared = create_broker(events_app(CHORE_EVENTS_BACKEND=f"sqlite:///{tmp_path / 'events.db'}", SERVER_WORKERS=3))
+    assert isinstance(shared.backend, SQLiteBackend)
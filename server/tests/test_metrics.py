@@ -0,0 +1,21 @@
+import re
+
+def test_password_hash_latency_is_exported(client, register):
+    register()
+    body = client.get('/api/metrics').get_data(as_text=True)
+    count = re.search(r'^chorerun_password_hash_duration_seconds_count (\d+)$', body, re.M)
+    assert count and int(count.group(1)) >= 1
+    assert re.search(r'^chorerun_password_hash_duration_seconds_bucket\{le="\+Inf"\} ' + count.group(1) + '$', body, re.M)
+    assert re.search(r'^chorerun_password_hash_rejected_total \d+$', body, re.M)
+
+def test_metrics_are_for_local_scrapers_and_operators(app, client, register, monkeypatch):
+    remote = {'REMOTE_ADDR': '203.0.113.5'}
+    operator_id, operator = register('Operator')
+    _, headers = register()
+    monkeypatch.setitem(app.config, 'OPERATOR_USER_IDS', frozenset([operator_id]))
+
+    for path in ('/api/metrics', '/api/metrics/profile'):
+        assert client.get(path, environ_base=remote).status_code == 401
+        assert client.get(path, environ_base=remote, headers=headers).status_code == 403
+    assert client.get('/api/metrics', environ_base=remote, headers=operator).status_code == 200
+    assert client.get('/api/metrics').status_code == 200
@@ -0,0 +1,111 @@
+import os
+
+import pytest
+from flask import Flask
+from flask_migrate import Migrate, upgrade
+
+from models import db
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+@pytest.fixture
+def fresh_app(tmp_path):
+    """A bare app on an empty database of its own, for running migrations"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'fresh.db'}"
+    db.init_app(app)
+    Migrate(app, db, render_as_batch=True)
+    with app.app_context():
+        yield app
+        db.engine.dispose()
+
+# What the baseline app's db.create_all() built on boot, before migrations
+BASELINE_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, email VARCHAR(120) NOT NULL,
+        password_hash VARCHAR(255) NOT NULL, phone VARCHAR(20), location VARCHAR(200), bio TEXT,
+        rating FLOAT, created_at DATETIME,
+        PRIMARY KEY (id), UNIQUE (email)
+    )""",
+    """CREATE TABLE chores (
+        id INTEGER NOT NULL, title VARCHAR(200) NOT NULL, description TEXT NOT NULL,
+        location VARCHAR(200) NOT NULL, payment FLOAT NOT NULL, category VARCHAR(100) NOT NULL,
+        urgency VARCHAR(50) NOT NULL, estimated_time VARCHAR(50), status VARCHAR(50),
+        posted_by_id INTEGER NOT NULL, accepted_by_id INTEGER, completed_by_id INTEGER,
+        posted_at DATETIME, accepted_at DATETIME, completed_at DATETIME, due_date DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(posted_by_id) REFERENCES users (id),
+        FOREIGN KEY(accepted_by_id) REFERENCES users (id),
+        FOREIGN KEY(completed_by_id) REFERENCES users (id)
+    )""",
+    """CREATE TABLE chore_applications (
+        id INTEGER NOT NULL, chore_id INTEGER NOT NULL, user_id INTEGER NOT NULL, message TEXT,
+        status VARCHAR(50), applied_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(chore_id) REFERENCES chores (id),
+        FOREIGN KEY(user_id) REFERENCES users (id)
+    )""",
+    """CREATE TABLE reviews (
+        id INTEGER NOT NULL, chore_id INTEGER NOT NULL, reviewer_id INTEGER NOT NULL,
+        reviewee_id INTEGER NOT NULL, rating INTEGER NOT NULL, comment TEXT, created_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(chore_id) REFERENCES chores (id),
+        FOREIGN KEY(reviewer_id) REFERENCES users (id),
+        FOREIGN KEY(reviewee_id) REFERENCES users (id)
+    )""",
+]
+
+# The columns and indexes the last pre-migration version added on top
+PRE_MIGRATION_ADDITIONS = [
+    'ALTER TABLE users ADD COLUMN latitude FLOAT',
+    'ALTER TABLE users ADD COLUMN longitude FLOAT',
+    'ALTER TABLE chores ADD COLUMN latitude FLOAT',
+    'ALTER TABLE chores ADD COLUMN longitude FLOAT',
+    'ALTER TABLE chores ADD COLUMN geo_cell INTEGER',
+    'ALTER TABLE chores ADD COLUMN version INTEGER NOT NULL DEFAULT 0',
+    'CREATE INDEX ix_chores_version ON chores (version)',
+    'CREATE INDEX ix_chores_status_posted_at_id ON chores (status, posted_at DESC, id)',
+    'CREATE INDEX ix_chores_status_geo_cell ON chores (status, geo_cell)',
+]
+
+def build_old_database(statements):
+    with db.engine.begin() as conn:
+        for statement in statements:
+            conn.execute(db.text(statement))
+        conn.execute(db.text("INSERT INTO users (id, name, email, password_hash) VALUES (1, 'Old', 'old@example.com', 'x')"))
+        for chore_id in (1, 2):
+            conn.execute(db.text(
+                "INSERT INTO chores (id, title, description, location, payment, category, urgency, status, posted_by_id) "
+                f"VALUES ({chore_id}, 'Walk the dog', 'Twice', 'Greenpoint', 20, 'Pets', 'low', 'active', 1)"
+            ))
+
+def assert_upgraded_in_place():
+    with db.engine.connect() as conn:
+        assert conn.execute(db.text('SELECT name FROM users')).scalars().all() == ['Old']
+        # Every chore has its own change marker and the counter is past them
+        versions = conn.execute(db.text('SELECT version FROM chores ORDER BY id')).scalars().all()
+        assert len(set(versions)) == 2
+        assert conn.execute(db.text('SELECT value FROM chore_version_counter')).scalar() == max(versions)
+        matches = conn.execute(db.text("SELECT rowid FROM chores_fts WHERE chores_fts MATCH 'dog'")).scalars().all()
+        assert sorted(matches) == [1, 2]
+
+def test_upgrade_adopts_a_baseline_database(fresh_app):
+    build_old_database(BASELINE_SCHEMA)
+    upgrade(directory=MIGRATIONS)
+    assert_upgraded_in_place()
+    columns = {column['name'] for column in db.inspect(db.engine).get_columns('chores')}
+    assert {'latitude', 'longitude', 'geo_cell', 'version'} <= columns
+
+def test_upgrade_adopts_a_database_from_the_last_pre_migration_version(fresh_app):
+    build_old_database(BASELINE_SCHEMA + PRE_MIGRATION_ADDITIONS)
+    upgrade(directory=MIGRATIONS)
+    assert_upgraded_in_place()
+
+def test_upgrade_refuses_a_partial_schema(fresh_app):
+    with db.engine.begin() as conn:
+        conn.execute(db.text('CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(100))'))
+    # Flask-Migrate reports the error and exits, as `flask db upgrade` would
+    with pytest.raises(SystemExit):
+        upgrade(directory=MIGRATIONS)
+    with db.engine.connect() as conn:
+        assert not db.inspect(conn).has_table('chores')
@@ -0,0 +1,33 @@
+import os
+import threading
+
+from sqlalchemy import event
+
+from models import db
+from progress import progress_log
+
+def test_read_waits_for_a_flush_in_progress(app, monkeypatch):
+    # Buffer as a serving worker with a flusher would, without starting one
+    monkeypatch.setattr(progress_log._flusher, '_pid', os.getpid())
+    progress_log.record(424242, 'en_route')
+
+    # Hold the flusher's transaction open just before it commits
+    entered, release = threading.Event(), threading.Event()
+    def hold_commit(conn):
+        if threading.current_thread().name == 'flush':
+            entered.set()
+            release.wait(5)
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'commit', hold_commit)
+    try:
+        flusher = threading.Thread(target=progress_log.flush, name='flush')
+        flusher.start()
+        assert entered.wait(5)
+        threading.Timer(0.2, release.set).start()
+        with app.app_context():
+            events = progress_log.events(424242)
+        flusher.join()
+    finally:
+        event.remove(engine, 'commit', hold_commit)
+    assert [entry.event_type for entry in events] == ['en_route']
@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from models import db, Chore
+from revocation import token_denylist
+from user_cache import user_cache
+
+PAGE_SIZES = (1, 20, 100)
+
+# Statements a listing may issue whatever its page size; raise only knowingly
+MAX_STATEMENTS = {'/api/chores': 4, '/api/user/chores': 3}
+
+@contextmanager
+def count_statements(app):
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+
+@pytest.fixture(scope='module')
+def listing_users(app, register):
+    """Auth headers of a poster with 300 chores and of the runner of most of them"""
+    poster_id, poster = register('Poster')
+    runner_id, runner = register('Runner')
+    other_id, _ = register('Other runner')
+    now = datetime.utcnow()
+    with app.app_context():
+        for i in range(300):
+            worker_id = (runner_id if i % 4 else other_id) if i % 3 else None
+            status = 'active' if worker_id is None else ('accepted' if i % 2 else 'completed')
+            db.session.add(Chore(
+                title=f'Listing chore {i}', description='x', location='Here', payment=10 + i,
+                category='Cleaning', urgency='low', status=status, posted_by_id=poster_id,
+                accepted_by_id=worker_id, accepted_at=now if worker_id else None,
+                completed_by_id=worker_id if status == 'completed' else None,
+                completed_at=now if status == 'completed' else None,
+                version=Chore.next_version()
+            ))
+            db.session.flush()
+        db.session.commit()
+    return {'poster': poster, 'runner': runner}
+
+@pytest.fixture
+def synced_denylist(app, monkeypatch):
+    """One real denylist sync, then none falls due while statements are counted"""
+    monkeypatch.setattr(token_denylist, 'sync_interval', 3600)
+    monkeypatch.setattr(token_denylist, '_next_sync', 0.0)
+    with app.app_context():
+        token_denylist.sync()
+
+def listing_statements(app, client, url, headers):
+    # Cold caches, so every request does the same work
+    user_cache.clear()
+    with count_statements(app) as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.json
+    return len(statements)
+
+@pytest.mark.parametrize('path, params, user', [
+    ('/api/chores', '', 'poster'),
+    ('/api/chores', '&status=completed', 'poster'),
+    ('/api/user/chores', '&type=all', 'poster'),
+    ('/api/user/chores', '&type=posted', 'poster'),
+    ('/api/user/chores', '&type=all', 'runner'),
+    ('/api/user/chores', '&type=accepted', 'runner'),
+    ('/api/user/chores', '&type=completed', 'runner'),
+])
+def test_listing_statement_count_is_independent_of_page_size(app, client, listing_users, synced_denylist,
+                                                             path, params, user):
+    headers = listing_users[user]
+    counts = {
+        per_page: listing_statements(app, client, f'{path}?per_page={per_page}{params}', headers)
+        for per_page in PAGE_SIZES
+    }
+    assert len(set(counts.values())) == 1, counts
+    assert counts[100] <= MAX_STATEMENTS[path], counts
@@ -0,0 +1,23 @@
+import pytest
+from flask import Flask
+
+from config import Config
+from replicas import MemoryPins, ReplicaRouter, SQLitePins
+
+def replica_app(**config):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(SQLALCHEMY_BINDS={'replica': 'sqlite:///replica.db'}, REPLICA_STANDIN_SYNC_SECONDS=0)
+    app.config.update(config)
+    return app
+
+def test_memory_pins_refused_with_several_workers():
+    with pytest.raises(RuntimeError, match='per worker'):
+        ReplicaRouter(replica_app(REPLICA_PIN_BACKEND='memory', SERVER_WORKERS=3))
+    # Without a replica nothing is pinned, so any backend will do
+    ReplicaRouter(replica_app(REPLICA_PIN_BACKEND='memory', SERVER_WORKERS=3, SQLALCHEMY_BINDS={}))
+
+def test_backend_choice(tmp_path):
+    assert isinstance(ReplicaRouter(replica_app(REPLICA_PIN_BACKEND='memory', SERVER_WORKERS=1)).pins, MemoryPins)
+    shared = ReplicaRouter(replica_app(REPLICA_PIN_BACKEND=f"sqlite:///{tmp_path / 'pins.db'}", SERVER_WORKERS=3))
+    assert isinstance(shared.pins, SQLitePins)
@@ -0,0 +1,20 @@
+def test_search_window_only_holds_chores_that_pass_the_filters(app, client, register, post_chore, monkeypatch):
+    monkeypatch.setitem(app.config, 'SEARCH_CANDIDATE_LIMIT', 3)
+    _, poster = register()
+    _, runner = register()
+    open_ids = [post_chore(poster, title=f'Zebra crossing {i}') for i in range(3)]
+    # Newer matches, all taken, would fill a window cut before the status filter
+    for i in range(3):
+        taken = post_chore(poster, title=f'Zebra fence {i}')
+        assert client.patch(f'/api/chores/{taken}/accept', headers=runner).status_code == 200
+
+    response = client.get('/api/chores?q=zebra&status=active')
+    assert sorted(chore['id'] for chore in response.json['chores']) == open_ids
+
+def test_fallback_search_matches_location_like_fts(app, client, register, post_chore, monkeypatch):
+    _, poster = register()
+    chore_id = post_chore(poster, location='Quokkaville')
+    for fts in (True, False):
+        monkeypatch.setattr('search.uses_fts', lambda: fts)
+        response = client.get('/api/chores?q=quokkaville')
+        assert [chore['id'] for chore in response.json['chores']] == [chore_id]
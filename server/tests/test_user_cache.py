@@ -0,0 +1,20 @@
+import pytest
+from flask import Flask
+
+from config import Config
+from user_cache import MemoryBackend, SQLiteBackend, UserCache
+
+def cache_app(**config):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(config)
+    return app
+
+def test_memory_backend_refused_with_several_workers():
+    with pytest.raises(RuntimeError, match='per worker'):
+        UserCache(cache_app(USER_CACHE_BACKEND='memory', SERVER_WORKERS=3))
+
+def test_backend_choice(tmp_path):
+    assert isinstance(UserCache(cache_app(USER_CACHE_BACKEND='memory', SERVER_WORKERS=1)).backend, MemoryBackend)
+    shared = UserCache(cache_app(USER_CACHE_BACKEND=f"sqlite:///{tmp_path / 'users.db'}", SERVER_WORKERS=3))
+    assert isinstance(shared.backend, SQLiteBackend)
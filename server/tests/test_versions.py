@@ -0,0 +1,54 @@
+import threading
+
+from models import db, Chore
+
+WRITERS = 50
+
+def test_concurrent_writers_take_distinct_markers(app):
+    with app.app_context():
+        before = Chore.current_version()
+    barrier = threading.Barrier(WRITERS)
+    taken = []
+
+    def write():
+        with app.app_context():
+            barrier.wait()
+            taken.append(Chore.next_version())
+            db.session.commit()
+
+    threads = [threading.Thread(target=write) for _ in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(taken) == list(range(before + 1, before + WRITERS + 1))
+    with app.app_context():
+        assert Chore.current_version() == before + WRITERS
+
+def test_rolled_back_writes_give_their_markers_back(app):
+    with app.app_context():
+        before = Chore.current_version()
+        assert Chore.next_version(5) == before + 5
+        db.session.rollback()
+        assert Chore.next_version() == before + 1
+        db.session.commit()
+
+def test_bulk_import_takes_one_block_of_markers(app, client, register, monkeypatch):
+    operator_id, operator = register('Operator')
+    monkeypatch.setitem(app.config, 'OPERATOR_USER_IDS', frozenset([operator_id]))
+    with app.app_context():
+        before = Chore.current_version()
+    rows = ''.join(
+        f'{{"title": "Row {i}", "description": "d", "location": "l", "payment": 5, '
+        f'"category": "Cleaning", "urgency": "low"}}\n'
+        for i in range(10)
+    )
+    response = client.post('/api/chores/import', data=rows, headers=operator, content_type='application/x-ndjson')
+    assert response.status_code == 201
+    with app.app_context():
+        chores = db.session.scalars(
+            db.select(Chore).where(Chore.version > before).order_by(Chore.version)
+        ).all()
+        assert [chore.title for chore in chores] == [f'Row {i}' for i in range(10)]
+        assert [chore.version for chore in chores] == list(range(before + 1, before + 11))
@@ -0,0 +1,252 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.orm import Session
+
+from models import db, User
+from sqlite_store import SQLiteStore, sqlite_path
+
+# Read-through cache of serialized users (User.to_dict() output), used for
+# profile reads and the posterDetails embedded in every chore card.
+#
+# Writers invalidate after commit. A reader that missed reads the invalidation
+# counter, loads the rows in a fresh session (so its snapshot is newer than the
+# counter it read) and only stores them if the counter has not moved, so a value
+# read before a write can never be cached after that write's invalidation.
+#
+# The in-process backend is only coherent within one worker; multi-worker
+# deployments must configure a shared backend so invalidations reach everyone.
+
+class MemoryBackend:
+    """LRU + TTL store local to this process"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        self.evictions = 0
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, values, ttl, if_invalidations=None):
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            if if_invalidations is not None and if_invalidations != self._invalidations:
+                return
+            for key, value in values.items():
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._invalidations += 1
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def invalidations(self):
+        with self._lock:
+            return self._invalidations
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+class SQLiteBackend(SQLiteStore):
+    """LRU + TTL store shared by every worker on one host through a SQLite file.
+
+    Stands in for a networked cache such as Redis or memcached.
+    """
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS user_cache ('
+        'key INTEGER PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, touched_at REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS ix_user_cache_touched_at ON user_cache (touched_at)',
+        'CREATE TABLE IF NOT EXISTS user_cache_meta (id INTEGER PRIMARY KEY, invalidations INTEGER NOT NULL)',
+        'INSERT OR IGNORE INTO user_cache_meta (id, invalidations) VALUES (1, 0)',
+    )
+
+    def __init__(self, path, max_entries=10000):
+        self.max_entries = max_entries
+        self.evictions = 0
+        super().__init__(path)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        now = time.time()
+        conn = self._connect()
+        placeholders = ','.join('?' * len(keys))
+        rows = conn.execute(
+            f'SELECT key, value FROM user_cache WHERE key IN ({placeholders}) AND expires_at > ?',
+            (*keys, now)
+        ).fetchall()
+        if rows:
+            conn.execute(
+                f'UPDATE user_cache SET touched_at = ? WHERE key IN ({placeholders})',
+                (now, *[key for key, _ in rows])
+            )
+        return {key: json.loads(value) for key, value in rows}
+
+    def _transaction(self, work):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            work(conn)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def set_many(self, values, ttl, if_invalidations=None):
+        now = time.time()
+
+        def work(conn):
+            if if_invalidations is not None and if_invalidations != self._read_invalidations(conn):
+                return
+            conn.executemany(
+                'INSERT OR REPLACE INTO user_cache (key, value, expires_at, touched_at) VALUES (?, ?, ?, ?)',
+                [(key, json.dumps(value), now + ttl, now) for key, value in values.items()]
+            )
+            overflow = conn.execute('SELECT COUNT(*) FROM user_cache').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    'DELETE FROM user_cache WHERE key IN '
+                    '(SELECT key FROM user_cache ORDER BY touched_at LIMIT ?)',
+                    (overflow,)
+                )
+                self.evictions += overflow
+
+        self._transaction(work)
+
+    def delete(self, key):
+        def work(conn):
+            conn.execute('UPDATE user_cache_meta SET invalidations = invalidations + 1 WHERE id = 1')
+            conn.execute('DELETE FROM user_cache WHERE key = ?', (key,))
+
+        self._transaction(work)
+
+    def clear(self):
+        def work(conn):
+            conn.execute('UPDATE user_cache_meta SET invalidations = invalidations + 1 WHERE id = 1')
+            conn.execute('DELETE FROM user_cache')
+
+        self._transaction(work)
+
+    def _read_invalidations(self, conn):
+        return conn.execute('SELECT invalidations FROM user_cache_meta WHERE id = 1').fetchone()[0]
+
+    def invalidations(self):
+        return self._read_invalidations(self._connect())
+
+    def size(self):
+        return self._connect().execute('SELECT COUNT(*) FROM user_cache').fetchone()[0]
+
+class CachedUser:
+    """Read-only stand-in for a User row, built from its cached to_dict()"""
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, name):
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def to_dict(self):
+        return dict(self._data)
+
+class UserCache:
+    def __init__(self, app=None):
+        self.backend = MemoryBackend()
+        self.ttl = 60
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_url = app.config['USER_CACHE_BACKEND']
+        max_entries = app.config['USER_CACHE_MAX_ENTRIES']
+        path = sqlite_path(backend_url)
+        if path is None and app.config['SERVER_WORKERS'] > 1:
+            # Invalidations would only reach the worker that made the change
+            raise RuntimeError(
+                f"USER_CACHE_BACKEND {backend_url!r} is per worker but {app.config['SERVER_WORKERS']} "
+                "workers serve requests; configure a shared backend such as 'sqlite:///path'"
+            )
+        self.backend = SQLiteBackend(path, max_entries) if path else MemoryBackend(max_entries)
+        self.ttl = app.config['USER_CACHE_TTL']
+        app.extensions['user_cache'] = self
+
+    def get_many(self, user_ids):
+        """Return an id -> CachedUser map, loading misses in one query"""
+        ids = {user_id for user_id in user_ids if user_id is not None}
+        if not ids:
+            return {}
+
+        found = self.backend.get_many(ids)
+        missing = ids - found.keys()
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        if missing:
+            invalidations = self.backend.invalidations()
+            with Session(db.engine) as session:
+                users = session.scalars(db.select(User).where(User.id.in_(missing))).all()
+                loaded = {user.id: user.to_dict() for user in users}
+            if loaded:
+                self.backend.set_many(loaded, self.ttl, if_invalidations=invalidations)
+            found.update(loaded)
+
+        return {user_id: CachedUser(data) for user_id, data in found.items()}
+
+    def get(self, user_id):
+        """Return the CachedUser for user_id, or None if there is no such user"""
+        return self.get_many([user_id]).get(user_id)
+
+    def invalidate(self, user_id):
+        """Drop a user's entry; call after the transaction that changed it commits"""
+        self.backend.delete(user_id)
+
+    def clear(self):
+        """Drop every entry, e.g. after a bulk rewrite of user rows"""
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.backend.evictions,
+                'size': self.backend.size()
+            }
+
+user_cache = UserCache()
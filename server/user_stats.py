@@ -0,0 +1,86 @@
+from collections import defaultdict
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, Chore, ArchivedChore, UserChoreStat
+
+# Per-user dashboard counters: how many chores a user has in each status and
+# what they pay, once as the poster and once as the worker who accepted them.
+#
+# record_chore_change() folds a status change into the counters inside the
+# transaction that makes it, so /api/user/stats reads a handful of rows instead
+# of scanning chores. rebuild_user_stats() recomputes everything from chores
+# and chores_archive.
+#
+# A chore counts for its worker from acceptance on, so a move out of 'active'
+# (the only status without a worker) never decrements a worker counter.
+
+def _upsert_statement():
+    insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+    statement = insert(UserChoreStat)
+    return statement.on_conflict_do_update(
+        index_elements=['user_id', 'role', 'status'],
+        set_={
+            'chore_count': UserChoreStat.chore_count + statement.excluded.chore_count,
+            'payment_total': UserChoreStat.payment_total + statement.excluded.payment_total,
+        }
+    )
+
+def record_chore_change(chore_ids, from_status, to_status):
+    """Move chores from from_status (None for new chores) to to_status in the counters.
+
+    Call after the change is written, in the same transaction; the caller commits.
+    """
+    if not chore_ids:
+        return
+    rows = db.session.execute(
+        db.select(Chore.posted_by_id, Chore.accepted_by_id, Chore.payment)
+        .where(Chore.id.in_(chore_ids))
+    ).all()
+
+    deltas = defaultdict(lambda: [0, 0.0])
+    for poster_id, worker_id, payment in rows:
+        changes = [('poster', poster_id, from_status)]
+        if worker_id is not None:
+            changes.append(('worker', worker_id, from_status if from_status != 'active' else None))
+        for role, user_id, previous in changes:
+            for status, sign in ((previous, -1), (to_status, 1)):
+                if status is not None:
+                    delta = deltas[(user_id, role, status)]
+                    delta[0] += sign
+                    delta[1] += sign * payment
+
+    db.session.execute(_upsert_statement(), [
+        {'user_id': user_id, 'role': role, 'status': status, 'chore_count': count, 'payment_total': total}
+        for (user_id, role, status), (count, total) in deltas.items()
+    ])
+
+def user_stats(user_id):
+    """Counts and payment totals per status for both roles, plus lifetime earnings and spend"""
+    rows = db.session.scalars(db.select(UserChoreStat).where(UserChoreStat.user_id == user_id)).all()
+    stats = {'posted': {}, 'working': {}}
+    for row in rows:
+        if row.chore_count:
+            group = stats['posted'] if row.role == 'poster' else stats['working']
+            group[row.status] = {'count': row.chore_count, 'payment': round(row.payment_total, 2)}
+    stats['earned'] = stats['working'].get('completed', {}).get('payment', 0.0)
+    stats['spent'] = stats['posted'].get('completed', {}).get('payment', 0.0)
+    return stats
+
+def rebuild_user_stats():
+    """Recompute every counter from the live and archived chores in two grouped passes; the caller commits"""
+    db.session.execute(db.delete(UserChoreStat))
+    chores = db.union_all(
+        db.select(Chore.posted_by_id, Chore.accepted_by_id, Chore.status, Chore.payment),
+        db.select(ArchivedChore.posted_by_id, ArchivedChore.accepted_by_id, ArchivedChore.status, ArchivedChore.payment)
+    ).subquery()
+    status = db.func.coalesce(chores.c.status, 'active')
+    for role, column in (('poster', chores.c.posted_by_id), ('worker', chores.c.accepted_by_id)):
+        db.session.execute(
+            db.insert(UserChoreStat).from_select(
+                ['user_id', 'role', 'status', 'chore_count', 'payment_total'],
+                db.select(column, db.literal(role), status, db.func.count(), db.func.sum(chores.c.payment))
+                .where(column.isnot(None))
+                .group_by(column, status)
+            )
+        )
@@ -0,0 +1,84 @@
+import math
+from datetime import datetime
+
+from geo import cell_for, validate_point
+
+# Input rules for new chores, shared by POST /api/chores and the bulk import so
+# a row is accepted by one exactly when it would be by the other. Types and
+# lengths are checked here, before anything reaches the database.
+
+REQUIRED_CHORE_FIELDS = ('title', 'description', 'location', 'payment', 'category', 'urgency')
+
+# Text fields and their column lengths (None = unbounded)
+TEXT_CHORE_FIELDS = {
+    'title': 200,
+    'description': None,
+    'location': 200,
+    'category': 100,
+    'urgency': 50,
+    'estimatedTime': 50,
+}
+
+def parse_chore(data):
+    """Validate a chore payload (API field names) into Chore column values.
+
+    Raises ValueError with a client-facing message for the first problem found.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Chore must be a JSON object')
+    for field in REQUIRED_CHORE_FIELDS:
+        if not data.get(field):
+            raise ValueError(f'{field} is required')
+
+    for field, max_length in TEXT_CHORE_FIELDS.items():
+        value = data.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            raise ValueError(f'{field} must be a string')
+        if max_length and len(value) > max_length:
+            raise ValueError(f'{field} must be at most {max_length} characters')
+
+    # Numbers may arrive as strings (CSV cells), but never as booleans
+    try:
+        if isinstance(data['payment'], bool):
+            raise TypeError
+        payment = float(data['payment'])
+    except (TypeError, ValueError):
+        raise ValueError('payment must be a number')
+    if not math.isfinite(payment):
+        raise ValueError('payment must be a number')
+
+    # Parse due date if provided
+    due_date = None
+    if data.get('dueDate'):
+        try:
+            due_date = datetime.fromisoformat(data['dueDate'].replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            raise ValueError('Invalid due date format')
+
+    # Optional coordinates for "near me" search
+    latitude = longitude = geo_cell = None
+    if data.get('latitude') is not None or data.get('longitude') is not None:
+        try:
+            if isinstance(data.get('latitude'), bool) or isinstance(data.get('longitude'), bool):
+                raise TypeError
+            latitude, longitude = float(data['latitude']), float(data['longitude'])
+            validate_point(latitude, longitude)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError('latitude and longitude must be valid coordinates')
+        geo_cell = cell_for(latitude, longitude)
+
+    return {
+        'title': data['title'],
+        'description': data['description'],
+        'location': data['location'],
+        'latitude': latitude,
+        'longitude': longitude,
+        'geo_cell': geo_cell,
+        'payment': payment,
+        'category': data['category'],
+        'urgency': data['urgency'],
+        'estimated_time': data.get('estimatedTime'),
+        'due_date': due_date
+    }
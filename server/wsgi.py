@@ -0,0 +1,7 @@
+# Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+# Run `flask db upgrade` once before starting workers; they never touch the schema.
+# A database the app built with db.create_all() before migrations existed is
+# adopted by that first upgrade (the initial revision keeps its tables).
+from app import create_app
+
+app = create_app('production', migrations=False)